@@ -0,0 +1,85 @@
+# accounts/authentication.py
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from ssaes_backend.instrumentation import span
+
+USER_CACHE_KEY = "accounts:jwt-user:{}"
+
+# backends whose entries other worker processes can neither see nor evict
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def user_cache_key(user_id) -> str:
+    return USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def user_cache_timeout() -> int:
+    """
+    JWT_USER_CACHE_TIMEOUT, or 0 (no caching) when the default cache is
+    per process: a role change or deactivation must be evicted in every
+    worker, not only in the one that saved the user
+    """
+    if isinstance(caches["default"], PROCESS_LOCAL_CACHES):
+        return 0
+    return getattr(settings, "JWT_USER_CACHE_TIMEOUT", 60)
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication with token decoding + user lookup reported as the
+    "auth" span when instrumentation is enabled
+    """
+
+    def authenticate(self, request):
+        with span("auth"):
+            return super().authenticate(request)
+
+
+class CachedJWTAuthentication(TimedJWTAuthentication):
+    """
+    Keeps the authenticated User in the cache for JWT_USER_CACHE_TIMEOUT
+    seconds, so a warm request authenticates (and role-checks) without a
+    query. Saving or deleting a user evicts the entry (accounts/signals.py).
+    Disabled unless the default cache is shared by all workers.
+    """
+
+    def get_user(self, validated_token):
+        timeout = user_cache_timeout()
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+
+        if not timeout or user_id is None:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+
+        if user is None:
+            # only active users that pass every check get cached
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return user
@@ -12,3 +12,15 @@ class User(AbstractUser):
 
     def __str__(self):
         return f"{self.username} ({self.role})"
+
+
+class Faculty(models.Model):
+    """
+    Profile of a FACULTY user (user.faculty); alerts record the faculty
+    member who raised them
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    department = models.CharField(max_length=50, blank=True)
+
+    def __str__(self):
+        return self.user.username
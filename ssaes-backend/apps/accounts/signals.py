@@ -0,0 +1,16 @@
+# accounts/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    """
+    Role, is_active and password changes take effect on the next request
+    """
+    invalidate_cached_user(instance.pk)
@@ -1,3 +1,109 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.students.models import Student
+from .authentication import user_cache_key
+from .models import User
+from .tokens import student_profile_id
+
+
+# the user cache needs a backend shared across processes
+SHARED_CACHE_DIR = tempfile.mkdtemp()
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": SHARED_CACHE_DIR,
+    }
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class JWTClaimsTestCase(TestCase):
+    """
+    Claims added at login and the cached-user authentication fast path
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(SHARED_CACHE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="student", password="studentpass", role="STUDENT"
+        )
+        self.profile = Student.objects.create(
+            user=self.user, enrollment_number="E1", department="CSE", year=1
+        )
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            "/api/accounts/login/",
+            {"username": "student", "password": "studentpass"},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["access"]
+
+    def test_login_embeds_role_and_profile_ids(self):
+        token = AccessToken(self.login())
+
+        self.assertEqual(token["role"], "STUDENT")
+        self.assertEqual(token["student_id"], self.profile.pk)
+        self.assertIsNone(token["faculty_id"])
+
+    def test_warm_request_does_not_query(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()}")
+
+        self.client.get("/api/accounts/profile/")
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/accounts/profile/")
+        self.assertEqual(response.data["role"], "STUDENT")
+
+    @override_settings(CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    })
+    def test_per_process_cache_disables_user_cache(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()}")
+
+        self.client.get("/api/accounts/profile/")
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_saving_user_evicts_cache(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()}")
+        self.client.get("/api/accounts/profile/")
+
+        self.user.role = "FACULTY"
+        self.user.save()
+        self.assertEqual(self.client.get("/api/accounts/profile/").data["role"], "FACULTY")
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/accounts/profile/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_id_from_claim_or_lookup(self):
+        request = APIRequestFactory().get("/")
+        request.user = self.user
+
+        request.auth = AccessToken.for_user(self.user)
+        request.auth["student_id"] = self.profile.pk
+        with self.assertNumQueries(0):
+            self.assertEqual(student_profile_id(request), self.profile.pk)
+
+        # tokens issued before the claim existed fall back to the relation
+        request.auth = AccessToken.for_user(self.user)
+        self.user = User.objects.get(pk=self.user.pk)
+        request.user = self.user
+        with self.assertNumQueries(1):
+            self.assertEqual(student_profile_id(request), self.profile.pk)
@@ -0,0 +1,69 @@
+# accounts/tokens.py
+
+"""
+Claims embedded in issued JWTs.
+
+Login adds the user's role and Student / Faculty profile ids to the
+refresh token; simplejwt copies them into every access token minted from
+it. Views read the profile ids from request.auth instead of joining
+through the user or following reverse relations.
+"""
+
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+ROLE_CLAIM = "role"
+STUDENT_ID_CLAIM = "student_id"
+FACULTY_ID_CLAIM = "faculty_id"
+
+
+def profile_id(user, accessor):
+    """
+    pk of a one-to-one profile (user.student_profile, user.faculty),
+    or None if the user has none
+    """
+    try:
+        return getattr(user, accessor).pk
+    except (AttributeError, ObjectDoesNotExist):
+        return None
+
+
+def user_claims(user) -> dict:
+    return {
+        ROLE_CLAIM: user.role,
+        STUDENT_ID_CLAIM: profile_id(user, "student_profile"),
+        FACULTY_ID_CLAIM: profile_id(user, "faculty"),
+    }
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+
+# -----------------------------
+# REQUEST HELPERS
+# -----------------------------
+
+def _claimed_profile_id(request, claim, accessor):
+    """
+    Profile id from the request's token; looked up when the token predates
+    the claim or was issued before the profile existed
+    """
+    token = request.auth
+    if token is not None and hasattr(token, "get") and token.get(claim) is not None:
+        return token[claim]
+    return profile_id(request.user, accessor)
+
+
+def student_profile_id(request):
+    return _claimed_profile_id(request, STUDENT_ID_CLAIM, "student_profile")
+
+
+def faculty_profile_id(request):
+    return _claimed_profile_id(request, FACULTY_ID_CLAIM, "faculty")
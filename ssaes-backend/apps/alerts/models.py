@@ -1,7 +1,8 @@
 # alerts/models.py
 
 from django.db import models
-from apps.accounts.models import Student, Faculty
+from apps.accounts.models import Faculty
+from apps.students.models import Student
 
 ALERT_LEVEL_CHOICES = [
     ('LOW', 'Low'),
@@ -21,6 +22,15 @@ class Alert(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['student', 'resolved', '-created_at'], name='alert_student_resolved_idx'),
+            # open-alert lookups (dedupe, "my alerts") never touch resolved rows
+            models.Index(
+                fields=['student', 'level'],
+                name='alert_open_idx',
+                condition=models.Q(resolved=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.student.user.username} ({self.level})"
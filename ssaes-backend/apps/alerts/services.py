@@ -0,0 +1,138 @@
+# alerts/services.py
+
+"""
+Alerting pipeline.
+
+Alerts are raised on real risk transitions (previous level -> new level)
+rather than on every save, and are deduplicated against alerts that are
+still open for the same student, level and title. Inside defer_alerts()
+alerts are buffered and written with a single bulk insert at the end of
+the block, which keeps bulk updates to one INSERT.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from apps.alerts.models import Alert
+from apps.students.models import Student
+
+RISK_ORDER = {
+    'LOW': 0,
+    'MEDIUM': 1,
+    'HIGH': 2,
+}
+
+# Levels that produce an alert when a student escalates into them
+ALERTABLE_RISK_LEVELS = ('MEDIUM', 'HIGH')
+
+RISK_ALERT_TEXT = {
+    'MEDIUM': (
+        'Student moved to medium risk',
+        'Performance indicators have dropped to medium risk. Consider an early check-in.',
+    ),
+    'HIGH': (
+        'Student identified as high risk',
+        'You have been identified as at-risk. Please take action.',
+    ),
+}
+
+_local = threading.local()
+
+
+# -----------------------------
+# TRANSITIONS
+# -----------------------------
+
+def is_risk_escalation(previous_level, new_level) -> bool:
+    """
+    True if new_level is alertable and higher than previous_level
+    (a missing previous level counts as LOW)
+    """
+    return (
+        new_level in ALERTABLE_RISK_LEVELS and
+        RISK_ORDER[new_level] > RISK_ORDER.get(previous_level or 'LOW', 0)
+    )
+
+
+def build_risk_alert(student_id, level) -> Alert:
+    title, description = RISK_ALERT_TEXT[level]
+    return Alert(student_id=student_id, level=level, title=title, description=description)
+
+
+def raise_risk_alerts(transitions):
+    """
+    transitions: iterable of (user_id, previous_level, new_level).
+    Maps users to student profiles in one query and queues one alert
+    per real escalation.
+    """
+    escalations = {
+        user_id: new_level
+        for user_id, previous_level, new_level in transitions
+        if is_risk_escalation(previous_level, new_level)
+    }
+    if not escalations:
+        return
+
+    profiles = Student.objects.filter(
+        user_id__in=escalations.keys()
+    ).values_list('user_id', 'pk')
+
+    queue_alerts([
+        build_risk_alert(student_id, escalations[user_id])
+        for user_id, student_id in profiles
+    ])
+
+
+# -----------------------------
+# QUEUEING / BATCHED INSERT
+# -----------------------------
+
+@contextmanager
+def defer_alerts():
+    """
+    Buffers every alert queued inside the block and saves them with
+    one bulk insert on exit. Nested blocks share the outer buffer.
+    Use inside transaction.atomic() to flush at the end of a transaction.
+    """
+    if getattr(_local, 'buffer', None) is not None:
+        yield _local.buffer
+        return
+
+    _local.buffer = []
+    try:
+        yield _local.buffer
+        pending = _local.buffer
+    finally:
+        _local.buffer = None
+    save_alerts(pending)
+
+
+def queue_alerts(alerts):
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is not None:
+        buffer.extend(alerts)
+    else:
+        save_alerts(alerts)
+
+
+def save_alerts(alerts) -> list:
+    """
+    Inserts alerts in one batch, skipping duplicates within the batch
+    and any (student, level, title) that already has an open alert
+    """
+    unique = {}
+    for alert in alerts:
+        unique.setdefault((alert.student_id, alert.level, alert.title), alert)
+    if not unique:
+        return []
+
+    open_keys = set(
+        Alert.objects.filter(
+            resolved=False,
+            student_id__in={key[0] for key in unique},
+            title__in={key[2] for key in unique},
+        ).values_list('student_id', 'level', 'title')
+    )
+
+    new_alerts = [alert for key, alert in unique.items() if key not in open_keys]
+    return Alert.objects.bulk_create(new_alerts)
@@ -3,36 +3,40 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from apps.alerts.models import Alert
+from apps.alerts.services import queue_alerts, raise_risk_alerts
+from apps.analytics.models import StudentAnalytics
 from apps.goals.models import Goal
-from apps.accounts.models import Student
 
-# Signal to create an alert when a Goal is updated or created
+# Signal to create an alert when a new Goal is set
 @receiver(post_save, sender=Goal)
-def create_goal_alert(sender, instance, created, **kwargs):
+def create_goal_alert(sender, instance, created, raw=False, **kwargs):
     """
-    Automatically create an alert for a student when a new goal is set
-    or an existing goal is updated.
+    Notify a student when a new goal is set for them.
+    Plain updates of an existing goal do not create alerts.
     """
-    if created:
-        message = f"New goal '{instance.title}' has been created for you."
-    else:
-        message = f"Your goal '{instance.title}' has been updated."
-    
-    Alert.objects.create(
-        student=instance.student,
-        message=message,
-        level='INFO'  # Example: INFO, WARNING, CRITICAL
-    )
+    if raw or not created:
+        return
 
-# Signal to create alerts for students marked at risk
-@receiver(post_save, sender=Student)
-def create_risk_alert(sender, instance, created, **kwargs):
+    queue_alerts([
+        Alert(
+            student_id=instance.student_id,
+            level='LOW',
+            title=f"New goal: {instance.title}"[:255],
+            description=f"New goal '{instance.title}' has been created for you.",
+        )
+    ])
+
+# Signal to create alerts when a student's risk level escalates
+@receiver(post_save, sender=StudentAnalytics)
+def create_risk_alert(sender, instance, created, raw=False, **kwargs):
     """
-    Create an alert if a student's status changes to 'at risk'.
+    Create an alert only on a real transition into MEDIUM/HIGH risk,
+    comparing against the level the row had before this save.
     """
-    if not created and instance.status == 'AT_RISK':
-        Alert.objects.create(
-            student=instance,
-            message="You have been identified as at-risk. Please take action.",
-            level='WARNING'
-        )
+    if raw:
+        return
+
+    previous = getattr(instance, '_previous_values', None)
+    previous_level = previous['risk_level'] if previous else None
+
+    raise_risk_alerts([(instance.student_id, previous_level, instance.risk_level)])
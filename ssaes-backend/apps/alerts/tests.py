@@ -1,3 +1,86 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.analytics.models import StudentAnalytics
+from apps.students.models import Student
+from ssaes_backend.testing import QueryBudgetMixin
+from .models import Alert
+from .services import defer_alerts, is_risk_escalation
+
+User = get_user_model()
+
+
+class RiskAlertPipelineTests(TestCase):
+
+    def setUp(self):
+        self.users = []
+        for i in range(3):
+            user = User.objects.create_user(username=f"s{i}", password="123", role="STUDENT")
+            Student.objects.create(user=user, enrollment_number=f"E{i}", department="CSE", year=1)
+            self.users.append(user)
+
+        self.analytics = StudentAnalytics.objects.create(student=self.users[0], risk_level="LOW")
+
+    def set_level(self, analytics, level):
+        analytics.risk_level = level
+        analytics.save()
+
+    def test_escalation_rules(self):
+        self.assertTrue(is_risk_escalation("LOW", "HIGH"))
+        self.assertTrue(is_risk_escalation(None, "MEDIUM"))
+        self.assertFalse(is_risk_escalation("HIGH", "MEDIUM"))
+        self.assertFalse(is_risk_escalation("HIGH", "HIGH"))
+
+    def test_only_transitions_create_alerts(self):
+        self.set_level(self.analytics, "HIGH")
+        self.set_level(self.analytics, "HIGH")
+        self.analytics.average_marks = 20
+        self.analytics.save()
+
+        self.assertEqual(Alert.objects.filter(level="HIGH").count(), 1)
+
+    def test_open_alert_is_not_duplicated(self):
+        self.set_level(self.analytics, "HIGH")
+        self.set_level(self.analytics, "LOW")
+        self.set_level(self.analytics, "HIGH")
+        self.assertEqual(Alert.objects.filter(level="HIGH").count(), 1)
+
+        Alert.objects.update(resolved=True)
+        self.set_level(self.analytics, "LOW")
+        self.set_level(self.analytics, "HIGH")
+        self.assertEqual(Alert.objects.filter(level="HIGH", resolved=False).count(), 1)
+
+    def test_deferred_alerts_use_one_insert(self):
+        rows = [
+            StudentAnalytics.objects.create(student=user, risk_level="LOW")
+            for user in self.users[1:]
+        ]
+
+        with defer_alerts():
+            for row in rows:
+                self.set_level(row, "HIGH")
+            self.assertEqual(Alert.objects.count(), 0)
+
+        self.assertEqual(Alert.objects.filter(level="HIGH").count(), 2)
+
+
+class AlertListQueryTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", password="123", role="ADMIN")
+        self.client.force_authenticate(user=self.admin)
+        self.created = 0
+
+    def seed(self, count):
+        for _ in range(count):
+            self.created += 1
+            user = User.objects.create_user(username=f"q{self.created}", password="123")
+            student = Student.objects.create(
+                user=user, enrollment_number=f"Q{self.created}", department="CSE", year=1
+            )
+            Alert.objects.create(student=student, title="Check-in", description="-", level="LOW")
+
+    def test_alert_list_query_count_is_constant(self):
+        self.assertConstantQueries("/api/alerts/alerts/", self.seed)
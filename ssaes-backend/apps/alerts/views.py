@@ -4,11 +4,21 @@ from rest_framework import viewsets, permissions
 from .models import Alert
 from .serializers import AlertSerializer
 from apps.accounts.permissions import IsAdmin, IsFaculty, IsStudent
+from apps.accounts.tokens import faculty_profile_id, student_profile_id
 
 class AlertViewSet(viewsets.ModelViewSet):
-    queryset = Alert.objects.all().order_by('-created_at')
+    queryset = Alert.objects.select_related(
+        'student__user', 'faculty__user'
+    ).order_by('-created_at')
     serializer_class = AlertSerializer
 
+    # Columns needed by AlertSerializer on list pages
+    list_fields = (
+        'id', 'title', 'description', 'level', 'resolved', 'created_at', 'updated_at',
+        'student', 'student__user', 'student__user__username',
+        'faculty', 'faculty__user', 'faculty__user__username',
+    )
+
     def get_permissions(self):
         """
         Define permissions based on action:
@@ -27,8 +37,13 @@ class AlertViewSet(viewsets.ModelViewSet):
         Admins and Faculty see all alerts.
         """
         user = self.request.user
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.only(*self.list_fields)
+
+        # profile ids come from the token claims, so no join through user
         if user.role == 'STUDENT':
-            return Alert.objects.filter(student__user=user)
+            return queryset.filter(student_id=student_profile_id(self.request))
         elif user.role == 'FACULTY':
-            return Alert.objects.filter(faculty__user=user)
-        return super().get_queryset()
+            return queryset.filter(faculty_id=faculty_profile_id(self.request))
+        return queryset
@@ -1,7 +1,7 @@
 
 # Register your models here.
 from django.contrib import admin
-from .models import StudentAnalytics
+from .models import StudentAnalytics, KPISnapshot, MetricRollup, StudentKPICounter
 
 
 @admin.register(StudentAnalytics)
@@ -63,3 +63,81 @@ class StudentAnalyticsAdmin(admin.ModelAdmin):
             "fields": ("last_updated",)
         }),
     )
+
+
+@admin.register(KPISnapshot)
+class KPISnapshotAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the dashboard KPI snapshot buckets
+    """
+
+    list_display = (
+        "risk_level",
+        "department",
+        "year",
+        "student_count",
+        "marks_sum",
+        "attendance_sum",
+        "updated_at",
+    )
+
+    list_filter = (
+        "risk_level",
+        "department",
+        "year",
+    )
+
+    readonly_fields = list_display
+
+
+@admin.register(StudentKPICounter)
+class StudentKPICounterAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the running per-student KPI counters
+    """
+
+    list_display = (
+        "student",
+        "classes_attended",
+        "classes_total",
+        "marks_count",
+        "marks_sum",
+        "assignments_completed",
+        "assignments_total",
+        "last_event_id",
+        "updated_at",
+    )
+
+    search_fields = ("student__username",)
+
+    readonly_fields = list_display
+
+
+@admin.register(MetricRollup)
+class MetricRollupAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the trend rollups
+    """
+
+    list_display = (
+        "period",
+        "period_start",
+        "department",
+        "year",
+        "samples",
+        "student_count",
+        "attendance_sum",
+        "marks_sum",
+        "high_risk_count",
+        "updated_at",
+    )
+
+    list_filter = (
+        "period",
+        "department",
+        "year",
+    )
+
+    date_hierarchy = "period_start"
+
+    readonly_fields = list_display
@@ -0,0 +1,356 @@
+"""
+analytics/engine.py
+
+Columnar cohort analytics.
+
+StudentAnalytics + Student profile data is pulled once with values_list
+into a pandas DataFrame (categorical dtypes for the low-cardinality
+columns). Breakdowns, percentiles, histograms and correlations are all
+computed from that in-memory frame instead of one ORM aggregate per
+metric.
+
+The frame is cached per process and keyed on a generation counter kept
+in the Django cache. Signal handlers (and bulk writers) bump the
+generation, which makes every process reload on its next request; this
+relies on the shared cache configured in settings.CACHES (Redis).
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+from ssaes_backend.instrumentation import timed
+
+from .models import StudentAnalytics
+from .services import GRADES, RISK_LEVELS
+
+
+GENERATION_KEY = "analytics:cohort:generation"
+
+# Safety net for writes that bypass signals (queryset.update, raw SQL)
+FRAME_MAX_AGE = 300
+
+FRAME_COLUMNS = (
+    "student_id",
+    "department",
+    "year",
+    "attendance_percentage",
+    "average_marks",
+    "assignment_completion_rate",
+    "risk_score",
+    "risk_level",
+    "predicted_grade",
+)
+
+METRICS = (
+    "attendance_percentage",
+    "average_marks",
+    "assignment_completion_rate",
+    "risk_score",
+)
+
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+HISTOGRAM_BINS = 10
+
+# attendance vs score scatter
+SCATTER_BINS = 20
+SCATTER_SAMPLE = 200
+OUTLIER_Z = 2.0
+
+
+# -------------------------------
+# FRAME LOADING
+# -------------------------------
+
+@timed("cohort_frame_load")
+def load_cohort_frame() -> pd.DataFrame:
+    """
+    Reads every StudentAnalytics row with its department/year in one query
+    """
+    rows = StudentAnalytics.objects.annotate(
+        department=Coalesce(F("student__student_profile__department"), Value("")),
+        year=Coalesce(F("student__student_profile__year"), Value(0)),
+    ).values_list(*FRAME_COLUMNS).order_by()
+
+    frame = pd.DataFrame.from_records(list(rows), columns=FRAME_COLUMNS)
+
+    return frame.astype({
+        "student_id": "int64",
+        "department": "category",
+        "year": "int16",
+        "attendance_percentage": "float64",
+        "average_marks": "float64",
+        "assignment_completion_rate": "float64",
+        "risk_score": "float64",
+        "risk_level": pd.CategoricalDtype(RISK_LEVELS, ordered=True),
+        "predicted_grade": pd.CategoricalDtype(GRADES, ordered=True),
+    })
+
+
+# -------------------------------
+# FRAME CACHE
+# -------------------------------
+
+_lock = threading.Lock()
+_cached = {"generation": None, "loaded_at": 0.0, "frame": None}
+
+
+def current_generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 0, None)
+        generation = cache.get(GENERATION_KEY, 0)
+    return generation
+
+
+def invalidate_cohort_frame():
+    """
+    Marks every process's cached frame as stale
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def get_cohort_frame() -> pd.DataFrame:
+    """
+    Returns the cached cohort frame, reloading it when the generation
+    changed or it is older than FRAME_MAX_AGE
+    """
+    generation = current_generation()
+
+    with _lock:
+        fresh = (
+            _cached["frame"] is not None
+            and _cached["generation"] == generation
+            and time.monotonic() - _cached["loaded_at"] < FRAME_MAX_AGE
+        )
+        if not fresh:
+            _cached.update(
+                generation=generation,
+                loaded_at=time.monotonic(),
+                frame=load_cohort_frame(),
+            )
+        return _cached["frame"]
+
+
+# -------------------------------
+# REPORT
+# -------------------------------
+
+def _finite(value):
+    """
+    NaN / inf -> None so the report stays JSON-serializable
+    """
+    value = float(value)
+    return round(value, 4) if np.isfinite(value) else None
+
+
+def _filter(frame, department=None, year=None):
+    if department:
+        frame = frame[frame["department"] == department]
+    if year is not None:
+        frame = frame[frame["year"] == year]
+    return frame
+
+
+def cohort_breakdown(frame: pd.DataFrame) -> list:
+    """
+    department x year x risk level counts and averages
+    """
+    grouped = frame.groupby(
+        ["department", "year", "risk_level"], observed=True
+    ).agg(
+        student_count=("student_id", "size"),
+        average_marks=("average_marks", "mean"),
+        average_attendance=("attendance_percentage", "mean"),
+        average_risk_score=("risk_score", "mean"),
+    ).reset_index()
+
+    return [
+        {
+            "department": row.department,
+            "year": int(row.year),
+            "risk_level": row.risk_level,
+            "student_count": int(row.student_count),
+            "average_marks": _finite(row.average_marks),
+            "average_attendance": _finite(row.average_attendance),
+            "average_risk_score": _finite(row.average_risk_score),
+        }
+        for row in grouped.itertuples(index=False)
+    ]
+
+
+def cohort_percentiles(frame: pd.DataFrame) -> dict:
+    quantiles = frame[list(METRICS)].quantile(list(PERCENTILES))
+
+    return {
+        metric: {
+            f"p{int(q * 100)}": _finite(quantiles.at[q, metric])
+            for q in PERCENTILES
+        }
+        for metric in METRICS
+    }
+
+
+def cohort_histograms(frame: pd.DataFrame, bins: int = HISTOGRAM_BINS) -> dict:
+    """
+    Fixed 0–100 bins so histograms are comparable across filters
+    """
+    edges = np.linspace(0, 100, bins + 1)
+
+    return {
+        "edges": edges.tolist(),
+        "counts": {
+            metric: np.histogram(frame[metric].to_numpy(), bins=edges)[0].tolist()
+            for metric in METRICS
+        },
+    }
+
+
+def cohort_correlations(frame: pd.DataFrame) -> dict:
+    matrix = frame[list(METRICS)].corr()
+
+    return {
+        metric: {other: _finite(matrix.at[metric, other]) for other in METRICS}
+        for metric in METRICS
+    }
+
+
+@timed("cohort_report")
+def generate_cohort_report(department=None, year=None, bins=HISTOGRAM_BINS) -> dict:
+    """
+    Computes the full cohort report from the cached frame,
+    optionally restricted to one department and/or year
+    """
+    frame = _filter(get_cohort_frame(), department, year)
+
+    return {
+        "student_count": len(frame),
+        "risk_levels": {
+            level: int(count)
+            for level, count in frame["risk_level"].value_counts(sort=False).items()
+        },
+        "grades": {
+            grade: int(count)
+            for grade, count in frame["predicted_grade"].value_counts(sort=False).items()
+        },
+        "breakdown": cohort_breakdown(frame),
+        "percentiles": cohort_percentiles(frame),
+        "histograms": cohort_histograms(frame, bins),
+        "correlations": cohort_correlations(frame),
+    }
+
+
+# -------------------------------
+# ATTENDANCE VS SCORE
+# -------------------------------
+
+def density_cells(attendance, marks, bins) -> dict:
+    """
+    2-D histogram over the fixed 0–100 square; only non-empty cells are
+    returned, as parallel x / y / count columns
+    """
+    counts, x_edges, y_edges = np.histogram2d(
+        attendance, marks, bins=bins, range=[[0, 100], [0, 100]]
+    )
+    x_index, y_index = np.nonzero(counts)
+
+    return {
+        "x_edges": x_edges.tolist(),
+        "y_edges": y_edges.tolist(),
+        "cells": {
+            "x": x_index.tolist(),
+            "y": y_index.tolist(),
+            "count": counts[x_index, y_index].astype(int).tolist(),
+        },
+    }
+
+
+def stratified_outliers(frame, sample, seed=0) -> dict:
+    """
+    Students whose marks are at least OUTLIER_Z residual standard
+    deviations away from the linear attendance -> marks fit. Up to
+    `sample` of them are returned, split evenly across risk levels.
+    """
+    empty = {
+        "total": 0,
+        "student_id": [],
+        "attendance": [],
+        "score": [],
+        "risk_level": {"labels": list(RISK_LEVELS), "codes": []},
+    }
+    if len(frame) < 3:
+        return {"fit": None, "outliers": empty}
+
+    attendance = frame["attendance_percentage"].to_numpy()
+    marks = frame["average_marks"].to_numpy()
+
+    if np.ptp(attendance) == 0:
+        slope, intercept = 0.0, float(marks.mean())
+    else:
+        slope, intercept = np.polyfit(attendance, marks, 1)
+    residuals = marks - (slope * attendance + intercept)
+
+    spread = residuals.std()
+    fit = {"slope": _finite(slope), "intercept": _finite(intercept)}
+    if not spread:
+        return {"fit": fit, "outliers": empty}
+
+    candidates = np.flatnonzero(np.abs(residuals) >= OUTLIER_Z * spread)
+    levels = frame["risk_level"].cat.codes.to_numpy()[candidates]
+
+    rng = np.random.default_rng(seed)
+    strata = [candidates[levels == code] for code in np.unique(levels)]
+    chosen = []
+    budget = sample
+    # smallest strata first so their unused share goes to the larger ones
+    for i, stratum in enumerate(sorted(strata, key=len)):
+        take = min(len(stratum), budget // (len(strata) - i))
+        chosen.append(rng.choice(stratum, take, replace=False))
+        budget -= take
+
+    picked = np.sort(np.concatenate(chosen)) if chosen else np.array([], dtype=int)
+    rows = frame.iloc[picked]
+
+    return {
+        "fit": fit,
+        "outliers": {
+            "total": int(len(candidates)),
+            "student_id": rows["student_id"].tolist(),
+            "attendance": rows["attendance_percentage"].round(2).tolist(),
+            "score": rows["average_marks"].round(2).tolist(),
+            "risk_level": {
+                "labels": list(RISK_LEVELS),
+                "codes": rows["risk_level"].cat.codes.astype(int).tolist(),
+            },
+        },
+    }
+
+
+@timed("attendance_vs_score")
+def attendance_vs_score(department=None, year=None, bins=SCATTER_BINS,
+                        sample=SCATTER_SAMPLE, seed=0) -> dict:
+    """
+    Downsampled attendance vs score scatter: density cells plus a
+    stratified outlier sample. Payload size depends only on bins and
+    sample, never on the cohort size.
+    """
+    frame = _filter(get_cohort_frame(), department, year)
+
+    return {
+        "student_count": len(frame),
+        "bins": bins,
+        **density_cells(
+            frame["attendance_percentage"].to_numpy(),
+            frame["average_marks"].to_numpy(),
+            bins
+        ),
+        **stratified_outliers(frame, sample, seed),
+    }
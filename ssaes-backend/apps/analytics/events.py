@@ -0,0 +1,283 @@
+"""
+analytics/events.py
+
+Event-sourced KPI maintenance.
+
+Each raw PerformanceEvent (one attended/missed class, one mark, one
+assignment) is applied to the student's StudentKPICounter with a single
+F() update, so recording an event costs the same no matter how much
+history the student has. Derived KPIs and the risk score are refreshed
+from the counters, and StudentAnalytics is only rewritten when a derived
+input actually changed. A KPI with no events of its kind yet keeps its
+current StudentAnalytics value (e.g. one imported from a roster).
+
+rebuild_kpi_counters() replays the event log with one GROUP BY.
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .engine import invalidate_cohort_frame
+from .models import PerformanceEvent, StudentAnalytics, StudentKPICounter
+from .ranking import invalidate_risk_ranking
+from .services import evaluate_risk, generate_cohort_analytics
+from .snapshot import rebuild_kpi_snapshot
+
+
+KPI_FIELDS = (
+    "attendance_percentage",
+    "average_marks",
+    "assignment_completion_rate",
+)
+
+COUNTER_FIELDS = (
+    "classes_attended",
+    "classes_total",
+    "marks_sum",
+    "marks_count",
+    "assignments_completed",
+    "assignments_total",
+)
+
+# counter deltas applied for one event of each kind
+EVENT_DELTAS = {
+    "ATTENDANCE": lambda value: {"classes_attended": int(value), "classes_total": 1},
+    "MARK": lambda value: {"marks_sum": value, "marks_count": 1},
+    "ASSIGNMENT": lambda value: {"assignments_completed": int(value), "assignments_total": 1},
+}
+
+
+# -------------------------------
+# VALIDATION
+# -------------------------------
+
+def validate_event(kind: str, value) -> float:
+    """
+    Returns the event value as a float, raising ValueError if it is
+    not valid for the event kind
+    """
+    if kind not in EVENT_DELTAS:
+        raise ValueError(f"Unknown event kind: {kind}")
+
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("value must be a number")
+
+    if kind == "MARK":
+        if not 0 <= value <= 100:
+            raise ValueError("MARK value must be between 0 and 100")
+    elif value not in (0, 1):
+        raise ValueError(f"{kind} value must be 0 or 1")
+
+    return value
+
+
+# -------------------------------
+# DERIVED KPIS
+# -------------------------------
+
+def _ratio(part, whole, scale=100, default=0.0):
+    """
+    round(part / whole * scale, 2), or default where whole is 0
+    """
+    whole = np.asarray(whole, dtype=float)
+    return np.where(
+        whole > 0,
+        np.round(np.asarray(part, dtype=float) / np.maximum(whole, 1) * scale, 2),
+        np.asarray(default, dtype=float)
+    )
+
+
+def derive_kpis(counters: dict, current=None) -> dict:
+    """
+    Turns counter columns (scalars or arrays) into KPI columns.
+    current: KPI columns kept where a kind has no events (default 0)
+    """
+    current = current or {}
+    return {
+        "attendance_percentage": _ratio(
+            counters["classes_attended"], counters["classes_total"],
+            default=current.get("attendance_percentage", 0.0)
+        ),
+        "average_marks": _ratio(
+            counters["marks_sum"], counters["marks_count"], scale=1,
+            default=current.get("average_marks", 0.0)
+        ),
+        "assignment_completion_rate": _ratio(
+            counters["assignments_completed"], counters["assignments_total"],
+            default=current.get("assignment_completion_rate", 0.0)
+        ),
+    }
+
+
+def refresh_student_analytics(counter: StudentKPICounter) -> StudentAnalytics:
+    """
+    Re-derives one student's KPIs from their counters and rescores them
+    only if an input changed. Saves through the ORM so the snapshot,
+    alert and cohort-cache signals fire.
+    """
+    # profile loaded with the row so the snapshot signal needs no bucket lookup
+    analytics = StudentAnalytics.objects.filter(
+        student_id=counter.student_id
+    ).select_related("student__student_profile").first()
+
+    current = (
+        {field: getattr(analytics, field) for field in KPI_FIELDS}
+        if analytics is not None else None
+    )
+    kpis = {
+        field: float(values)
+        for field, values in derive_kpis(
+            {field: getattr(counter, field) for field in COUNTER_FIELDS}, current
+        ).items()
+    }
+
+    if analytics is not None and all(
+        getattr(analytics, field) == value for field, value in kpis.items()
+    ):
+        return analytics
+
+    result = evaluate_risk(
+        [kpis["attendance_percentage"]],
+        [kpis["average_marks"]],
+        [kpis["assignment_completion_rate"]]
+    )
+
+    analytics = analytics or StudentAnalytics(student_id=counter.student_id)
+    for field, value in kpis.items():
+        setattr(analytics, field, value)
+    analytics.risk_score = float(result["risk_score"][0])
+    analytics.risk_level = str(result["risk_level"][0])
+    analytics.predicted_grade = str(result["predicted_grade"][0])
+    analytics.save()
+
+    return analytics
+
+
+# -------------------------------
+# EVENT INGESTION
+# -------------------------------
+
+def record_event(student_id, kind: str, value) -> tuple:
+    """
+    Appends one event and applies it to the student's counters in O(1).
+    Returns (event, analytics).
+    """
+    value = validate_event(kind, value)
+
+    with transaction.atomic():
+        event = PerformanceEvent.objects.create(
+            student_id=student_id, kind=kind, value=value
+        )
+
+        changes = {
+            field: F(field) + delta
+            for field, delta in EVENT_DELTAS[kind](value).items()
+        }
+        changes["last_event_id"] = event.id
+        changes["updated_at"] = timezone.now()
+
+        counter = StudentKPICounter.objects.filter(student_id=student_id)
+        if not counter.update(**changes):
+            StudentKPICounter.objects.get_or_create(student_id=student_id)
+            counter.update(**changes)
+
+        analytics = refresh_student_analytics(counter.get())
+
+    return event, analytics
+
+
+# -------------------------------
+# FULL REBUILD
+# -------------------------------
+
+def rebuild_kpi_counters(student_ids=None) -> int:
+    """
+    Recomputes counters (and StudentAnalytics KPIs) from the event log.
+    Limited to student_ids when given. Returns the number of counters.
+    """
+    events = PerformanceEvent.objects.all()
+    counters = StudentKPICounter.objects.all()
+    if student_ids is not None:
+        events = events.filter(student_id__in=student_ids)
+        counters = counters.filter(student_id__in=student_ids)
+
+    attendance, marks, assignment = Q(kind="ATTENDANCE"), Q(kind="MARK"), Q(kind="ASSIGNMENT")
+    rows = list(
+        events.values("student_id").annotate(
+            classes_attended=Coalesce(Sum("value", filter=attendance), Value(0.0)),
+            classes_total=Count("id", filter=attendance),
+            marks_sum=Coalesce(Sum("value", filter=marks), Value(0.0)),
+            marks_count=Count("id", filter=marks),
+            assignments_completed=Coalesce(Sum("value", filter=assignment), Value(0.0)),
+            assignments_total=Count("id", filter=assignment),
+            last_event_id=Max("id"),
+        ).order_by("student_id")
+    )
+
+    columns = {
+        field: np.array([row[field] for row in rows], dtype=float)
+        for field in COUNTER_FIELDS
+    }
+
+    # kinds without events keep the stored KPI
+    stored = {
+        row[0]: row[1:]
+        for row in StudentAnalytics.objects.filter(
+            student_id__in=[row["student_id"] for row in rows]
+        ).values_list("student_id", *KPI_FIELDS)
+    }
+    current = {
+        field: np.array(
+            [stored.get(row["student_id"], (0.0,) * len(KPI_FIELDS))[i] for row in rows],
+            dtype=float
+        )
+        for i, field in enumerate(KPI_FIELDS)
+    }
+    kpis = derive_kpis(columns, current)
+    analytics = generate_cohort_analytics(*(kpis[field] for field in KPI_FIELDS))
+    analytics = {field: values.tolist() for field, values in analytics.items()}
+
+    with transaction.atomic():
+        counters.delete()
+        StudentKPICounter.objects.bulk_create(
+            [
+                StudentKPICounter(
+                    student_id=row["student_id"],
+                    classes_attended=int(row["classes_attended"]),
+                    classes_total=row["classes_total"],
+                    marks_sum=row["marks_sum"],
+                    marks_count=row["marks_count"],
+                    assignments_completed=int(row["assignments_completed"]),
+                    assignments_total=row["assignments_total"],
+                    last_event_id=row["last_event_id"],
+                )
+                for row in rows
+            ],
+            batch_size=1000
+        )
+
+        StudentAnalytics.objects.bulk_create(
+            [
+                StudentAnalytics(
+                    student_id=row["student_id"],
+                    **{field: values[i] for field, values in analytics.items()}
+                )
+                for i, row in enumerate(rows)
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["student"],
+            update_fields=list(analytics),
+        )
+
+    # bulk upserts bypass StudentAnalytics signals
+    rebuild_kpi_snapshot()
+    invalidate_cohort_frame()
+    invalidate_risk_ranking()
+
+    return len(rows)
@@ -0,0 +1,28 @@
+"""
+rebuild_kpi_counters
+
+Replays the PerformanceEvent log into StudentKPICounter and refreshes
+the derived StudentAnalytics KPIs, the dashboard snapshot and the
+cohort cache.
+
+    python manage.py rebuild_kpi_counters
+    python manage.py rebuild_kpi_counters --student 12 --student 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.events import rebuild_kpi_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-student KPI counters from the performance event log"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--student", type=int, action="append", dest="students",
+            help="Only rebuild this student user id (repeatable)"
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_kpi_counters(options["students"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt KPI counters for {rebuilt} students"))
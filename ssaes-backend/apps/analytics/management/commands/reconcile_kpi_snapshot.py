@@ -0,0 +1,49 @@
+"""
+reconcile_kpi_snapshot
+
+Compares the KPISnapshot counters (dashboard KPIs, risk distribution)
+with a fresh GROUP BY over StudentAnalytics, reports any drift and
+rebuilds them. Drift comes from writes that bypass signals
+(queryset.update, raw SQL, restores).
+
+    python manage.py reconcile_kpi_snapshot
+    python manage.py reconcile_kpi_snapshot --check   # report only, exit 1 on drift
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.engine import invalidate_cohort_frame
+from apps.analytics.ranking import invalidate_risk_ranking
+from apps.analytics.snapshot import kpi_snapshot_drift, rebuild_kpi_snapshot
+
+
+class Command(BaseCommand):
+    help = "Check and rebuild the KPI snapshot counters from StudentAnalytics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Only report drift; exit with an error if any bucket differs"
+        )
+
+    def handle(self, *args, **options):
+        drift = kpi_snapshot_drift()
+
+        for risk_level, department, year, stored, expected in drift:
+            self.stdout.write(
+                f"{risk_level:6} {department or '-':12} {year:2}  "
+                f"stored count={stored[0]} expected count={expected[0]}"
+            )
+
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} snapshot bucket(s) out of date")
+            self.stdout.write(self.style.SUCCESS("KPI snapshot is up to date"))
+            return
+
+        buckets = rebuild_kpi_snapshot()
+        invalidate_cohort_frame()
+        invalidate_risk_ranking()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {buckets} buckets ({len(drift)} had drifted)"
+        ))
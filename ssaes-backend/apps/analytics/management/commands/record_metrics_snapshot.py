@@ -0,0 +1,32 @@
+"""
+record_metrics_snapshot
+
+Records the daily trend snapshot and refreshes its week / month rollups.
+Normally run by Celery beat (CELERY_BEAT_SCHEDULE); use this from cron
+or to re-take a day's snapshot.
+
+    python manage.py record_metrics_snapshot
+    python manage.py record_metrics_snapshot --date 2025-01-31
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.rollups import record_metrics_snapshot
+
+
+class Command(BaseCommand):
+    help = "Snapshot StudentAnalytics metrics into the daily/weekly/monthly rollups"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Snapshot date (YYYY-MM-DD), default today")
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        buckets = record_metrics_snapshot(day)
+        self.stdout.write(self.style.SUCCESS(f"Recorded {buckets} department/year buckets"))
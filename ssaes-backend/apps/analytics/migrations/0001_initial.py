@@ -0,0 +1,108 @@
+# Generated by Django 5.2.9 on 2026-10-18 13:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KPISnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('risk_level', models.CharField(choices=[('LOW', 'Low Risk'), ('MEDIUM', 'Medium Risk'), ('HIGH', 'High Risk')], max_length=10)),
+                ('department', models.CharField(blank=True, default='', max_length=50)),
+                ('year', models.IntegerField(default=0)),
+                ('student_count', models.IntegerField(default=0)),
+                ('marks_sum', models.FloatField(default=0.0)),
+                ('attendance_sum', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'KPI Snapshot',
+                'verbose_name_plural': 'KPI Snapshots',
+                'constraints': [models.UniqueConstraint(fields=('risk_level', 'department', 'year'), name='unique_kpi_snapshot_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('DAY', 'Daily'), ('WEEK', 'Weekly'), ('MONTH', 'Monthly')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('department', models.CharField(blank=True, default='', max_length=50)),
+                ('year', models.IntegerField(default=0)),
+                ('samples', models.IntegerField(default=1)),
+                ('student_count', models.IntegerField(default=0)),
+                ('attendance_sum', models.FloatField(default=0.0)),
+                ('marks_sum', models.FloatField(default=0.0)),
+                ('assignment_sum', models.FloatField(default=0.0)),
+                ('risk_score_sum', models.FloatField(default=0.0)),
+                ('high_risk_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', '-period_start'], name='rollup_period_start_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'period_start', 'department', 'year'), name='unique_metric_rollup_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentKPICounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('classes_attended', models.IntegerField(default=0)),
+                ('classes_total', models.IntegerField(default=0)),
+                ('marks_sum', models.FloatField(default=0.0)),
+                ('marks_count', models.IntegerField(default=0)),
+                ('assignments_completed', models.IntegerField(default=0)),
+                ('assignments_total', models.IntegerField(default=0)),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='kpi_counter', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student KPI Counter',
+                'verbose_name_plural': 'Student KPI Counters',
+            },
+        ),
+        migrations.CreateModel(
+            name='PerformanceEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ATTENDANCE', 'Class attendance'), ('MARK', 'Assessment mark'), ('ASSIGNMENT', 'Assignment')], max_length=10)),
+                ('value', models.FloatField()),
+                ('recorded_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='performance_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student', 'kind'], name='perf_event_student_kind_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentAnalytics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attendance_percentage', models.FloatField(default=0.0)),
+                ('average_marks', models.FloatField(default=0.0)),
+                ('assignment_completion_rate', models.FloatField(default=0.0)),
+                ('risk_score', models.FloatField(default=0.0, help_text='ML or rule-based risk score (0–100)')),
+                ('risk_level', models.CharField(choices=[('LOW', 'Low Risk'), ('MEDIUM', 'Medium Risk'), ('HIGH', 'High Risk')], default='LOW', max_length=10)),
+                ('predicted_grade', models.CharField(blank=True, help_text='Predicted final grade (A, B, C, etc.)', max_length=2, null=True)),
+                ('last_updated', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analytics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Analytics',
+                'verbose_name_plural': 'Student Analytics',
+                'indexes': [models.Index(fields=['risk_level'], name='analytics_risk_level_idx'), models.Index(fields=['-risk_score'], name='analytics_risk_score_idx'), models.Index(condition=models.Q(('risk_level', 'HIGH')), fields=['-risk_score'], name='analytics_high_risk_idx')],
+            },
+        ),
+    ]
@@ -45,9 +45,178 @@ class StudentAnalytics(models.Model):
 
     last_updated = models.DateTimeField(auto_now=True)
 
+    # Fields whose previous values are kept so signal handlers can
+    # apply incremental deltas instead of rescanning the table
+    TRACKED_FIELDS = (
+        "attendance_percentage",
+        "average_marks",
+        "risk_score",
+        "risk_level",
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: getattr(instance, field)
+            for field in cls.TRACKED_FIELDS
+            if field in field_names
+        }
+        return instance
+
     def __str__(self):
         return f"Analytics for {self.student}"
 
     class Meta:
         verbose_name = "Student Analytics"
         verbose_name_plural = "Student Analytics"
+        indexes = [
+            models.Index(fields=["risk_level"], name="analytics_risk_level_idx"),
+            models.Index(fields=["-risk_score"], name="analytics_risk_score_idx"),
+            # dashboard / at-risk lists only ever look at HIGH rows
+            models.Index(
+                fields=["-risk_score"],
+                name="analytics_high_risk_idx",
+                condition=models.Q(risk_level="HIGH"),
+            ),
+        ]
+
+
+class KPISnapshot(models.Model):
+    """
+    Materialized dashboard KPIs.
+    One row of running counts/sums per (risk level, department, year),
+    maintained incrementally from StudentAnalytics changes.
+    """
+
+    risk_level = models.CharField(
+        max_length=10,
+        choices=StudentAnalytics.RISK_LEVEL_CHOICES
+    )
+    department = models.CharField(max_length=50, blank=True, default="")
+    year = models.IntegerField(default=0)
+
+    student_count = models.IntegerField(default=0)
+    marks_sum = models.FloatField(default=0.0)
+    attendance_sum = models.FloatField(default=0.0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"KPIs {self.risk_level} / {self.department or '-'} / {self.year}"
+
+    class Meta:
+        verbose_name = "KPI Snapshot"
+        verbose_name_plural = "KPI Snapshots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["risk_level", "department", "year"],
+                name="unique_kpi_snapshot_bucket"
+            ),
+        ]
+
+
+class PerformanceEvent(models.Model):
+    """
+    Append-only log of raw attendance / marks / assignment events.
+    StudentKPICounter can always be rebuilt from it.
+    """
+
+    KIND_CHOICES = [
+        ("ATTENDANCE", "Class attendance"),  # value: 1 attended, 0 missed
+        ("MARK", "Assessment mark"),          # value: 0–100
+        ("ASSIGNMENT", "Assignment"),         # value: 1 completed, 0 missed
+    ]
+
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="performance_events"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.FloatField()
+    recorded_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.kind}={self.value} for {self.student}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "kind"], name="perf_event_student_kind_idx"),
+        ]
+
+
+class StudentKPICounter(models.Model):
+    """
+    Running totals per student, updated in O(1) per PerformanceEvent.
+    Derived KPIs (percentages, averages) are computed from these.
+    """
+
+    student = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="kpi_counter"
+    )
+
+    classes_attended = models.IntegerField(default=0)
+    classes_total = models.IntegerField(default=0)
+    marks_sum = models.FloatField(default=0.0)
+    marks_count = models.IntegerField(default=0)
+    assignments_completed = models.IntegerField(default=0)
+    assignments_total = models.IntegerField(default=0)
+
+    last_event_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"KPI counters for {self.student}"
+
+    class Meta:
+        verbose_name = "Student KPI Counter"
+        verbose_name_plural = "Student KPI Counters"
+
+
+class MetricRollup(models.Model):
+    """
+    Periodic snapshot of cohort metrics per (department, year).
+
+    DAY rows hold one snapshot of the current StudentAnalytics state;
+    WEEK / MONTH rows sum the DAY rows of their period (samples = number
+    of daily snapshots), so means stay sum / student_count at every
+    granularity. Trend endpoints read only these rows.
+    """
+
+    PERIOD_CHOICES = [
+        ("DAY", "Daily"),
+        ("WEEK", "Weekly"),
+        ("MONTH", "Monthly"),
+    ]
+
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    department = models.CharField(max_length=50, blank=True, default="")
+    year = models.IntegerField(default=0)
+
+    samples = models.IntegerField(default=1)
+    student_count = models.IntegerField(default=0)
+    attendance_sum = models.FloatField(default=0.0)
+    marks_sum = models.FloatField(default=0.0)
+    assignment_sum = models.FloatField(default=0.0)
+    risk_score_sum = models.FloatField(default=0.0)
+    high_risk_count = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.period} {self.period_start} / {self.department or '-'} / {self.year}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "period_start", "department", "year"],
+                name="unique_metric_rollup_bucket"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["period", "-period_start"], name="rollup_period_start_idx"),
+        ]
@@ -0,0 +1,283 @@
+"""
+analytics/ranking.py
+
+Precomputed top-K at-risk ranking, overall and per department.
+
+Each process keeps, per scope, a window of the highest risk scores as a
+list of (-risk_score, student_id) keys in sorted order. A scope is
+loaded lazily with one ORDER BY ... LIMIT query (served by the
+analytics_risk_score_idx index) and is then kept current by the
+StudentAnalytics / Student signal handlers: a score change is a bisect
+removal plus an insertion, never a re-sort. Reads slice the list, so a
+page of the ranking costs O(page size).
+
+Windows hold up to 2 * RANKING_SIZE students so that students dropping
+out of the top RANKING_SIZE can be replaced without a query; a window
+that shrinks below RANKING_SIZE (and doesn't already hold the whole
+scope) is reloaded on its next read.
+
+As with the cohort frame, a generation counter in the shared Django
+cache (settings.CACHES) marks other processes' windows as stale. The process that made a change
+patches its own windows in place instead of reloading them.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+from .models import StudentAnalytics
+from .snapshot import NO_DEPARTMENT
+
+
+GENERATION_KEY = "analytics:ranking:generation"
+
+# depth of the ranking served per scope
+RANKING_SIZE = 500
+
+# Safety net for writes that bypass signals (queryset.update, raw SQL)
+RANKING_MAX_AGE = 300
+
+# scope key of the ranking across all departments
+OVERALL = None
+
+
+# -------------------------------
+# LOADING
+# -------------------------------
+
+def load_scope(department, limit) -> list:
+    """
+    (student_id, risk_score) of the `limit` highest risk scores in a
+    department (every department for OVERALL), best first
+    """
+    queryset = StudentAnalytics.objects.all()
+    if department is not OVERALL:
+        queryset = queryset.annotate(
+            department=Coalesce(
+                F("student__student_profile__department"), Value(NO_DEPARTMENT)
+            )
+        ).filter(department=department)
+
+    return list(
+        queryset.order_by("-risk_score", "student_id")
+        .values_list("student_id", "risk_score")[:limit]
+    )
+
+
+def current_rank_inputs(user_id):
+    """
+    (risk_score, department) of a student, or None without analytics
+    """
+    return StudentAnalytics.objects.filter(student_id=user_id).annotate(
+        department=Coalesce(
+            F("student__student_profile__department"), Value(NO_DEPARTMENT)
+        )
+    ).values_list("risk_score", "department").first()
+
+
+# -------------------------------
+# SCOPE WINDOW
+# -------------------------------
+
+class ScopeRanking:
+    """
+    The best `capacity` students of one scope, sorted by
+    (-risk_score, student_id).
+
+    complete: the window holds every student of the scope, so any
+    student may enter it; otherwise only students ranking above the
+    last kept entry can.
+    """
+
+    def __init__(self, rows, capacity):
+        self.capacity = capacity
+        self.keys = sorted((-score, student_id) for student_id, score in rows)
+        self.members = {key[1]: key for key in self.keys}
+        self.complete = len(self.keys) < capacity
+
+    def __len__(self):
+        return len(self.keys)
+
+    def discard(self, student_id):
+        key = self.members.pop(student_id, None)
+        if key is not None:
+            del self.keys[bisect_left(self.keys, key)]
+
+    def add(self, student_id, risk_score):
+        key = (-risk_score, student_id)
+        if not self.complete and (not self.keys or key > self.keys[-1]):
+            # ranks below the window; its exact position is unknown
+            return
+
+        insort(self.keys, key)
+        self.members[student_id] = key
+
+        if len(self.keys) > self.capacity:
+            _, dropped = self.keys.pop()
+            del self.members[dropped]
+            self.complete = False
+
+    def page(self, offset, limit, depth) -> list:
+        end = min(offset + limit, depth, len(self.keys))
+        return [(student_id, -score) for score, student_id in self.keys[offset:end]]
+
+
+# -------------------------------
+# PROCESS-LOCAL RANKING
+# -------------------------------
+
+def current_generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 0, None)
+        generation = cache.get(GENERATION_KEY, 0)
+    return generation
+
+
+def _bump_generation() -> int:
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+        return 1
+
+
+class RiskRanking:
+    """
+    Lazily loaded ScopeRanking windows keyed by department
+    (OVERALL for the whole cohort)
+    """
+
+    def __init__(self, size=RANKING_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._scopes = {}
+        self._generation = None
+        self._loaded_at = 0.0
+
+    def _sync(self):
+        generation = current_generation()
+        if (
+            generation != self._generation
+            or time.monotonic() - self._loaded_at >= RANKING_MAX_AGE
+        ):
+            self._scopes.clear()
+            self._generation = generation
+            self._loaded_at = time.monotonic()
+
+    def _scope(self, department) -> ScopeRanking:
+        scope = self._scopes.get(department)
+        if scope is None or (not scope.complete and len(scope) < self.size):
+            capacity = 2 * self.size
+            scope = self._scopes[department] = ScopeRanking(
+                load_scope(department, capacity), capacity
+            )
+        return scope
+
+    def page(self, department=OVERALL, offset=0, limit=25) -> tuple:
+        """
+        Returns ([(student_id, risk_score), ...] for ranks
+        offset + 1 .. offset + limit, number of ranked students)
+        """
+        with self._lock:
+            self._sync()
+            scope = self._scope(department)
+            depth = min(len(scope), self.size)
+            return scope.page(offset, limit, depth), depth
+
+    def update(self, student_id, risk_score=None, department=None):
+        """
+        Moves a student to their new position (risk_score None removes
+        them). Other processes are told to reload; this one patches its
+        windows in place when no other change happened since its last sync.
+        """
+        with self._lock:
+            generation = _bump_generation()
+            if self._generation is None or generation != self._generation + 1:
+                self._scopes.clear()
+                self._generation = None
+                return
+            self._generation = generation
+
+            for scope in self._scopes.values():
+                scope.discard(student_id)
+
+            if risk_score is None:
+                return
+            for key in (OVERALL, department):
+                scope = self._scopes.get(key)
+                if scope is not None:
+                    scope.add(student_id, risk_score)
+
+    def clear(self):
+        with self._lock:
+            self._scopes.clear()
+            self._generation = None
+
+
+risk_ranking = RiskRanking()
+
+
+def refresh_student_rank(user_id):
+    """
+    Re-reads a student's committed score and department and moves them
+    in the ranking; called from on_commit hooks
+    """
+    inputs = current_rank_inputs(user_id)
+    if inputs is None:
+        risk_ranking.update(user_id)
+    else:
+        risk_ranking.update(user_id, *inputs)
+
+
+def invalidate_risk_ranking():
+    """
+    Makes every process reload its ranking, after bulk writes that
+    bypass signals
+    """
+    _bump_generation()
+
+
+def get_at_risk_page(department=None, page=1, page_size=25) -> dict:
+    """
+    One page of the at-risk ranking with each student's details,
+    read in a single query
+    """
+    offset = (page - 1) * page_size
+    entries, ranked = risk_ranking.page(department or OVERALL, offset, page_size)
+
+    details = {
+        row["student_id"]: row
+        for row in StudentAnalytics.objects.filter(
+            student_id__in=[student_id for student_id, _ in entries]
+        ).values(
+            "student_id",
+            "risk_level",
+            "attendance_percentage",
+            "average_marks",
+            "assignment_completion_rate",
+            username=F("student__username"),
+            department=F("student__student_profile__department"),
+            year=F("student__student_profile__year"),
+        )
+    }
+
+    return {
+        "department": department or None,
+        "count": ranked,
+        "page": page,
+        "page_size": page_size,
+        "has_next": offset + page_size < ranked,
+        "results": [
+            {
+                "rank": offset + i + 1,
+                **details.get(student_id, {"student_id": student_id}),
+                "risk_score": risk_score,
+            }
+            for i, (student_id, risk_score) in enumerate(entries)
+        ],
+    }
@@ -0,0 +1,186 @@
+"""
+analytics/rollups.py
+
+Time-series rollups behind the attendance / performance trend charts.
+
+record_metrics_snapshot() takes one GROUP BY snapshot of StudentAnalytics
+per (department, year) and stores it as DAY rows, then re-derives the
+WEEK and MONTH rows containing that day from the DAY rows. Re-running it
+for the same day replaces that day's snapshot instead of double counting.
+
+Trend queries aggregate at most `points` periods x (department, year)
+buckets, independent of the number of students or of how much history
+has been recorded.
+"""
+
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from .models import MetricRollup, StudentAnalytics
+from .snapshot import NO_DEPARTMENT, NO_YEAR
+
+PERIODS = ("DAY", "WEEK", "MONTH")
+
+DEFAULT_POINTS = {"DAY": 30, "WEEK": 26, "MONTH": 12}
+MAX_POINTS = 1000
+
+# trend metric -> rollup sum column
+TREND_METRICS = {
+    "attendance": "attendance_sum",
+    "marks": "marks_sum",
+    "assignments": "assignment_sum",
+    "risk_score": "risk_score_sum",
+}
+
+SUM_FIELDS = (
+    "student_count",
+    "attendance_sum",
+    "marks_sum",
+    "assignment_sum",
+    "risk_score_sum",
+    "high_risk_count",
+)
+
+
+# -------------------------------
+# PERIODS
+# -------------------------------
+
+def period_start(day: date, period: str) -> date:
+    if period == "DAY":
+        return day
+    if period == "WEEK":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def period_end(start: date, period: str) -> date:
+    """
+    Exclusive end of the period starting at `start`
+    """
+    if period == "DAY":
+        return start + timedelta(days=1)
+    if period == "WEEK":
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def period_label(start: date, period: str) -> str:
+    if period == "MONTH":
+        return start.strftime("%b %Y")
+    if period == "WEEK":
+        iso_year, week, _ = start.isocalendar()
+        return f"{iso_year}-W{week:02d}"
+    return start.isoformat()
+
+
+# -------------------------------
+# SNAPSHOTS
+# -------------------------------
+
+def cohort_totals() -> list:
+    """
+    Current per (department, year) sums over StudentAnalytics
+    """
+    return list(
+        StudentAnalytics.objects.values(
+            department=Coalesce(
+                F("student__student_profile__department"), Value(NO_DEPARTMENT)
+            ),
+            year=Coalesce(F("student__student_profile__year"), Value(NO_YEAR)),
+        ).annotate(
+            student_count=Count("id"),
+            attendance_sum=Coalesce(Sum("attendance_percentage"), 0.0),
+            marks_sum=Coalesce(Sum("average_marks"), 0.0),
+            assignment_sum=Coalesce(Sum("assignment_completion_rate"), 0.0),
+            risk_score_sum=Coalesce(Sum("risk_score"), 0.0),
+            high_risk_count=Count("id", filter=Q(risk_level="HIGH")),
+        ).order_by()
+    )
+
+
+def _replace_rows(period, start, rows):
+    MetricRollup.objects.filter(period=period, period_start=start).delete()
+    MetricRollup.objects.bulk_create(
+        MetricRollup(period=period, period_start=start, **row) for row in rows
+    )
+
+
+@transaction.atomic
+def record_metrics_snapshot(day: date = None) -> int:
+    """
+    Stores today's (or `day`'s) snapshot and refreshes the week and month
+    containing it. Returns the number of (department, year) buckets.
+    """
+    day = day or timezone.localdate()
+
+    totals = cohort_totals()
+    _replace_rows("DAY", day, [{**row, "samples": 1} for row in totals])
+
+    for period in ("WEEK", "MONTH"):
+        start = period_start(day, period)
+        rows = MetricRollup.objects.filter(
+            period="DAY",
+            period_start__gte=start,
+            period_start__lt=period_end(start, period),
+        ).values("department", "year").annotate(
+            samples=Count("id"),
+            **{field: Sum(field) for field in SUM_FIELDS}
+        ).order_by()
+        _replace_rows(period, start, rows)
+
+    return len(totals)
+
+
+# -------------------------------
+# TREND QUERIES
+# -------------------------------
+
+def metric_trend(metric, period="MONTH", department=None, year=None,
+                 start=None, end=None, points=None) -> list:
+    """
+    Mean of `metric` per period, oldest first:
+    [{label, period_start, value, students}, ...]
+
+    Without start/end the latest `points` periods are returned.
+    """
+    if metric not in TREND_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {', '.join(p.lower() for p in PERIODS)}")
+
+    points = points or DEFAULT_POINTS[period]
+    if not 1 <= points <= MAX_POINTS:
+        raise ValueError(f"points must be between 1 and {MAX_POINTS}")
+
+    queryset = MetricRollup.objects.filter(period=period)
+    if department:
+        queryset = queryset.filter(department=department)
+    if year is not None:
+        queryset = queryset.filter(year=year)
+    if start:
+        queryset = queryset.filter(period_start__gte=period_start(start, period))
+    if end:
+        queryset = queryset.filter(period_start__lte=end)
+
+    rows = queryset.values("period_start").annotate(
+        student_days=Sum("student_count"),
+        # student_count is summed over each bucket's own daily snapshots,
+        # and buckets that appeared mid-period have fewer of them
+        students=Sum(Cast("student_count", FloatField()) / F("samples")),
+        total=Sum(TREND_METRICS[metric]),
+    ).order_by("-period_start")[:points]
+
+    return [
+        {
+            "label": period_label(row["period_start"], period),
+            "period_start": row["period_start"].isoformat(),
+            "value": round(row["total"] / row["student_days"], 2) if row["student_days"] else None,
+            "students": round(row["students"]),
+        }
+        for row in reversed(rows)
+    ]
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import StudentAnalytics
+
+from .events import validate_event
+from .models import PerformanceEvent, StudentAnalytics
 
 
 class StudentAnalyticsSerializer(serializers.ModelSerializer):
@@ -38,3 +40,23 @@ class DashboardSerializer(serializers.Serializer):
     at_risk_students = serializers.IntegerField()
     average_marks = serializers.FloatField()
     average_attendance = serializers.FloatField()
+    snapshot_updated_at = serializers.DateTimeField(allow_null=True)
+    snapshot_age_seconds = serializers.FloatField(allow_null=True)
+
+
+class PerformanceEventSerializer(serializers.ModelSerializer):
+    """
+    One raw attendance / mark / assignment event
+    """
+
+    class Meta:
+        model = PerformanceEvent
+        fields = ["id", "student", "kind", "value", "recorded_at"]
+        read_only_fields = ["id", "recorded_at"]
+
+    def validate(self, attrs):
+        try:
+            attrs["value"] = validate_event(attrs["kind"], attrs["value"])
+        except ValueError as e:
+            raise serializers.ValidationError({"value": str(e)})
+        return attrs
@@ -5,8 +5,36 @@ This module contains all KPI calculations and risk evaluation logic.
 Keeping this logic here follows clean architecture principles.
 """
 
+from bisect import bisect_right
 from typing import Dict
 
+import numpy as np
+
+from ssaes_backend.instrumentation import timed
+
+
+# -------------------------------
+# RULE THRESHOLDS
+# -------------------------------
+
+RISK_WEIGHTS = {
+    "attendance": 0.3,
+    "marks": 0.4,
+    "assignments": 0.3,
+}
+
+# risk_score >= 40 -> MEDIUM, >= 70 -> HIGH
+RISK_LEVEL_THRESHOLDS = [40, 70]
+RISK_LEVELS = ["LOW", "MEDIUM", "HIGH"]
+
+# logistic scale (in risk score points) used to turn a score into level
+# probabilities when no calibrated scale is available
+RISK_PROBABILITY_SCALE = 5.0
+
+# average_marks >= 40 -> D, >= 55 -> C, >= 70 -> B, >= 85 -> A
+GRADE_THRESHOLDS = [40, 55, 70, 85]
+GRADES = ["F", "D", "C", "B", "A"]
+
 
 # -------------------------------
 # KPI CALCULATION FUNCTIONS
@@ -57,14 +85,10 @@ def calculate_risk_score(
     - Assignments: 30%
     """
 
-    attendance_weight = 0.3
-    marks_weight = 0.4
-    assignment_weight = 0.3
-
     risk_score = (
-        (100 - attendance_percentage) * attendance_weight +
-        (100 - average_marks) * marks_weight +
-        (100 - assignment_completion_rate) * assignment_weight
+        (100 - attendance_percentage) * RISK_WEIGHTS["attendance"] +
+        (100 - average_marks) * RISK_WEIGHTS["marks"] +
+        (100 - assignment_completion_rate) * RISK_WEIGHTS["assignments"]
     )
 
     return round(max(0, min(risk_score, 100)), 2)
@@ -78,11 +102,7 @@ def determine_risk_level(risk_score: float) -> str:
     """
     Classifies student risk level
     """
-    if risk_score >= 70:
-        return "HIGH"
-    elif risk_score >= 40:
-        return "MEDIUM"
-    return "LOW"
+    return RISK_LEVELS[bisect_right(RISK_LEVEL_THRESHOLDS, risk_score)]
 
 
 # -------------------------------
@@ -94,21 +114,93 @@ def predict_grade(average_marks: float) -> str:
     Rule-based grade prediction
     (Can be replaced with ML model later)
     """
-    if average_marks >= 85:
-        return "A"
-    elif average_marks >= 70:
-        return "B"
-    elif average_marks >= 55:
-        return "C"
-    elif average_marks >= 40:
-        return "D"
-    return "F"
+    return GRADES[bisect_right(GRADE_THRESHOLDS, average_marks)]
+
+
+# -------------------------------
+# VECTORIZED RULE ENGINE
+# -------------------------------
+
+def calculate_risk_scores(
+    attendance_percentage: np.ndarray,
+    average_marks: np.ndarray,
+    assignment_completion_rate: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized calculate_risk_score over column arrays
+    """
+    risk_scores = (
+        (100 - np.asarray(attendance_percentage, dtype=float)) * RISK_WEIGHTS["attendance"] +
+        (100 - np.asarray(average_marks, dtype=float)) * RISK_WEIGHTS["marks"] +
+        (100 - np.asarray(assignment_completion_rate, dtype=float)) * RISK_WEIGHTS["assignments"]
+    )
+
+    return np.round(np.clip(risk_scores, 0, 100), 2)
+
+
+def determine_risk_levels(risk_scores: np.ndarray) -> np.ndarray:
+    """
+    Vectorized determine_risk_level
+    """
+    return np.array(RISK_LEVELS)[
+        np.digitize(risk_scores, RISK_LEVEL_THRESHOLDS)
+    ]
+
+
+def risk_level_probabilities(
+    risk_scores: np.ndarray,
+    scale: float = RISK_PROBABILITY_SCALE
+) -> np.ndarray:
+    """
+    Ordinal logistic mapping of risk scores to LOW / MEDIUM / HIGH
+    probabilities, one (n, 3) row per score:
+    P(level >= k) = sigmoid((risk_score - threshold_k) / scale)
+    """
+    scores = np.asarray(risk_scores, dtype=float).reshape(-1, 1)
+    z = np.clip((scores - np.asarray(RISK_LEVEL_THRESHOLDS)) / scale, -500, 500)
+    at_least = 1 / (1 + np.exp(-z))
+
+    n = len(scores)
+    upper = np.hstack([np.ones((n, 1)), at_least])
+    lower = np.hstack([at_least, np.zeros((n, 1))])
+    return upper - lower
+
+
+def predict_grades(average_marks: np.ndarray) -> np.ndarray:
+    """
+    Vectorized predict_grade
+    """
+    return np.array(GRADES)[np.digitize(average_marks, GRADE_THRESHOLDS)]
+
+
+def evaluate_risk(
+    attendance_percentage: np.ndarray,
+    average_marks: np.ndarray,
+    assignment_completion_rate: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Rule engine entry point.
+    Takes column arrays and returns score, level and grade
+    arrays in one pass.
+    """
+    risk_scores = calculate_risk_scores(
+        attendance_percentage,
+        average_marks,
+        assignment_completion_rate
+    )
+
+    return {
+        "risk_score": risk_scores,
+        "risk_level": determine_risk_levels(risk_scores),
+        "predicted_grade": predict_grades(average_marks),
+    }
 
 
 # -------------------------------
 # MASTER ANALYTICS GENERATOR
 # -------------------------------
 
+@timed("analytics")
 def generate_student_analytics(data: Dict) -> Dict:
     """
     Central analytics generator used by views / Celery tasks
@@ -135,20 +227,35 @@ def generate_student_analytics(data: Dict) -> Dict:
         data.get("total_assignments", 0)
     )
 
-    risk_score = calculate_risk_score(
-        attendance,
-        average_marks,
-        assignment_rate
-    )
-
-    risk_level = determine_risk_level(risk_score)
-    predicted_grade = predict_grade(average_marks)
+    result = evaluate_risk([attendance], [average_marks], [assignment_rate])
 
     return {
         "attendance_percentage": attendance,
         "average_marks": average_marks,
         "assignment_completion_rate": assignment_rate,
-        "risk_score": risk_score,
-        "risk_level": risk_level,
-        "predicted_grade": predicted_grade,
+        "risk_score": float(result["risk_score"][0]),
+        "risk_level": str(result["risk_level"][0]),
+        "predicted_grade": str(result["predicted_grade"][0]),
+    }
+
+
+@timed("analytics_cohort")
+def generate_cohort_analytics(
+    attendance_percentage: np.ndarray,
+    average_marks: np.ndarray,
+    assignment_completion_rate: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized generate_student_analytics for a whole cohort.
+    Inputs are already-computed KPI columns (one entry per student).
+    """
+    attendance = np.round(np.asarray(attendance_percentage, dtype=float), 2)
+    marks = np.round(np.asarray(average_marks, dtype=float), 2)
+    assignments = np.round(np.asarray(assignment_completion_rate, dtype=float), 2)
+
+    return {
+        "attendance_percentage": attendance,
+        "average_marks": marks,
+        "assignment_completion_rate": assignments,
+        **evaluate_risk(attendance, marks, assignments),
     }
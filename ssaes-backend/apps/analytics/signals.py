@@ -0,0 +1,155 @@
+# analytics/signals.py
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.analytics.engine import invalidate_cohort_frame
+from apps.analytics.models import StudentAnalytics
+from apps.analytics.ranking import refresh_student_rank
+from apps.analytics.snapshot import (
+    NO_DEPARTMENT,
+    NO_YEAR,
+    instance_bucket,
+    move_student_bucket,
+    record_analytics_change,
+    snapshot_changed
+)
+from apps.students.models import Student
+
+
+def tracked_values(instance: StudentAnalytics) -> dict:
+    return {
+        field: getattr(instance, field)
+        for field in StudentAnalytics.TRACKED_FIELDS
+    }
+
+
+@receiver(pre_save, sender=StudentAnalytics)
+def capture_previous_values(sender, instance, raw, **kwargs):
+    """
+    Remember the row's previous tracked values (None for inserts) so
+    post_save handlers can work with deltas and transitions.
+    """
+    if instance._state.adding:
+        instance._previous_values = None
+        return
+
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded is not None and len(loaded) == len(sender.TRACKED_FIELDS):
+        instance._previous_values = loaded
+    else:
+        instance._previous_values = sender.objects.filter(
+            pk=instance.pk
+        ).values(*sender.TRACKED_FIELDS).first()
+
+
+@receiver(post_save, sender=StudentAnalytics)
+def update_kpi_snapshot(sender, instance, created, raw, **kwargs):
+    """
+    Apply this row's change to the dashboard KPI snapshot.
+    """
+    if raw:
+        return
+
+    current = tracked_values(instance)
+    previous = getattr(instance, "_previous_values", None)
+    if snapshot_changed(previous, current):
+        record_analytics_change(
+            instance.student_id, previous, current, instance_bucket(instance)
+        )
+    instance._loaded_values = current
+
+
+@receiver(post_delete, sender=StudentAnalytics)
+def remove_from_kpi_snapshot(sender, instance, **kwargs):
+    """
+    Subtract a deleted row from the dashboard KPI snapshot.
+    """
+    previous = getattr(instance, "_loaded_values", None) or tracked_values(instance)
+    record_analytics_change(
+        instance.student_id, previous, None, instance_bucket(instance)
+    )
+
+
+@receiver(post_save, sender=StudentAnalytics)
+def update_risk_ranking(sender, instance, created, raw, **kwargs):
+    """
+    Move the student in the at-risk ranking when their score changed
+    """
+    if raw:
+        return
+
+    previous = getattr(instance, "_previous_values", None)
+    if previous and previous["risk_score"] == instance.risk_score:
+        return
+
+    transaction.on_commit(partial(refresh_student_rank, instance.student_id))
+
+
+@receiver(post_delete, sender=StudentAnalytics)
+def remove_from_risk_ranking(sender, instance, **kwargs):
+    transaction.on_commit(partial(refresh_student_rank, instance.student_id))
+
+
+@receiver(pre_save, sender=Student)
+def capture_previous_bucket(sender, instance, raw, **kwargs):
+    """
+    Remember the profile's previous (department, year) for the snapshot
+    """
+    if instance._state.adding:
+        instance._previous_bucket = (NO_DEPARTMENT, NO_YEAR)
+        return
+
+    instance._previous_bucket = sender.objects.filter(
+        pk=instance.pk
+    ).values_list("department", "year").first() or (NO_DEPARTMENT, NO_YEAR)
+
+
+@receiver(post_save, sender=Student)
+def move_kpi_bucket(sender, instance, raw, **kwargs):
+    """
+    Keep the student's analytics in the snapshot bucket of their
+    current department/year
+    """
+    if raw:
+        return
+
+    previous = getattr(instance, "_previous_bucket", (NO_DEPARTMENT, NO_YEAR))
+    move_student_bucket(
+        instance.user_id,
+        previous,
+        (instance.department, instance.year)
+    )
+    if previous[0] != instance.department:
+        # the student moves between department rankings
+        transaction.on_commit(partial(refresh_student_rank, instance.user_id))
+    instance._previous_bucket = (instance.department, instance.year)
+
+
+@receiver(post_delete, sender=Student)
+def release_kpi_bucket(sender, instance, **kwargs):
+    """
+    A student whose profile is deleted falls back to the no-department
+    bucket (a no-op when the analytics row went in the same cascade)
+    """
+    move_student_bucket(
+        instance.user_id,
+        (instance.department, instance.year),
+        (NO_DEPARTMENT, NO_YEAR)
+    )
+    transaction.on_commit(partial(refresh_student_rank, instance.user_id))
+
+
+@receiver(post_save, sender=StudentAnalytics)
+@receiver(post_delete, sender=StudentAnalytics)
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_cohort(sender, **kwargs):
+    """
+    Cohort frames cached by analytics.engine are stale once the
+    analytics rows or a student's department/year change.
+    """
+    transaction.on_commit(invalidate_cohort_frame)
@@ -0,0 +1,293 @@
+"""
+analytics/snapshot.py
+
+Incremental maintenance of the KPISnapshot table.
+
+Every StudentAnalytics insert/update/delete applies a small delta to the
+(risk level, department, year) bucket it belongs to, so the dashboard
+never has to scan StudentAnalytics. rebuild_kpi_snapshot() recomputes
+all buckets with a single GROUP BY after bulk writes that bypass signals.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.students.models import Student
+from .models import KPISnapshot, StudentAnalytics
+from .services import RISK_LEVELS
+
+
+# Bucket used for analytics rows whose user has no Student profile
+NO_DEPARTMENT = ""
+NO_YEAR = 0
+
+# StudentAnalytics fields that contribute to a bucket
+SNAPSHOT_FIELDS = ("risk_level", "average_marks", "attendance_percentage")
+
+
+# -------------------------------
+# BUCKET LOOKUP
+# -------------------------------
+
+def get_student_bucket(user_id) -> tuple:
+    """
+    Returns (department, year) for a student user
+    """
+    bucket = Student.objects.filter(user_id=user_id).values_list(
+        "department", "year"
+    ).first()
+    return bucket or (NO_DEPARTMENT, NO_YEAR)
+
+
+def instance_bucket(analytics: StudentAnalytics) -> tuple:
+    """
+    (department, year) of an analytics row's student, read from its
+    already loaded student / profile relations when possible so saves
+    of select_related rows don't need a lookup query
+    """
+    if StudentAnalytics.student.is_cached(analytics):
+        user = analytics.student
+        if type(user).student_profile.is_cached(user):
+            profile = getattr(user, "student_profile", None)
+            if profile is None:
+                return NO_DEPARTMENT, NO_YEAR
+            return profile.department, profile.year
+
+    return get_student_bucket(analytics.student_id)
+
+
+# -------------------------------
+# INCREMENTAL UPDATES
+# -------------------------------
+
+def apply_kpi_delta(risk_level, department, year, count, marks, attendance):
+    """
+    Adds a delta to one snapshot bucket, creating it if needed
+    """
+    bucket = KPISnapshot.objects.filter(
+        risk_level=risk_level,
+        department=department,
+        year=year
+    )
+    changes = {
+        "student_count": F("student_count") + count,
+        "marks_sum": F("marks_sum") + marks,
+        "attendance_sum": F("attendance_sum") + attendance,
+        "updated_at": timezone.now(),
+    }
+
+    with transaction.atomic():
+        if not bucket.update(**changes):
+            KPISnapshot.objects.get_or_create(
+                risk_level=risk_level,
+                department=department,
+                year=year
+            )
+            bucket.update(**changes)
+
+
+def snapshot_changed(previous: dict, current: dict) -> bool:
+    return not (
+        previous and current
+        and all(previous[f] == current[f] for f in SNAPSHOT_FIELDS)
+    )
+
+
+def record_analytics_change(user_id, previous: dict, current: dict, bucket=None):
+    """
+    Moves one student's contribution between snapshot buckets.
+
+    previous / current are dicts of StudentAnalytics.TRACKED_FIELDS
+    (None for an insert / delete respectively). bucket is the student's
+    (department, year), looked up when not given.
+    """
+    if not snapshot_changed(previous, current):
+        return
+
+    department, year = bucket or get_student_bucket(user_id)
+
+    with transaction.atomic():
+        if previous and current and previous["risk_level"] == current["risk_level"]:
+            apply_kpi_delta(
+                current["risk_level"], department, year, 0,
+                current["average_marks"] - previous["average_marks"],
+                current["attendance_percentage"] - previous["attendance_percentage"],
+            )
+            return
+
+        if previous:
+            apply_kpi_delta(
+                previous["risk_level"], department, year, -1,
+                -previous["average_marks"],
+                -previous["attendance_percentage"],
+            )
+        if current:
+            apply_kpi_delta(
+                current["risk_level"], department, year, 1,
+                current["average_marks"],
+                current["attendance_percentage"],
+            )
+
+
+def move_student_bucket(user_id, previous_bucket: tuple, current_bucket: tuple):
+    """
+    Moves a student's analytics contribution when their profile's
+    (department, year) changes, or when the profile is created after
+    the analytics row
+    """
+    if previous_bucket == current_bucket:
+        return
+
+    row = StudentAnalytics.objects.filter(student_id=user_id).values(
+        "risk_level", "average_marks", "attendance_percentage"
+    ).first()
+    if row is None:
+        return
+
+    with transaction.atomic():
+        apply_kpi_delta(
+            row["risk_level"], *previous_bucket, -1,
+            -row["average_marks"], -row["attendance_percentage"],
+        )
+        apply_kpi_delta(
+            row["risk_level"], *current_bucket, 1,
+            row["average_marks"], row["attendance_percentage"],
+        )
+
+
+# -------------------------------
+# FULL REBUILD / RECONCILE
+# -------------------------------
+
+def grouped_buckets():
+    """
+    Every bucket's expected values, computed from StudentAnalytics
+    with one GROUP BY
+    """
+    return StudentAnalytics.objects.values(
+        "risk_level",
+        department=Coalesce(
+            F("student__student_profile__department"), Value(NO_DEPARTMENT)
+        ),
+        year=Coalesce(F("student__student_profile__year"), Value(NO_YEAR)),
+    ).annotate(
+        student_count=Count("id"),
+        marks_sum=Sum("average_marks"),
+        attendance_sum=Sum("attendance_percentage"),
+    ).order_by()
+
+
+def kpi_snapshot_drift(tolerance=1e-6) -> list:
+    """
+    Buckets whose stored values differ from a fresh GROUP BY, as
+    (risk_level, department, year, stored, expected) rows where
+    stored / expected are (student_count, marks_sum, attendance_sum)
+    """
+    fields = ("student_count", "marks_sum", "attendance_sum")
+
+    def key(row):
+        return row["risk_level"], row["department"], row["year"]
+
+    expected = {key(row): tuple(row[f] for f in fields) for row in grouped_buckets()}
+    stored = {
+        key(row): tuple(row[f] for f in fields)
+        for row in KPISnapshot.objects.values("risk_level", "department", "year", *fields)
+    }
+
+    drift = []
+    for bucket in sorted(expected.keys() | stored.keys()):
+        have = stored.get(bucket, (0, 0.0, 0.0))
+        want = expected.get(bucket, (0, 0.0, 0.0))
+        if have[0] != want[0] or any(abs(a - b) > tolerance for a, b in zip(have[1:], want[1:])):
+            drift.append((*bucket, have, want))
+    return drift
+
+
+def rebuild_kpi_snapshot() -> int:
+    """
+    Recomputes every bucket from StudentAnalytics with one GROUP BY.
+    Returns the number of buckets written.
+    """
+    now = timezone.now()
+    buckets = [KPISnapshot(updated_at=now, **row) for row in grouped_buckets()]
+
+    with transaction.atomic():
+        KPISnapshot.objects.all().delete()
+        KPISnapshot.objects.bulk_create(buckets)
+
+    return len(buckets)
+
+
+# -------------------------------
+# DASHBOARD READ
+# -------------------------------
+
+def get_dashboard_kpis() -> dict:
+    """
+    Reads the dashboard KPIs from the snapshot in a single query
+    """
+    totals = KPISnapshot.objects.aggregate(
+        total_students=Sum("student_count"),
+        at_risk_students=Sum("student_count", filter=Q(risk_level="HIGH")),
+        marks_sum=Sum("marks_sum"),
+        attendance_sum=Sum("attendance_sum"),
+        updated_at=Max("updated_at"),
+    )
+
+    total_students = totals["total_students"] or 0
+    updated_at = totals["updated_at"]
+
+    return {
+        "total_students": total_students,
+        "at_risk_students": totals["at_risk_students"] or 0,
+        "average_marks": (
+            totals["marks_sum"] / total_students if total_students else 0
+        ),
+        "average_attendance": (
+            totals["attendance_sum"] / total_students if total_students else 0
+        ),
+        "snapshot_updated_at": updated_at,
+        "snapshot_age_seconds": (
+            round((timezone.now() - updated_at).total_seconds(), 1)
+            if updated_at else None
+        ),
+    }
+
+
+def get_risk_distribution(department=None, year=None, breakdown=()) -> list:
+    """
+    LOW / MEDIUM / HIGH student counts from the snapshot, optionally
+    restricted to a department / year and grouped by `breakdown`
+    (any of "department", "year"). Levels without students are
+    reported with a zero count.
+    """
+    queryset = KPISnapshot.objects.all()
+    if department:
+        queryset = queryset.filter(department=department)
+    if year is not None:
+        queryset = queryset.filter(year=year)
+
+    groups = {}
+    rows = queryset.values(*breakdown, "risk_level").annotate(
+        count=Sum("student_count")
+    ).order_by(*breakdown)
+
+    for row in rows:
+        group = tuple(row[field] for field in breakdown)
+        groups.setdefault(group, dict.fromkeys(RISK_LEVELS, 0))[row["risk_level"]] = row["count"]
+
+    if not breakdown:
+        groups.setdefault((), dict.fromkeys(RISK_LEVELS, 0))
+
+    return [
+        {
+            **dict(zip(breakdown, group)),
+            "risk": level.title(),
+            "risk_level": level,
+            "count": counts[level],
+        }
+        for group, counts in groups.items()
+        for level in RISK_LEVELS
+    ]
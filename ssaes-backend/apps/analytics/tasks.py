@@ -0,0 +1,13 @@
+# analytics/tasks.py
+
+from celery import shared_task
+
+from .rollups import record_metrics_snapshot
+
+
+@shared_task
+def record_metrics_snapshot_task():
+    """
+    Daily trend snapshot (scheduled in CELERY_BEAT_SCHEDULE)
+    """
+    return record_metrics_snapshot()
@@ -1,19 +1,43 @@
 
 
 # Create your tests here.
+import io
+from unittest import mock
+from datetime import date
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from .models import StudentAnalytics
+from apps.alerts.models import Alert
+from apps.alerts.services import save_alerts
+from apps.students.models import Student
+from .engine import attendance_vs_score, get_cohort_frame
+from .events import rebuild_kpi_counters, record_event
+from .models import StudentAnalytics, KPISnapshot, MetricRollup, StudentKPICounter
+from .ranking import RiskRanking, ScopeRanking, risk_ranking
+from .rollups import metric_trend, record_metrics_snapshot
+from .snapshot import (
+    get_dashboard_kpis,
+    get_risk_distribution,
+    kpi_snapshot_drift,
+    rebuild_kpi_snapshot
+)
 from .services import (
     calculate_attendance_kpi,
     calculate_average_marks,
     calculate_assignment_completion,
     calculate_risk_score,
     determine_risk_level,
+    predict_grade,
+    evaluate_risk,
+    generate_cohort_analytics,
 )
 
 User = get_user_model()
@@ -47,6 +71,50 @@ class AnalyticsServiceTests(TestCase):
         self.assertEqual(determine_risk_level(risk_score), "HIGH")
 
 
+class VectorizedRuleEngineTests(TestCase):
+
+    def test_thresholds_match_scalar_rules(self):
+        attendance = [100, 60, 30, 0, 55]
+        marks = [85, 70, 55, 40, 39.99]
+        assignments = [100, 50, 20, 0, 70]
+
+        result = evaluate_risk(attendance, marks, assignments)
+
+        for i in range(len(marks)):
+            score = calculate_risk_score(attendance[i], marks[i], assignments[i])
+            self.assertEqual(result["risk_score"][i], score)
+            self.assertEqual(result["risk_level"][i], determine_risk_level(score))
+            self.assertEqual(result["predicted_grade"][i], predict_grade(marks[i]))
+
+    def test_boundary_scores(self):
+        result = evaluate_risk([40, 0], [40, 25], [40, 0])
+        self.assertEqual(list(result["risk_score"]), [60.0, 90.0])
+        self.assertEqual(list(result["risk_level"]), ["MEDIUM", "HIGH"])
+
+    def test_level_thresholds_match_scalar_rules(self):
+        # equal features give risk_score = 100 - feature
+        scores = [39.99, 40, 40.01, 69.99, 70, 70.01]
+        features = [100 - score for score in scores]
+
+        result = evaluate_risk(features, features, features)
+
+        self.assertEqual(
+            list(result["risk_level"]),
+            ["LOW", "MEDIUM", "MEDIUM", "MEDIUM", "HIGH", "HIGH"]
+        )
+        for i, score in enumerate(scores):
+            self.assertAlmostEqual(result["risk_score"][i], score)
+            self.assertEqual(
+                result["risk_level"][i],
+                determine_risk_level(calculate_risk_score(*[features[i]] * 3))
+            )
+
+    def test_cohort_analytics_returns_columns(self):
+        result = generate_cohort_analytics([90, 20], [88, 30], [95, 10])
+        self.assertEqual(list(result["risk_level"]), ["LOW", "HIGH"])
+        self.assertEqual(list(result["predicted_grade"]), ["A", "F"])
+
+
 # -----------------------------
 # MODEL TESTS
 # -----------------------------
@@ -120,3 +188,594 @@ class DashboardAPITests(TestCase):
         self.assertIn("total_students", response.data)
         self.assertIn("at_risk_students", response.data)
         self.assertEqual(response.data["at_risk_students"], 1)
+        self.assertIn("snapshot_age_seconds", response.data)
+
+
+# -----------------------------
+# KPI SNAPSHOT TESTS
+# -----------------------------
+
+class KPISnapshotTests(TestCase):
+
+    def setUp(self):
+        self.student = User.objects.create_user(username="s1", password="123")
+        self.analytics = StudentAnalytics.objects.create(
+            student=self.student,
+            attendance_percentage=80,
+            average_marks=70,
+            risk_level="LOW"
+        )
+
+    def snapshot_rows(self):
+        return sorted(
+            KPISnapshot.objects.filter(student_count__gt=0).values_list(
+                "risk_level", "department", "year",
+                "student_count", "marks_sum", "attendance_sum"
+            )
+        )
+
+    def test_insert_is_counted(self):
+        kpis = get_dashboard_kpis()
+        self.assertEqual(kpis["total_students"], 1)
+        self.assertEqual(kpis["average_marks"], 70)
+
+    def test_update_moves_student_between_buckets(self):
+        analytics = StudentAnalytics.objects.get(pk=self.analytics.pk)
+        analytics.risk_level = "HIGH"
+        analytics.average_marks = 30
+        analytics.save()
+
+        kpis = get_dashboard_kpis()
+        self.assertEqual(kpis["total_students"], 1)
+        self.assertEqual(kpis["at_risk_students"], 1)
+        self.assertEqual(kpis["average_marks"], 30)
+
+    def test_delete_is_subtracted(self):
+        self.analytics.delete()
+        self.assertEqual(get_dashboard_kpis()["total_students"], 0)
+
+    def test_rebuild_matches_incremental_state(self):
+        other = User.objects.create_user(username="s2", password="123")
+        StudentAnalytics.objects.create(
+            student=other,
+            attendance_percentage=40,
+            average_marks=35,
+            risk_level="HIGH"
+        )
+        incremental = self.snapshot_rows()
+
+        rebuild_kpi_snapshot()
+        self.assertEqual(self.snapshot_rows(), incremental)
+
+    def distribution(self, **kwargs):
+        return {
+            tuple(row[f] for f in kwargs.get("breakdown", ())) + (row["risk_level"],): row["count"]
+            for row in get_risk_distribution(**kwargs)
+        }
+
+    def test_risk_distribution_is_zero_filled(self):
+        self.assertEqual(self.distribution(), {("LOW",): 1, ("MEDIUM",): 0, ("HIGH",): 0})
+
+        with self.assertNumQueries(1):
+            get_risk_distribution()
+
+    def test_profile_moves_student_between_departments(self):
+        profile = Student.objects.create(
+            user=self.student, enrollment_number="E1", department="CSE", year=2
+        )
+        self.assertEqual(
+            self.distribution(breakdown=("department", "year"))[("CSE", 2, "LOW")], 1
+        )
+
+        profile.department = "ECE"
+        profile.save()
+
+        by_department = self.distribution(breakdown=("department",))
+        self.assertEqual(by_department[("ECE", "LOW")], 1)
+        self.assertEqual(by_department.get(("CSE", "LOW"), 0), 0)
+        self.assertEqual(kpi_snapshot_drift(), [])
+
+    def test_deleting_profile_or_user_keeps_snapshot_exact(self):
+        profile = Student.objects.create(
+            user=self.student, enrollment_number="E1", department="CSE", year=2
+        )
+
+        profile.delete()
+        self.assertEqual(kpi_snapshot_drift(), [])
+        self.assertEqual(self.distribution(breakdown=("department",))[("", "LOW")], 1)
+
+        Student.objects.create(
+            user=self.student, enrollment_number="E1", department="CSE", year=2
+        )
+        # cascades to the profile and the analytics row
+        self.student.delete()
+        self.assertEqual(kpi_snapshot_drift(), [])
+        self.assertEqual(get_dashboard_kpis()["total_students"], 0)
+
+    def test_loaded_profile_saves_without_bucket_lookup(self):
+        Student.objects.create(
+            user=self.student, enrollment_number="E1", department="CSE", year=2
+        )
+        analytics = StudentAnalytics.objects.select_related(
+            "student__student_profile"
+        ).get(pk=self.analytics.pk)
+        analytics.risk_level = "HIGH"
+
+        with CaptureQueriesContext(connection) as queries:
+            analytics.save()
+        # get_student_bucket would select the profile's department
+        self.assertFalse(any(
+            '"students_student"."department"' in q["sql"] for q in queries.captured_queries
+        ))
+        self.assertEqual(kpi_snapshot_drift(), [])
+
+    def test_reconcile_repairs_drift(self):
+        # queryset.update bypasses the signals
+        StudentAnalytics.objects.filter(pk=self.analytics.pk).update(risk_level="HIGH")
+        self.assertEqual(len(kpi_snapshot_drift()), 2)
+
+        with self.assertRaises(CommandError):
+            call_command("reconcile_kpi_snapshot", "--check", stdout=io.StringIO())
+
+        call_command("reconcile_kpi_snapshot", stdout=io.StringIO())
+        self.assertEqual(kpi_snapshot_drift(), [])
+        self.assertEqual(self.distribution()[("HIGH",)], 1)
+
+    def test_risk_distribution_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="admin", role="ADMIN"))
+
+        response = client.get("/api/analytics/risk-distribution/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {"risk": "Low", "risk_level": "LOW", "count": 1})
+
+        response = client.get("/api/analytics/risk-distribution/", {"breakdown": "room"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_students_see_their_own_department_and_year(self):
+        self.student.role = "STUDENT"
+        self.student.save()
+        Student.objects.create(
+            user=self.student, enrollment_number="E1", department="CSE", year=2
+        )
+        other = User.objects.create_user(username="s2", password="123")
+        Student.objects.create(user=other, enrollment_number="E2", department="ECE", year=2)
+        StudentAnalytics.objects.create(student=other, risk_level="HIGH")
+
+        client = APIClient()
+        client.force_authenticate(self.student)
+
+        response = client.get("/api/analytics/risk-distribution/", {"department": "ECE"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {row["risk_level"]: row["count"] for row in response.data},
+            {"LOW": 1, "MEDIUM": 0, "HIGH": 0}
+        )
+
+        client.force_authenticate(
+            User.objects.create_user(username="s3", password="123", role="STUDENT")
+        )
+        response = client.get("/api/analytics/risk-distribution/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+# -----------------------------
+# COHORT ENGINE TESTS
+# -----------------------------
+
+class CohortEngineTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.faculty = User.objects.create_user(
+            username="faculty", password="faculty123", role="FACULTY"
+        )
+        self.client.force_authenticate(user=self.faculty)
+
+        for i, (department, year, marks, level) in enumerate([
+            ("CSE", 1, 80, "LOW"),
+            ("CSE", 1, 30, "HIGH"),
+            ("ECE", 2, 55, "MEDIUM"),
+        ]):
+            self.add_student(f"s{i}", department, year, marks, level)
+
+    def add_student(self, username, department, year, marks, level):
+        user = User.objects.create_user(username=username, password="123")
+        Student.objects.create(
+            user=user, enrollment_number=username, department=department, year=year
+        )
+        StudentAnalytics.objects.create(
+            student=user,
+            attendance_percentage=marks,
+            average_marks=marks,
+            risk_score=100 - marks,
+            risk_level=level
+        )
+
+    def test_frame_uses_categorical_columns(self):
+        frame = get_cohort_frame()
+
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame["department"].dtype.name, "category")
+        self.assertTrue(frame["risk_level"].cat.ordered)
+
+    def test_cached_frame_is_reused(self):
+        get_cohort_frame()
+        with self.assertNumQueries(0):
+            get_cohort_frame()
+
+    def test_frame_reloads_after_change(self):
+        get_cohort_frame()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_student("s9", "ECE", 2, 20, "HIGH")
+
+        self.assertEqual(len(get_cohort_frame()), 4)
+
+    def test_cohort_endpoint(self):
+        response = self.client.get(reverse("analytics-cohort"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["student_count"], 3)
+        self.assertEqual(response.data["risk_levels"]["HIGH"], 1)
+        self.assertEqual(len(response.data["breakdown"]), 3)
+        self.assertEqual(response.data["percentiles"]["average_marks"]["p50"], 55)
+        self.assertEqual(sum(response.data["histograms"]["counts"]["average_marks"]), 3)
+
+    def test_cohort_endpoint_filters_department(self):
+        response = self.client.get(reverse("analytics-cohort"), {"department": "CSE", "year": 1})
+
+        self.assertEqual(response.data["student_count"], 2)
+        self.assertEqual(
+            {row["risk_level"] for row in response.data["breakdown"]}, {"LOW", "HIGH"}
+        )
+
+    def test_attendance_vs_score_payload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(4, 12):
+                self.add_student(f"s{i}", "ECE", 2, 40 + i * 5, "LOW")
+            # full attendance but far below everyone else's marks
+            self.add_student("s3", "CSE", 1, 0, "HIGH")
+            StudentAnalytics.objects.filter(student__username="s3").update(
+                attendance_percentage=100
+            )
+
+        result = attendance_vs_score(bins=10, sample=5)
+
+        self.assertEqual(result["student_count"], 12)
+        self.assertEqual(len(result["x_edges"]), 11)
+        self.assertEqual(sum(result["cells"]["count"]), 12)
+        self.assertEqual(len(result["cells"]["x"]), len(result["cells"]["count"]))
+
+        outliers = result["outliers"]
+        self.assertIn(StudentAnalytics.objects.get(student__username="s3").student_id,
+                      outliers["student_id"])
+        self.assertLessEqual(len(outliers["student_id"]), 5)
+        self.assertEqual(len(outliers["risk_level"]["codes"]), len(outliers["score"]))
+
+    def test_attendance_vs_score_endpoint(self):
+        response = self.client.get("/api/analytics/attendance-vs-score/", {"dept": "CSE"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["student_count"], 2)
+        self.assertEqual(len(response.data["y_edges"]), 21)
+
+        response = self.client.get("/api/analytics/attendance-vs-score/", {"bins": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cohort_endpoint_requires_staff(self):
+        student = User.objects.get(username="s0")
+        self.client.force_authenticate(user=student)
+
+        response = self.client.get(reverse("analytics-cohort"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AtRiskRankingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        risk_ranking.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(username="faculty", password="123", role="FACULTY")
+        )
+
+        self.users = {}
+        for username, department, score in [
+            ("a", "CSE", 90), ("b", "CSE", 40), ("c", "ECE", 75),
+            ("d", "ECE", 20), ("e", "CSE", 60),
+        ]:
+            self.add_student(username, department, score)
+
+    def add_student(self, username, department, score):
+        user = self.users[username] = User.objects.create_user(username=username, password="123")
+        Student.objects.create(
+            user=user, enrollment_number=username, department=department, year=1
+        )
+        StudentAnalytics.objects.create(student=user, risk_score=score)
+
+    def ranked(self, department=None, ranking=risk_ranking):
+        entries, _ = ranking.page(department, 0, 10)
+        return [User.objects.get(pk=student_id).username for student_id, _ in entries]
+
+    def test_overall_and_department_rankings(self):
+        self.assertEqual(self.ranked(), ["a", "c", "e", "b", "d"])
+        self.assertEqual(self.ranked("CSE"), ["a", "e", "b"])
+        self.assertEqual(self.ranked("ECE"), ["c", "d"])
+
+    def test_score_change_is_applied_without_reloading(self):
+        self.ranked()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            analytics = StudentAnalytics.objects.get(student=self.users["d"])
+            analytics.risk_score = 95
+            analytics.save()
+
+        with self.assertNumQueries(0):
+            entries, count = risk_ranking.page(None, 0, 2)
+        self.assertEqual(entries, [(self.users["d"].pk, 95), (self.users["a"].pk, 90)])
+        self.assertEqual(count, 5)
+
+    def test_department_change_and_delete(self):
+        self.ranked("CSE")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = Student.objects.get(user=self.users["c"])
+            profile.department = "CSE"
+            profile.save()
+            StudentAnalytics.objects.filter(student=self.users["a"]).delete()
+
+        self.assertEqual(self.ranked("CSE"), ["c", "e", "b"])
+        self.assertEqual(self.ranked("ECE"), ["d"])
+
+    def test_partial_window_refills_from_database(self):
+        ranking = RiskRanking(size=2)
+        self.assertEqual(self.ranked(ranking=ranking), ["a", "c"])
+
+        # the window (a, c, e, b) never held d; once it shrinks below
+        # the ranking size it is reloaded and d moves up
+        for username in ("a", "c", "e"):
+            StudentAnalytics.objects.filter(student=self.users[username]).update(risk_score=0)
+            ranking.update(self.users[username].pk, 0, "")
+
+        self.assertEqual(self.ranked(ranking=ranking), ["b", "d"])
+
+    def test_scope_window_only_admits_students_above_its_tail(self):
+        scope = ScopeRanking([(1, 90), (2, 80)], capacity=2)
+        self.assertFalse(scope.complete)
+
+        scope.add(3, 10)
+        self.assertEqual(len(scope), 2)
+
+        scope.add(3, 85)
+        self.assertEqual(scope.page(0, 5, 5), [(1, 90), (3, 85)])
+
+    def test_at_risk_endpoint_pages(self):
+        url = reverse("analytics-at-risk")
+
+        response = self.client.get(url, {"department": "CSE", "page": 2, "page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertFalse(response.data["has_next"])
+        (row,) = response.data["results"]
+        self.assertEqual((row["rank"], row["username"], row["risk_score"]), (3, "b", 40))
+        self.assertEqual(row["department"], "CSE")
+
+        response = self.client.get(url, {"page_size": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# -----------------------------
+# EVENT-SOURCED KPI TESTS
+# -----------------------------
+
+class PerformanceEventTests(TestCase):
+
+    def setUp(self):
+        self.student = User.objects.create_user(username="s1", password="123")
+
+    def record(self, kind, *values):
+        for value in values:
+            _, analytics = record_event(self.student.id, kind, value)
+        return analytics
+
+    def test_events_update_running_counters(self):
+        self.record("ATTENDANCE", 1, 1, 0, 1)
+        self.record("MARK", 80, 60)
+        analytics = self.record("ASSIGNMENT", 1, 0)
+
+        counter = StudentKPICounter.objects.get(student=self.student)
+        self.assertEqual((counter.classes_attended, counter.classes_total), (3, 4))
+        self.assertEqual((counter.marks_sum, counter.marks_count), (140, 2))
+
+        self.assertEqual(analytics.attendance_percentage, 75)
+        self.assertEqual(analytics.average_marks, 70)
+        self.assertEqual(analytics.assignment_completion_rate, 50)
+
+    def test_event_cost_does_not_grow_with_history(self):
+        self.record("MARK", *range(50, 100))
+
+        with self.assertNumQueries(6):
+            # savepoint, insert event, update counter, read counter,
+            # read analytics, release (an unchanged average skips the rescore)
+            record_event(self.student.id, "MARK", 74.5)
+
+    def test_invalid_event_is_rejected(self):
+        with self.assertRaises(ValueError):
+            record_event(self.student.id, "ATTENDANCE", 3)
+
+    def test_rebuild_matches_incremental_counters(self):
+        self.record("ATTENDANCE", 1, 0, 0)
+        analytics = self.record("MARK", 45, 90, 12)
+
+        StudentKPICounter.objects.all().delete()
+        self.assertEqual(rebuild_kpi_counters(), 1)
+
+        counter = StudentKPICounter.objects.get(student=self.student)
+        self.assertEqual((counter.classes_attended, counter.classes_total), (1, 3))
+        self.assertEqual(counter.marks_count, 3)
+
+        rebuilt = StudentAnalytics.objects.get(student=self.student)
+        self.assertEqual(rebuilt.average_marks, analytics.average_marks)
+        self.assertEqual(rebuilt.risk_score, analytics.risk_score)
+        self.assertEqual(rebuilt.risk_level, analytics.risk_level)
+
+    def test_kinds_without_events_keep_imported_kpis(self):
+        Student.objects.create(
+            user=self.student, enrollment_number="E1", department="CSE", year=1
+        )
+        StudentAnalytics.objects.create(
+            student=self.student,
+            attendance_percentage=90,
+            average_marks=85,
+            assignment_completion_rate=95,
+            risk_level="LOW",
+        )
+
+        analytics = self.record("ATTENDANCE", 1)
+
+        self.assertEqual(analytics.attendance_percentage, 100)
+        self.assertEqual(analytics.average_marks, 85)
+        self.assertEqual(analytics.assignment_completion_rate, 95)
+        self.assertEqual(analytics.risk_level, "LOW")
+        self.assertFalse(Alert.objects.exists())
+
+        rebuild_kpi_counters()
+        rebuilt = StudentAnalytics.objects.get(student=self.student)
+        self.assertEqual(
+            (rebuilt.attendance_percentage, rebuilt.average_marks, rebuilt.assignment_completion_rate),
+            (100, 85, 95)
+        )
+        self.assertEqual(rebuilt.risk_level, "LOW")
+
+    def test_events_endpoint_accepts_batches(self):
+        faculty = User.objects.create_user(username="f1", password="123", role="FACULTY")
+        client = APIClient()
+        client.force_authenticate(user=faculty)
+
+        response = client.post(
+            reverse("analytics-events"),
+            [
+                {"student": self.student.id, "kind": "ATTENDANCE", "value": 1},
+                {"student": self.student.id, "kind": "MARK", "value": 88},
+            ],
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["recorded"], 2)
+        self.assertEqual(response.data["analytics"][0]["average_marks"], 88)
+
+    def test_events_endpoint_saves_alerts_in_one_batch(self):
+        faculty = User.objects.create_user(username="f1", password="123", role="FACULTY")
+        other = User.objects.create_user(username="s2", password="123")
+        for i, user in enumerate((self.student, other)):
+            Student.objects.create(
+                user=user, enrollment_number=f"E{i}", department="CSE", year=1
+            )
+        client = APIClient()
+        client.force_authenticate(user=faculty)
+
+        with mock.patch("apps.alerts.services.save_alerts", wraps=save_alerts) as saved:
+            response = client.post(
+                reverse("analytics-events"),
+                [
+                    {"student": self.student.id, "kind": "MARK", "value": 10},
+                    {"student": other.id, "kind": "MARK", "value": 10},
+                ],
+                format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        saved.assert_called_once()
+        self.assertEqual(Alert.objects.count(), 2)
+
+
+# -----------------------------
+# TREND ROLLUPS
+# -----------------------------
+class MetricRollupTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.faculty = User.objects.create(username="faculty", role="FACULTY")
+        self.client.force_authenticate(user=self.faculty)
+
+        self.analytics = []
+        for i, (department, attendance) in enumerate([("CSE", 80), ("CSE", 60), ("ECE", 90)]):
+            user = User.objects.create(username=f"s{i}")
+            Student.objects.create(
+                user=user, enrollment_number=f"E{i}", department=department, year=1
+            )
+            self.analytics.append(StudentAnalytics.objects.create(
+                student=user,
+                attendance_percentage=attendance,
+                average_marks=50 + i * 10,
+                risk_level="LOW"
+            ))
+
+    def test_snapshot_builds_day_week_and_month_rows(self):
+        self.assertEqual(record_metrics_snapshot(date(2025, 1, 15)), 2)
+
+        self.assertEqual(
+            sorted(MetricRollup.objects.values_list("period", flat=True).distinct()),
+            ["DAY", "MONTH", "WEEK"]
+        )
+        week = MetricRollup.objects.get(period="WEEK", department="CSE")
+        self.assertEqual(week.period_start, date(2025, 1, 13))
+        self.assertEqual((week.student_count, week.attendance_sum), (2, 140))
+
+    def test_resnapshot_replaces_the_day(self):
+        record_metrics_snapshot(date(2025, 1, 15))
+        record_metrics_snapshot(date(2025, 1, 15))
+
+        month = MetricRollup.objects.get(period="MONTH", department="CSE")
+        self.assertEqual((month.samples, month.student_count), (1, 2))
+
+    def test_monthly_trend_averages_daily_snapshots(self):
+        record_metrics_snapshot(date(2025, 1, 10))
+        self.analytics[1].attendance_percentage = 100
+        self.analytics[1].save()
+        record_metrics_snapshot(date(2025, 1, 20))
+        record_metrics_snapshot(date(2025, 2, 1))
+
+        trend = metric_trend("attendance", period="MONTH", department="CSE")
+
+        self.assertEqual([point["label"] for point in trend], ["Jan 2025", "Feb 2025"])
+        # January: (80 + 60 + 80 + 100) / 4 student-days
+        self.assertEqual(trend[0]["value"], 80.0)
+        self.assertEqual(trend[0]["students"], 2)
+        self.assertEqual(trend[1]["value"], 90.0)
+
+    def test_trend_students_count_each_bucket_over_its_own_days(self):
+        ece = self.analytics[2]
+        ece.delete()
+        record_metrics_snapshot(date(2025, 1, 10))
+        StudentAnalytics.objects.create(
+            student_id=ece.student_id, attendance_percentage=90, risk_level="LOW"
+        )
+        record_metrics_snapshot(date(2025, 1, 20))
+
+        trend = metric_trend("attendance", period="MONTH")
+
+        # CSE: 4 student-days over 2 snapshots, ECE: 1 over 1
+        self.assertEqual(trend[0]["students"], 3)
+        self.assertEqual(trend[0]["value"], 74.0)
+
+    def test_trend_endpoints(self):
+        record_metrics_snapshot(date(2025, 1, 15))
+
+        response = self.client.get("/api/analytics/attendance-trend/", {"period": "day"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{
+            "label": "2025-01-15",
+            "period_start": "2025-01-15",
+            "value": 76.67,
+            "students": 3,
+        }])
+
+        response = self.client.get("/api/analytics/performance-trend/", {"dept": "ECE"})
+        self.assertEqual(response.data[0]["value"], 70.0)
+
+        response = self.client.get("/api/analytics/performance-trend/", {"period": "hour"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,14 @@
 from django.urls import path
-from .views import DashboardAPIView
+from .views import (
+    AtRiskRankingAPIView,
+    AttendanceTrendAPIView,
+    AttendanceVsScoreAPIView,
+    CohortAnalyticsAPIView,
+    DashboardAPIView,
+    PerformanceEventAPIView,
+    PerformanceTrendAPIView,
+    RiskDistributionAPIView
+)
 
 urlpatterns = [
     path(
@@ -7,4 +16,39 @@ urlpatterns = [
         DashboardAPIView.as_view(),
         name="analytics-dashboard"
     ),
+    path(
+        "risk-distribution/",
+        RiskDistributionAPIView.as_view(),
+        name="analytics-risk-distribution"
+    ),
+    path(
+        "at-risk/",
+        AtRiskRankingAPIView.as_view(),
+        name="analytics-at-risk"
+    ),
+    path(
+        "cohort/",
+        CohortAnalyticsAPIView.as_view(),
+        name="analytics-cohort"
+    ),
+    path(
+        "events/",
+        PerformanceEventAPIView.as_view(),
+        name="analytics-events"
+    ),
+    path(
+        "attendance-trend/",
+        AttendanceTrendAPIView.as_view(),
+        name="analytics-attendance-trend"
+    ),
+    path(
+        "performance-trend/",
+        PerformanceTrendAPIView.as_view(),
+        name="analytics-performance-trend"
+    ),
+    path(
+        "attendance-vs-score/",
+        AttendanceVsScoreAPIView.as_view(),
+        name="analytics-attendance-vs-score"
+    ),
 ]
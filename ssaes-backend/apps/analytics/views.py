@@ -1,39 +1,282 @@
-from django.db.models import Avg
+from datetime import date
+
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
-from .models import StudentAnalytics
-from .serializers import DashboardSerializer
+from apps.accounts.permissions import IsAdmin, IsFaculty, IsStudent
+from apps.accounts.tokens import student_profile_id
+from apps.alerts.services import defer_alerts
+from apps.students.models import Student
+from .engine import (
+    HISTOGRAM_BINS,
+    SCATTER_BINS,
+    SCATTER_SAMPLE,
+    attendance_vs_score,
+    generate_cohort_report
+)
+from .events import record_event
+from .ranking import RANKING_SIZE, get_at_risk_page
+from .rollups import metric_trend
+from .serializers import (
+    DashboardSerializer,
+    PerformanceEventSerializer,
+    StudentAnalyticsSerializer
+)
+from .snapshot import get_dashboard_kpis, get_risk_distribution
 
 
 class DashboardAPIView(APIView):
     """
-    Faculty/Admin Dashboard KPI API
+    Faculty/Admin Dashboard KPI API.
+    Served from the incrementally maintained KPISnapshot table.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        total_students = StudentAnalytics.objects.count()
+        data = get_dashboard_kpis()
+
+        serializer = DashboardSerializer(data)
+        return Response(serializer.data)
 
-        at_risk_students = StudentAnalytics.objects.filter(
-            risk_level="HIGH"
-        ).count()
 
-        average_marks = StudentAnalytics.objects.aggregate(
-            avg=Avg("average_marks")
-        )["avg"] or 0
+class RiskDistributionAPIView(APIView):
+    """
+    LOW / MEDIUM / HIGH counts read from the KPISnapshot counters.
 
-        average_attendance = StudentAnalytics.objects.aggregate(
-            avg=Avg("attendance_percentage")
-        )["avg"] or 0
+    Query params: department, year, breakdown (department, year or
+    department,year). Students only see their own department and year;
+    the params are ignored for them.
+    """
+    permission_classes = [IsAdmin | IsFaculty | IsStudent]
 
-        data = {
-            "total_students": total_students,
-            "at_risk_students": at_risk_students,
-            "average_marks": average_marks,
-            "average_attendance": average_attendance,
-        }
+    BREAKDOWN_FIELDS = ("department", "year")
 
-        serializer = DashboardSerializer(data)
-        return Response(serializer.data)
+    def get(self, request):
+        params = request.query_params
+
+        if request.user.role == "STUDENT":
+            scope = Student.objects.filter(
+                pk=student_profile_id(request)
+            ).values_list("department", "year").first()
+            if scope is None:
+                return Response(
+                    {"error": "No student profile found."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            department, year = scope
+            return Response(get_risk_distribution(department=department, year=year))
+
+        try:
+            year = int(params["year"]) if params.get("year") else None
+            breakdown = tuple(
+                field for field in params.get("breakdown", "").split(",") if field
+            )
+            unknown = set(breakdown) - set(self.BREAKDOWN_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown breakdown field(s): {', '.join(sorted(unknown))}")
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            get_risk_distribution(
+                department=params.get("department") or params.get("dept") or None,
+                year=year,
+                breakdown=breakdown
+            )
+        )
+
+
+class AtRiskRankingAPIView(APIView):
+    """
+    Students ranked by risk score (highest first), overall or within a
+    department, served page by page from the maintained top-K ranking.
+
+    Query params: department, page (default 1), page_size (<= 100)
+    """
+    permission_classes = [IsAdmin | IsFaculty]
+
+    MAX_PAGE_SIZE = 100
+
+    def get(self, request):
+        params = request.query_params
+
+        try:
+            page = int(params.get("page", 1))
+            page_size = int(params.get("page_size", 25))
+            if page < 1:
+                raise ValueError("page must be at least 1")
+            if not 1 <= page_size <= self.MAX_PAGE_SIZE:
+                raise ValueError(f"page_size must be between 1 and {self.MAX_PAGE_SIZE}")
+            if (page - 1) * page_size >= RANKING_SIZE:
+                raise ValueError(f"Only the top {RANKING_SIZE} students are ranked")
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            get_at_risk_page(
+                department=params.get("department") or params.get("dept") or None,
+                page=page,
+                page_size=page_size
+            )
+        )
+
+
+class CohortAnalyticsAPIView(APIView):
+    """
+    Cohort breakdowns, percentiles, histograms and correlations
+    computed from the cached columnar frame.
+
+    Query params: department, year, bins
+    """
+    permission_classes = [IsAdmin | IsFaculty]
+
+    def get(self, request):
+        params = request.query_params
+
+        try:
+            year = int(params["year"]) if params.get("year") else None
+            bins = int(params.get("bins", HISTOGRAM_BINS))
+            if not 1 <= bins <= 100:
+                raise ValueError("bins must be between 1 and 100")
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            generate_cohort_report(
+                department=params.get("department") or None,
+                year=year,
+                bins=bins
+            )
+        )
+
+
+class AttendanceVsScoreAPIView(APIView):
+    """
+    Attendance vs average marks as a 2-D density grid plus a stratified
+    sample of outlier students, in columnar form. The payload is bounded
+    by bins and sample regardless of cohort size.
+
+    Query params: department, year, bins (<= 100), sample (<= 1000)
+    """
+    permission_classes = [IsAdmin | IsFaculty]
+
+    def get(self, request):
+        params = request.query_params
+
+        try:
+            year = int(params["year"]) if params.get("year") else None
+            bins = int(params.get("bins", SCATTER_BINS))
+            sample = int(params.get("sample", SCATTER_SAMPLE))
+            if not 1 <= bins <= 100:
+                raise ValueError("bins must be between 1 and 100")
+            if not 0 <= sample <= 1000:
+                raise ValueError("sample must be between 0 and 1000")
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            attendance_vs_score(
+                department=params.get("department") or params.get("dept") or None,
+                year=year,
+                bins=bins,
+                sample=sample
+            )
+        )
+
+
+class PerformanceEventAPIView(APIView):
+    """
+    Records raw performance events (a single object or a list).
+    Each event updates the student's running counters in O(1);
+    the response holds the resulting analytics per student.
+    A batch is recorded in one transaction and its alerts are saved
+    with one insert.
+    """
+    permission_classes = [IsAdmin | IsFaculty]
+
+    def post(self, request):
+        serializer = PerformanceEventSerializer(
+            data=request.data,
+            many=isinstance(request.data, list)
+        )
+        serializer.is_valid(raise_exception=True)
+
+        events = serializer.validated_data
+        if not isinstance(events, list):
+            events = [events]
+
+        latest = {}
+        with transaction.atomic(), defer_alerts():
+            for event in events:
+                _, analytics = record_event(event["student"].id, event["kind"], event["value"])
+                latest[analytics.student_id] = analytics
+
+        return Response(
+            {
+                "recorded": len(events),
+                "analytics": StudentAnalyticsSerializer(
+                    list(latest.values()), many=True
+                ).data,
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+
+class MetricTrendAPIView(APIView):
+    """
+    Mean of one metric per day / week / month, served from MetricRollup.
+
+    Query params: period (day|week|month, default month), department,
+    year, start, end (YYYY-MM-DD), points (latest N periods)
+    """
+    permission_classes = [IsAdmin | IsFaculty]
+    metric = None
+
+    def get(self, request):
+        params = request.query_params
+
+        try:
+            year = int(params["year"]) if params.get("year") else None
+            points = int(params["points"]) if params.get("points") else None
+            start = date.fromisoformat(params["start"]) if params.get("start") else None
+            end = date.fromisoformat(params["end"]) if params.get("end") else None
+
+            trend = metric_trend(
+                self.metric,
+                period=params.get("period", "month").upper(),
+                department=params.get("department") or params.get("dept") or None,
+                year=year,
+                start=start,
+                end=end,
+                points=points
+            )
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(trend)
+
+
+class AttendanceTrendAPIView(MetricTrendAPIView):
+    metric = "attendance"
+
+
+class PerformanceTrendAPIView(MetricTrendAPIView):
+    metric = "marks"
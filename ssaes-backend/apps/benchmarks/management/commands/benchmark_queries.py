@@ -0,0 +1,211 @@
+"""
+benchmark_queries
+
+Seeds synthetic data (1M rows per fact table by default) and records the
+query plan and latency of the hot filter paths with and without the
+Meta.indexes added for them.
+
+The "before" run drops the indexes inside a transaction that is rolled
+back afterwards, so the schema is left untouched. Run it against a
+dedicated benchmark database: dropping an index takes a table lock.
+
+    python manage.py benchmark_queries --output before-after.json
+    python manage.py benchmark_queries --skip-seed --repeat 50
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.alerts.models import Alert
+from apps.analytics.models import StudentAnalytics
+from apps.history.models import History
+from apps.predictions.models import StudentPrediction
+from apps.students.models import Student
+from apps.benchmarks.timing import measure
+from apps.benchmarks.synthetic import (
+    BENCH_PREFIX,
+    clear_synthetic_data,
+    seed_synthetic_data,
+    synthetic_row_counts,
+)
+
+INDEXED_MODELS = (StudentAnalytics, StudentPrediction, Alert, History, Student)
+
+
+# -----------------------------
+# HOT QUERIES
+# -----------------------------
+
+def hot_queries(sample):
+    """
+    Returns (name, queryset) pairs mirroring the API's filter paths.
+    `sample` holds ids of one synthetic user / profile to filter on.
+    """
+    user_id = sample["user_id"]
+    profile_id = sample["profile_id"]
+
+    return [
+        (
+            "dashboard_at_risk_count",
+            StudentAnalytics.objects.filter(risk_level="HIGH").values("id"),
+        ),
+        (
+            "top_at_risk",
+            StudentAnalytics.objects.filter(risk_level="HIGH").order_by("-risk_score")[:50],
+        ),
+        (
+            "student_prediction_history",
+            StudentPrediction.objects.filter(student_id=user_id).order_by("-created_at")[:50],
+        ),
+        (
+            "prediction_feed_page",
+            StudentPrediction.objects.order_by("-created_at", "-id")[:50],
+        ),
+        (
+            "student_open_alerts",
+            Alert.objects.filter(student_id=profile_id, resolved=False).order_by("-created_at"),
+        ),
+        (
+            "open_alert_dedupe",
+            Alert.objects.filter(student_id=profile_id, level="HIGH", resolved=False).values("id"),
+        ),
+        (
+            "user_history_page",
+            History.objects.filter(user_id=user_id).order_by("-timestamp")[:50],
+        ),
+        (
+            "history_feed_page",
+            History.objects.order_by("-timestamp", "-id")[:50],
+        ),
+        (
+            "student_filter_dept_year_marks",
+            Student.objects.filter(department="CSE", year=2, marks__gte=60, marks__lte=80),
+        ),
+        (
+            "student_filter_low_attendance",
+            Student.objects.filter(attendance__lte=40),
+        ),
+    ]
+
+
+def run_queries(sample, repeat):
+    results = {}
+    for name, queryset in hot_queries(sample):
+        results[name] = {
+            "plan": queryset.explain(),
+            # warmup run so both passes start with a warm cache
+            **measure(lambda: list(queryset.all()), repeat),
+        }
+    return results
+
+
+def run_without_indexes(sample, repeat):
+    """
+    Drops every benchmarked Meta index, runs the queries and rolls the
+    DDL back again
+    """
+    with connection.schema_editor(collect_sql=True) as editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for statement in editor.collected_sql:
+                cursor.execute(statement)
+        results = run_queries(sample, repeat)
+        transaction.set_rollback(True)
+
+    return results
+
+
+# -----------------------------
+# COMMAND
+# -----------------------------
+
+class Command(BaseCommand):
+    help = "Seed synthetic data and compare hot query plans/latency with and without indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=100_000)
+        parser.add_argument(
+            "--rows", type=int, default=1_000_000,
+            help="Rows per fact table (predictions, history, alerts)"
+        )
+        parser.add_argument("--batch", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--label", default="")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument(
+            "--skip-seed", action="store_true",
+            help="Reuse synthetic data from a previous run"
+        )
+        parser.add_argument(
+            "--clear", action="store_true",
+            help="Delete the synthetic data after benchmarking"
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        if not connection.features.can_rollback_ddl:
+            raise CommandError(
+                f"{connection.vendor} cannot roll back DDL; the before/after run needs it"
+            )
+
+        if not options["skip_seed"]:
+            clear_synthetic_data()
+            seed_synthetic_data(
+                students=options["students"],
+                rows=options["rows"],
+                batch_size=options["batch"],
+                seed=options["seed"],
+                log=self.stdout.write,
+            )
+
+        sample = self.get_sample()
+
+        self.stdout.write("Running queries with indexes")
+        after = run_queries(sample, options["repeat"])
+
+        self.stdout.write("Running queries without indexes")
+        before = run_without_indexes(sample, options["repeat"])
+
+        report = {
+            "label": options["label"],
+            "vendor": connection.vendor,
+            "repeat": options["repeat"],
+            "rows": synthetic_row_counts(),
+            "queries": {
+                name: {"before": before[name], "after": after[name]}
+                for name in after
+            },
+        }
+
+        for name, result in report["queries"].items():
+            self.stdout.write(
+                f"{name:34} {result['before']['median_ms']:10.3f} ms"
+                f" -> {result['after']['median_ms']:10.3f} ms"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options["clear"]:
+            clear_synthetic_data()
+
+    def get_sample(self):
+        profile = (
+            Student.objects.filter(user__username__startswith=BENCH_PREFIX)
+            .order_by("id")
+            .values_list("id", "user_id")
+            .first()
+        )
+        if profile is None:
+            raise CommandError("No synthetic data found; run without --skip-seed first")
+        return {"profile_id": profile[0], "user_id": profile[1]}
@@ -0,0 +1,120 @@
+"""
+run_benchmarks
+
+Runs the hot-path benchmark suite (see apps/benchmarks/suite.py) and
+records the results as JSON so runs from different commits can be
+compared.
+
+    python manage.py run_benchmarks --output bench/$(git rev-parse --short HEAD).json
+    python manage.py run_benchmarks --quick --compare bench/main.json --fail-on-regression
+    python manage.py run_benchmarks --only predictions --only dashboard
+"""
+
+import json
+import platform
+import subprocess
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.benchmarks.suite import BENCHMARKS, BenchmarkConfig, compare_results, run_suite
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def int_list(value):
+    return [int(size) for size in value.split(",") if size]
+
+
+class Command(BaseCommand):
+    help = "Benchmark prediction, analytics, dashboard, recommendation and ingestion paths"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only", action="append", choices=list(BENCHMARKS),
+            help="Run only this benchmark group (repeatable)"
+        )
+        parser.add_argument("--quick", action="store_true", help="Small sizes for smoke runs")
+        parser.add_argument("--repeat", type=int)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--predict-rows", type=int)
+        parser.add_argument("--batch-sizes", type=int_list, help="e.g. 1000,10000,100000")
+        parser.add_argument("--analytics-students", type=int)
+        parser.add_argument("--dashboard-sizes", type=int_list, help="e.g. 10000,100000,1000000")
+        parser.add_argument("--recommendation-students", type=int)
+        parser.add_argument("--ingest-rows", type=int)
+        parser.add_argument("--label", default="")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Slowdown ratio counted as a regression (0.2 = 20%%)")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        overrides = {
+            key: options[key]
+            for key in (
+                "repeat", "predict_rows", "batch_sizes", "analytics_students",
+                "dashboard_sizes", "recommendation_students", "ingest_rows",
+            )
+            if options[key] is not None
+        }
+        overrides.update(seed=options["seed"], log=self.stdout.write)
+
+        config = BenchmarkConfig.quick(**overrides) if options["quick"] else BenchmarkConfig(**overrides)
+        if config.repeat < 1:
+            raise CommandError("--repeat must be at least 1")
+
+        results = run_suite(config, only=options["only"])
+
+        report = {
+            "label": options["label"],
+            "commit": current_commit(),
+            "timestamp": timezone.now().isoformat(),
+            "vendor": connection.vendor,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "repeat": config.repeat,
+            "results": results,
+        }
+
+        for name, result in results.items():
+            throughput = result.get("rows_per_sec")
+            self.stdout.write(
+                f"{name:48} {result['median_ms']:12.3f} ms"
+                + (f" {throughput:14,.0f} rows/s" if throughput else "")
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options["compare"]:
+            self.compare(options, results)
+
+    def compare(self, options, results):
+        with open(options["compare"]) as f:
+            baseline = json.load(f)
+
+        rows = compare_results(baseline.get("results", {}), results, options["threshold"])
+        regressions = [row for row in rows if row[4]]
+
+        self.stdout.write(f"\nCompared with {baseline.get('commit') or options['compare']}:")
+        for name, before, after, ratio, regressed in rows:
+            line = f"{name:48} {before:12.3f} -> {after:12.3f} ms  x{ratio:.2f}"
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} benchmark(s) regressed")
@@ -0,0 +1,303 @@
+"""
+benchmarks/suite.py
+
+Benchmarks for the prediction, analytics, dashboard, recommendation and
+ingestion hot paths.
+
+Every benchmark takes a BenchmarkConfig and returns {name: timing}. All
+database writes happen inside transactions that are rolled back, so a
+run leaves the database as it found it.
+"""
+
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.analytics.services import generate_cohort_analytics, generate_student_analytics
+from apps.analytics.snapshot import rebuild_kpi_snapshot
+from apps.analytics.views import DashboardAPIView
+from apps.predictions.ml.predictor import (
+    predict_batch,
+    predict_student_outcome,
+    prediction_cache
+)
+from apps.recommendations.engine import generate_recommendations_for_all_students
+from apps.uploads.ingestion import ingest_upload
+from apps.uploads.models import Upload
+from .synthetic import (
+    BENCH_PREFIX,
+    seed_goals,
+    seed_students,
+    synthetic_feature_rows,
+    synthetic_roster_csv,
+)
+from .timing import measure, with_throughput
+
+User = get_user_model()
+
+
+@dataclass
+class BenchmarkConfig:
+    repeat: int = 5
+    seed: int = 0
+    predict_rows: int = 1000
+    batch_sizes: list = field(default_factory=lambda: [1000, 10_000, 100_000])
+    analytics_students: int = 10_000
+    dashboard_sizes: list = field(default_factory=lambda: [10_000, 100_000, 1_000_000])
+    recommendation_students: int = 2000
+    ingest_rows: int = 10_000
+    batch_size: int = 5000
+    log: object = None
+
+    @classmethod
+    def quick(cls, **overrides):
+        """
+        Small sizes for smoke runs and CI
+        """
+        return cls(**{
+            "repeat": 3,
+            "predict_rows": 200,
+            "batch_sizes": [1000],
+            "analytics_students": 1000,
+            "dashboard_sizes": [1000],
+            "recommendation_students": 200,
+            "ingest_rows": 500,
+            **overrides,
+        })
+
+    def rng(self):
+        return np.random.default_rng(self.seed)
+
+    def say(self, message):
+        if self.log:
+            self.log(message)
+
+
+# -----------------------------
+# HELPERS
+# -----------------------------
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """
+    Runs the block in a transaction that is always rolled back
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def run_rolled_back(fn):
+    with rolled_back():
+        fn()
+
+
+@contextmanager
+def prediction_cache_disabled():
+    previous = (
+        prediction_cache.maxsize,
+        prediction_cache.shared_alias,
+    )
+    prediction_cache.configure(maxsize=0, shared_alias=None)
+    try:
+        yield
+    finally:
+        prediction_cache.configure(maxsize=previous[0], shared_alias=previous[1])
+
+
+# -----------------------------
+# BENCHMARKS
+# -----------------------------
+
+def bench_predictions(config: BenchmarkConfig) -> dict:
+    rows = synthetic_feature_rows(config.predict_rows, config.rng())
+
+    def predict_each():
+        for row in rows:
+            predict_student_outcome(row)
+
+    results = {}
+
+    with prediction_cache_disabled():
+        results["predict_single"] = with_throughput(
+            measure(predict_each, config.repeat), len(rows)
+        )
+
+    prediction_cache.clear()
+    # after the warmup pass every row is served from the local tier
+    results["predict_single_cached"] = with_throughput(
+        measure(predict_each, config.repeat), len(rows)
+    )
+
+    for size in config.batch_sizes:
+        batch = synthetic_feature_rows(size, config.rng())
+        results[f"predict_batch[{size}]"] = with_throughput(
+            measure(lambda: predict_batch(batch), config.repeat), size
+        )
+
+    return results
+
+
+def bench_student_analytics(config: BenchmarkConfig) -> dict:
+    n = config.analytics_students
+    rng = config.rng()
+
+    total_classes = rng.integers(20, 60, n)
+    attended = (total_classes * rng.uniform(0.3, 1.0, n)).astype(int)
+    total_assignments = rng.integers(5, 15, n)
+    completed = (total_assignments * rng.uniform(0.2, 1.0, n)).astype(int)
+    marks = rng.uniform(20, 100, (n, 6)).round(1)
+
+    payloads = [
+        {
+            "attended_classes": int(attended[i]),
+            "total_classes": int(total_classes[i]),
+            "marks_list": marks[i].tolist(),
+            "assignments_completed": int(completed[i]),
+            "total_assignments": int(total_assignments[i]),
+        }
+        for i in range(n)
+    ]
+
+    def per_student():
+        for payload in payloads:
+            generate_student_analytics(payload)
+
+    def vectorized():
+        generate_cohort_analytics(
+            np.round(attended / total_classes * 100, 2),
+            marks.mean(axis=1),
+            np.round(completed / total_assignments * 100, 2),
+        )
+
+    return {
+        "generate_student_analytics": with_throughput(measure(per_student, config.repeat), n),
+        "generate_cohort_analytics": with_throughput(measure(vectorized, config.repeat), n),
+    }
+
+
+def bench_dashboard(config: BenchmarkConfig) -> dict:
+    """
+    Dashboard API and snapshot rebuild at growing cohort sizes.
+    Students are seeded incrementally inside one rolled-back transaction.
+    """
+    results = {}
+    factory = APIRequestFactory()
+    view = DashboardAPIView.as_view()
+    rng = config.rng()
+
+    with rolled_back():
+        viewer = User.objects.create(username=f"{BENCH_PREFIX}dashboard", role="ADMIN")
+
+        def get_dashboard():
+            request = factory.get("/api/analytics/dashboard/")
+            force_authenticate(request, user=viewer)
+            response = view(request)
+            assert response.status_code == 200, response.data
+
+        seeded = 0
+        for size in sorted(config.dashboard_sizes):
+            config.say(f"Dashboard: seeding up to {size} students")
+            seed_students(size - seeded, config.batch_size, rng, start=seeded)
+            seeded = size
+
+            results[f"kpi_snapshot_rebuild[{size}]"] = with_throughput(
+                measure(rebuild_kpi_snapshot, min(config.repeat, 3), warmup=0), size
+            )
+            results[f"dashboard_api[{size}]"] = measure(get_dashboard, config.repeat)
+
+    return results
+
+
+def bench_recommendations(config: BenchmarkConfig) -> dict:
+    n = config.recommendation_students
+
+    with rolled_back():
+        _, profile_ids = seed_students(n, config.batch_size, config.rng())
+        goals = seed_goals(profile_ids, batch_size=config.batch_size, rng=config.rng())
+
+        timing = measure(
+            lambda: run_rolled_back(generate_recommendations_for_all_students),
+            config.repeat,
+            warmup=0
+        )
+
+    return {"generate_recommendations_for_all_students": {**timing, "goals": goals}}
+
+
+def bench_ingestion(config: BenchmarkConfig) -> dict:
+    n = config.ingest_rows
+    payload = synthetic_roster_csv(n, config.rng())
+
+    with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+        with rolled_back():
+            uploader = User.objects.create(username=f"{BENCH_PREFIX}uploader", role="ADMIN")
+
+            def ingest():
+                upload = Upload(uploaded_by=uploader)
+                upload.file.save("roster.csv", ContentFile(payload), save=True)
+                upload = ingest_upload(upload)
+                assert upload.rows_imported == n, upload.errors[:5]
+
+            timing = measure(lambda: run_rolled_back(ingest), config.repeat, warmup=0)
+
+    return {f"upload_ingestion[{n}]": with_throughput(timing, n)}
+
+
+BENCHMARKS = {
+    "predictions": bench_predictions,
+    "analytics": bench_student_analytics,
+    "dashboard": bench_dashboard,
+    "recommendations": bench_recommendations,
+    "ingestion": bench_ingestion,
+}
+
+
+def run_suite(config: BenchmarkConfig, only=None) -> dict:
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        config.say(f"Running {name}")
+        results.update(benchmark(config))
+    return results
+
+
+# -----------------------------
+# COMPARISON
+# -----------------------------
+
+def compare_results(baseline: dict, current: dict, threshold=0.2) -> list:
+    """
+    Returns (name, baseline ms, current ms, ratio, regressed) rows for
+    every benchmark present in both result sets
+    """
+    rows = []
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("median_ms"):
+            continue
+
+        ratio = result["median_ms"] / previous["median_ms"]
+        rows.append((
+            name,
+            previous["median_ms"],
+            result["median_ms"],
+            round(ratio, 3),
+            ratio > 1 + threshold,
+        ))
+    return rows
@@ -0,0 +1,305 @@
+"""
+benchmarks/synthetic.py
+
+Synthetic data generators for the benchmark commands.
+
+Rows are generated with numpy and written with bulk_create in fixed-size
+batches, so seeding a million rows needs neither signals nor per-row
+queries. Every generated user is prefixed with BENCH_PREFIX so the data
+can be removed again with clear_synthetic_data().
+"""
+
+import csv
+import io
+from itertools import islice
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+
+from apps.alerts.models import Alert
+from apps.analytics.models import StudentAnalytics
+from apps.analytics.services import generate_cohort_analytics
+from apps.analytics.snapshot import rebuild_kpi_snapshot
+from apps.goals.models import Goal
+from apps.history.models import History
+from apps.predictions.models import StudentPrediction
+from apps.students.models import Student
+from apps.uploads.ingestion import REQUIRED_COLUMNS
+
+User = get_user_model()
+
+BENCH_PREFIX = "bench-"
+
+DEPARTMENTS = ("CSE", "ECE", "MECH", "CIVIL", "EEE", "IT")
+YEARS = (1, 2, 3, 4)
+ALERT_LEVELS = ("LOW", "MEDIUM", "HIGH")
+HISTORY_ACTIONS = ("CREATE", "UPDATE", "PREDICT", "LOGIN", "LOGOUT")
+GOAL_STATUSES = ("PENDING", "IN_PROGRESS", "COMPLETED")
+
+
+# -----------------------------
+# HELPERS
+# -----------------------------
+
+def _bulk_insert(model, objects, batch_size):
+    iterator = iter(objects)
+    created = 0
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return created
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+
+
+def _features(rng, n):
+    """
+    Returns (attendance, marks, assignments) columns in 0–100, skewed
+    so roughly a fifth of the cohort lands in the HIGH risk band
+    """
+    attendance = np.clip(rng.normal(75, 18, n), 0, 100).round(1)
+    marks = np.clip(rng.normal(65, 20, n), 0, 100).round(1)
+    assignments = np.clip(rng.normal(70, 20, n), 0, 100).round(1)
+    return attendance, marks, assignments
+
+
+# -----------------------------
+# SEEDING
+# -----------------------------
+
+def seed_students(students, batch_size=5000, rng=None, start=0, log=None) -> tuple:
+    """
+    Seeds `students` users (numbered from `start`) with Student profiles
+    and StudentAnalytics. Returns (user_ids, profile_ids) of the new rows
+    as aligned numpy arrays.
+    """
+    log = log or (lambda message: None)
+    rng = rng if rng is not None else np.random.default_rng(0)
+    password = make_password(None)
+    last_id = User.objects.aggregate(last=Max("id"))["last"] or 0
+
+    log(f"Seeding {students} users")
+    _bulk_insert(
+        User,
+        (
+            User(username=f"{BENCH_PREFIX}{i}", role="STUDENT", password=password)
+            for i in range(start, start + students)
+        ),
+        batch_size,
+    )
+    new_users = User.objects.filter(username__startswith=BENCH_PREFIX, id__gt=last_id)
+    user_ids = np.array(new_users.order_by("id").values_list("id", flat=True))
+
+    attendance, marks, assignments = _features(rng, len(user_ids))
+    departments = rng.choice(DEPARTMENTS, len(user_ids))
+    years = rng.choice(YEARS, len(user_ids))
+
+    log("Seeding student profiles")
+    _bulk_insert(
+        Student,
+        (
+            Student(
+                user_id=int(user_id),
+                enrollment_number=f"B{start + i:08d}",
+                department=departments[i],
+                year=int(years[i]),
+                marks=float(marks[i]),
+                attendance=float(attendance[i]),
+            )
+            for i, user_id in enumerate(user_ids)
+        ),
+        batch_size,
+    )
+    profile_ids = np.array(
+        Student.objects.filter(user__in=new_users)
+        .order_by("user_id")
+        .values_list("id", flat=True)
+    )
+
+    log("Seeding analytics")
+    analytics = generate_cohort_analytics(attendance, marks, assignments)
+    _bulk_insert(
+        StudentAnalytics,
+        (
+            StudentAnalytics(
+                student_id=int(user_id),
+                attendance_percentage=float(attendance[i]),
+                average_marks=float(marks[i]),
+                assignment_completion_rate=float(assignments[i]),
+                risk_score=float(analytics["risk_score"][i]),
+                risk_level=analytics["risk_level"][i],
+                predicted_grade=analytics["predicted_grade"][i],
+            )
+            for i, user_id in enumerate(user_ids)
+        ),
+        batch_size,
+    )
+
+    return user_ids, profile_ids
+
+
+def seed_goals(profile_ids, per_student=3, batch_size=5000, rng=None) -> int:
+    """
+    Seeds `per_student` goals with random statuses for each profile
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    statuses = rng.choice(GOAL_STATUSES, len(profile_ids) * per_student)
+
+    return _bulk_insert(
+        Goal,
+        (
+            Goal(
+                student_id=int(profile_id),
+                title=f"Goal {n + 1}",
+                status=statuses[i * per_student + n],
+            )
+            for i, profile_id in enumerate(profile_ids)
+            for n in range(per_student)
+        ),
+        batch_size,
+    )
+
+
+def synthetic_feature_rows(n, rng=None) -> list:
+    """
+    Prediction API payloads: one dict of the three features per row
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    attendance, marks, assignments = _features(rng, n)
+
+    return [
+        {
+            "attendance_percentage": float(attendance[i]),
+            "average_marks": float(marks[i]),
+            "assignment_completion_rate": float(assignments[i]),
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_roster_csv(n, rng=None, start=0) -> bytes:
+    """
+    A roster file in the upload ingestion format
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    attendance, marks, assignments = _features(rng, n)
+    departments = rng.choice(DEPARTMENTS, n)
+    years = rng.choice(YEARS, n)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(REQUIRED_COLUMNS)
+    for i in range(n):
+        writer.writerow([
+            f"R{start + i:08d}",
+            f"{BENCH_PREFIX}roster-{start + i}",
+            departments[i],
+            years[i],
+            attendance[i],
+            marks[i],
+            assignments[i],
+        ])
+
+    return buffer.getvalue().encode()
+
+
+def seed_synthetic_data(students=100_000, rows=1_000_000, batch_size=5000, seed=0, log=None):
+    """
+    Seeds `students` users with Student profiles and StudentAnalytics,
+    plus `rows` rows each of StudentPrediction, History and Alert.
+    Returns a dict of row counts per table.
+    """
+    log = log or (lambda message: None)
+    rng = np.random.default_rng(seed)
+
+    user_ids, profile_ids = seed_students(students, batch_size, rng, log=log)
+
+    log(f"Seeding {rows} predictions")
+    owners = rng.integers(0, len(user_ids), rows)
+    p_attendance, p_marks, p_assignments = _features(rng, rows)
+    predicted = generate_cohort_analytics(p_attendance, p_marks, p_assignments)
+    what_if = rng.random(rows) < 0.3
+    _bulk_insert(
+        StudentPrediction,
+        (
+            StudentPrediction(
+                student_id=int(user_ids[owner]),
+                attendance_percentage=float(p_attendance[i]),
+                average_marks=float(p_marks[i]),
+                assignment_completion_rate=float(p_assignments[i]),
+                predicted_risk_score=float(predicted["risk_score"][i]),
+                predicted_risk_level=predicted["risk_level"][i],
+                predicted_grade=predicted["predicted_grade"][i],
+                is_what_if=bool(what_if[i]),
+            )
+            for i, owner in enumerate(owners)
+        ),
+        batch_size,
+    )
+
+    log(f"Seeding {rows} history entries")
+    owners = rng.integers(0, len(user_ids), rows)
+    actions = rng.choice(HISTORY_ACTIONS, rows)
+    _bulk_insert(
+        History,
+        (
+            History(
+                user_id=int(user_ids[owner]),
+                student_id=int(profile_ids[owner]),
+                action=actions[i],
+            )
+            for i, owner in enumerate(owners)
+        ),
+        batch_size,
+    )
+
+    log(f"Seeding {rows} alerts")
+    owners = rng.integers(0, len(profile_ids), rows)
+    levels = rng.choice(ALERT_LEVELS, rows)
+    # most alerts in a long-running deployment are already resolved
+    resolved = rng.random(rows) < 0.9
+    _bulk_insert(
+        Alert,
+        (
+            Alert(
+                student_id=int(profile_ids[owner]),
+                title="Synthetic alert",
+                description="",
+                level=levels[i],
+                resolved=bool(resolved[i]),
+            )
+            for i, owner in enumerate(owners)
+        ),
+        batch_size,
+    )
+
+    # bulk inserts bypass the StudentAnalytics signals
+    rebuild_kpi_snapshot()
+
+    return synthetic_row_counts()
+
+
+def synthetic_row_counts() -> dict:
+    users = User.objects.filter(username__startswith=BENCH_PREFIX)
+    return {
+        "users": users.count(),
+        "students": Student.objects.filter(user__in=users).count(),
+        "analytics": StudentAnalytics.objects.filter(student__in=users).count(),
+        "predictions": StudentPrediction.objects.filter(student__in=users).count(),
+        "history": History.objects.filter(user__in=users).count(),
+        "alerts": Alert.objects.filter(student__user__in=users).count(),
+    }
+
+
+def clear_synthetic_data() -> int:
+    """
+    Deletes every synthetic user; profiles, analytics, predictions,
+    history and alerts go with them through CASCADE
+    """
+    deleted, _ = User.objects.filter(username__startswith=BENCH_PREFIX).delete()
+    rebuild_kpi_snapshot()
+    return deleted
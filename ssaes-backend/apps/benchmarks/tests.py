@@ -0,0 +1,82 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+
+from apps.alerts.models import Alert
+from apps.students.models import Student
+from .suite import BenchmarkConfig, compare_results, run_suite
+from .synthetic import synthetic_row_counts
+
+User = get_user_model()
+
+
+class BenchmarkQueriesCommandTests(TransactionTestCase):
+
+    def test_small_run_reports_both_passes_and_keeps_indexes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "results.json")
+            call_command(
+                "benchmark_queries",
+                students=20, rows=100, batch=50, repeat=2,
+                output=output, stdout=io.StringIO(),
+            )
+            with open(output) as f:
+                report = json.load(f)
+
+        self.assertEqual(report["rows"]["students"], 20)
+        self.assertEqual(report["rows"]["predictions"], 100)
+        self.assertIn("student_open_alerts", report["queries"])
+        self.assertIn("user_history_page", report["queries"])
+        for result in report["queries"].values():
+            self.assertIn("median_ms", result["before"])
+            self.assertIn("median_ms", result["after"])
+            self.assertTrue(result["after"]["plan"])
+
+        # the "before" pass must not leave the indexes dropped
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Student._meta.db_table
+            )
+        self.assertIn("student_dept_year_marks_idx", constraints)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Alert._meta.db_table
+            )
+        self.assertIn("alert_open_idx", constraints)
+
+        call_command("benchmark_queries", skip_seed=True, clear=True, repeat=1,
+                     stdout=io.StringIO())
+        self.assertEqual(synthetic_row_counts()["users"], 0)
+
+
+class BenchmarkSuiteTests(TestCase):
+
+    def test_quick_suite_records_every_hot_path_and_rolls_back(self):
+        config = BenchmarkConfig.quick(
+            repeat=1, predict_rows=20, batch_sizes=[50], analytics_students=50,
+            dashboard_sizes=[30], recommendation_students=10, ingest_rows=20,
+        )
+        results = run_suite(config)
+
+        for name in (
+            "predict_single", "predict_batch[50]", "generate_student_analytics",
+            "dashboard_api[30]", "generate_recommendations_for_all_students",
+            "upload_ingestion[20]",
+        ):
+            self.assertIn("median_ms", results[name])
+
+        self.assertFalse(User.objects.exists())
+
+    def test_compare_flags_slowdowns(self):
+        rows = compare_results(
+            {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}},
+            {"a": {"median_ms": 13.0}, "b": {"median_ms": 11.0}, "c": {"median_ms": 1.0}},
+            threshold=0.2
+        )
+        self.assertEqual([(row[0], row[4]) for row in rows], [("a", True), ("b", False)])
@@ -0,0 +1,43 @@
+"""
+benchmarks/timing.py
+
+Wall-clock timing helpers shared by the benchmark commands.
+"""
+
+import statistics
+import time
+
+import numpy as np
+
+
+def measure(fn, repeat=5, warmup=1) -> dict:
+    """
+    Calls fn() `warmup` times untimed, then `repeat` times timed.
+    Returns median / p95 / min latency in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(float(np.percentile(timings, 95)), 3),
+        "min_ms": round(min(timings), 3),
+    }
+
+
+def with_throughput(timing: dict, rows: int) -> dict:
+    """
+    Adds rows/second (based on the median) to a measure() result
+    """
+    median = timing["median_ms"]
+    return {
+        **timing,
+        "rows": rows,
+        "rows_per_sec": round(rows / (median / 1000), 1) if median else None,
+    }
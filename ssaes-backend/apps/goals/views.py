@@ -2,6 +2,7 @@ from rest_framework import viewsets, permissions
 from .models import Goal
 from .serializers import GoalSerializer
 from apps.accounts.permissions import IsAdmin, IsFaculty
+from apps.accounts.tokens import student_profile_id
 
 class GoalViewSet(viewsets.ModelViewSet):
     queryset = Goal.objects.all()
@@ -25,5 +26,5 @@ class GoalViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         if user.role == 'STUDENT':
-            return Goal.objects.filter(student__user=user)
+            return Goal.objects.filter(student_id=student_profile_id(self.request))
         return super().get_queryset()
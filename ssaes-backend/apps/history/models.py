@@ -1,7 +1,7 @@
 from django.db import models
 from django.conf import settings
 from apps.students.models import Student  # Adjust if you track per student
-from apps.predictions.models import Prediction  # Optional: if linked to ML predictions
+from apps.predictions.models import StudentPrediction
 
 class History(models.Model):
     ACTION_CHOICES = [
@@ -27,7 +27,7 @@ class History(models.Model):
         related_name='history_entries'
     )
     prediction = models.ForeignKey(
-        Prediction,
+        StudentPrediction,
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
@@ -40,6 +40,10 @@ class History(models.Model):
     class Meta:
         ordering = ['-timestamp']
         verbose_name_plural = 'History'
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='history_user_timestamp_idx'),
+            models.Index(fields=['-timestamp', '-id'], name='history_timestamp_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.action} at {self.timestamp}"
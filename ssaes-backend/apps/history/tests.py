@@ -1,3 +1,79 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.predictions.models import StudentPrediction
+from apps.students.models import Student
+from ssaes_backend.testing import QueryBudgetMixin
+from .models import History
+
+User = get_user_model()
+
+
+class HistoryListQueryTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", password="123", role="ADMIN")
+        self.client.force_authenticate(user=self.admin)
+        self.created = 0
+
+    def seed(self, count):
+        for _ in range(count):
+            self.created += 1
+            user = User.objects.create_user(username=f"s{self.created}", password="123")
+            student = Student.objects.create(
+                user=user, enrollment_number=f"E{self.created}", department="CSE", year=1
+            )
+            prediction = StudentPrediction.objects.create(
+                student=user,
+                attendance_percentage=80,
+                average_marks=70,
+                assignment_completion_rate=90,
+                predicted_risk_score=25,
+                predicted_risk_level="LOW",
+                predicted_grade="B",
+            )
+            History.objects.create(
+                user=user, student=student, prediction=prediction, action="PREDICT"
+            )
+
+    def test_history_list_query_count_is_constant(self):
+        self.assertConstantQueries("/api/history/history/", self.seed, max_queries=1)
+
+
+class HistoryPaginationExportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", password="123", role="ADMIN")
+        self.client.force_authenticate(user=self.admin)
+        History.objects.bulk_create([
+            History(user=self.admin, action="LOGIN", description=f"entry {i}")
+            for i in range(7)
+        ])
+
+    def test_cursor_pagination(self):
+        response = self.client.get("/api/history/history/?page_size=5")
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+
+    def test_csv_export_streams_all_rows(self):
+        response = self.client.get("/api/history/history/export/")
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 8)
+        self.assertTrue(lines[0].startswith("id,timestamp,action"))
+
+    def test_ndjson_export(self):
+        response = self.client.get("/api/history/history/export/?as=ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 7)
+
+    def test_unknown_export_format(self):
+        response = self.client.get("/api/history/history/export/?as=xml")
+        self.assertEqual(response.status_code, 400)
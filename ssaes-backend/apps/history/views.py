@@ -1,4 +1,9 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from ssaes_backend.pagination import TimestampCursorPagination
+from ssaes_backend.streaming import streaming_export
 from .models import History
 from .serializers import HistorySerializer
 
@@ -6,14 +11,47 @@ class HistoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Read-only endpoint for viewing audit logs or prediction history.
     """
-    queryset = History.objects.all()
+    # Related rows rendered by the StringRelatedFields in HistorySerializer
+    queryset = History.objects.select_related(
+        'user', 'student__user', 'prediction__student'
+    ).only(
+        'id', 'action', 'description', 'timestamp',
+        'user', 'user__username', 'user__role',
+        'student', 'student__enrollment_number',
+        'student__user', 'student__user__username',
+        'prediction', 'prediction__is_what_if',
+        'prediction__student', 'prediction__student__username',
+        'prediction__student__role',
+    )
     serializer_class = HistorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TimestampCursorPagination
+
+    export_fields = (
+        'id', 'timestamp', 'action', 'description',
+        'user__username', 'student__enrollment_number', 'prediction_id',
+    )
 
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         # Admins and faculty can see all history
         if user.role in ['ADMIN', 'FACULTY']:
-            return super().get_queryset()
+            return queryset
         # Students can see only their own history
-        return History.objects.filter(user=user)
+        return queryset.filter(user=user)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Streams the visible history as CSV (default) or NDJSON (?as=ndjson).
+        """
+        try:
+            return streaming_export(
+                self.get_queryset().order_by('-timestamp', '-id'),
+                self.export_fields,
+                request.query_params.get('as', 'csv'),
+                'history'
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('RESCORE_COHORT', 'Rescore cohort'), ('RESCORE_PREDICTIONS', 'Rescore stale predictions'), ('GENERATE_RECOMMENDATIONS', 'Generate recommendations'), ('BUILD_REPORT', 'Build report'), ('INGEST_UPLOAD', 'Ingest upload')], max_length=30),
+        ),
+    ]
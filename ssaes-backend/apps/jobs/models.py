@@ -0,0 +1,60 @@
+from django.db import models
+from django.conf import settings
+
+
+class Job(models.Model):
+    """
+    Tracks a long-running background job (split into chunked Celery tasks)
+    """
+
+    KIND_CHOICES = (
+        ('RESCORE_COHORT', 'Rescore cohort'),
+        ('RESCORE_PREDICTIONS', 'Rescore stale predictions'),
+        ('GENERATE_RECOMMENDATIONS', 'Generate recommendations'),
+        ('BUILD_REPORT', 'Build report'),
+        ('INGEST_UPLOAD', 'Ingest upload'),
+    )
+
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    )
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+
+    params = models.JSONField(default=dict, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def progress(self):
+        """
+        Completion percentage (0-100)
+        """
+        if self.status == 'COMPLETED':
+            return 100.0
+        if not self.total:
+            return 0.0
+        return round(min(self.processed / self.total, 1) * 100, 1)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
@@ -0,0 +1,45 @@
+from rest_framework import serializers
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    created_by = serializers.StringRelatedField(read_only=True)
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'kind',
+            'status',
+            'params',
+            'total',
+            'processed',
+            'progress',
+            'result',
+            'error',
+            'created_by',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = [
+            'id', 'status', 'total', 'processed', 'progress', 'result',
+            'error', 'created_by', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def validate_params(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('params must be a JSON object.')
+        chunk_size = value.get('chunk_size')
+        if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size < 1):
+            raise serializers.ValidationError('chunk_size must be a positive integer.')
+        return value
+
+
+class JobProgressSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Job
+        fields = ['id', 'status', 'total', 'processed', 'progress', 'error']
@@ -0,0 +1,20 @@
+# jobs/services.py
+
+from .models import Job
+from .tasks import start_job
+
+
+def submit_job(kind: str, user=None, params: dict = None) -> Job:
+    """
+    Creates a Job row and queues it on Celery.
+    With CELERY_TASK_ALWAYS_EAGER (tests) the job runs inline.
+    """
+    job = Job.objects.create(
+        kind=kind,
+        params=params or {},
+        created_by=user
+    )
+    start_job.delay(job.pk)
+
+    job.refresh_from_db()
+    return job
@@ -0,0 +1,322 @@
+# jobs/tasks.py
+
+"""
+Chunked Celery tasks behind the Job model.
+
+start_job() splits the work into primary-key ranges and fans them out
+as a chord. Each chunk task advances Job.processed as it goes, and
+finish_job() runs once all chunks are done.
+"""
+
+from contextlib import contextmanager
+
+import numpy as np
+from celery import chord, shared_task
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.alerts.services import raise_risk_alerts
+from apps.analytics.engine import invalidate_cohort_frame
+from apps.analytics.models import StudentAnalytics
+from apps.analytics.ranking import invalidate_risk_ranking
+from apps.analytics.snapshot import rebuild_kpi_snapshot
+from apps.predictions.ml.predictor import model_version, predict_feature_matrix, registry
+from apps.predictions.models import StudentPrediction
+from apps.predictions.rescoring import rescore_predictions, stale_predictions
+from apps.recommendations.engine import generate_recommendations_for_students
+from apps.students.models import Student
+from apps.uploads.ingestion import ingest_upload
+from apps.uploads.models import Upload
+from .models import Job
+
+CHUNK_SIZE = 2000
+
+
+# -----------------------------
+# HELPERS
+# -----------------------------
+
+def pk_ranges(queryset, chunk_size):
+    """
+    Splits a queryset's primary keys into inclusive (first, last) ranges.
+    Keys are read one chunk at a time (keyset pagination), so planning
+    never holds more than chunk_size of them.
+    """
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    ranges, total, last = [], 0, None
+
+    while True:
+        page = pks if last is None else pks.filter(pk__gt=last)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return ranges, total
+        ranges.append((chunk[0], chunk[-1]))
+        total += len(chunk)
+        last = chunk[-1]
+
+
+def advance(job_id, count):
+    Job.objects.filter(pk=job_id).update(processed=F("processed") + count)
+
+
+@contextmanager
+def fail_job_on_error(job_id):
+    try:
+        yield
+    except Exception as e:
+        Job.objects.filter(pk=job_id).update(
+            status="FAILED",
+            error=f"{type(e).__name__}: {e}",
+            finished_at=timezone.now()
+        )
+        raise
+
+
+def merge_results(results):
+    """
+    Adds up chunk results key by key (numbers are summed, lists joined)
+    """
+    merged = {}
+    for result in results or []:
+        for key, value in result.items():
+            merged[key] = merged[key] + value if key in merged else value
+    return merged
+
+
+# -----------------------------
+# JOB ENTRY POINTS
+# -----------------------------
+
+@shared_task
+def start_job(job_id):
+    """
+    Plans a job and dispatches its chunk tasks
+    """
+    job = Job.objects.get(pk=job_id)
+    chunk_size = int(job.params.get("chunk_size", CHUNK_SIZE))
+
+    with fail_job_on_error(job_id):
+        if job.kind == "INGEST_UPLOAD":
+            # a file is streamed in order: ingested as a single task
+            run_ingest_upload(job)
+            return
+
+        if job.kind == "RESCORE_COHORT":
+            queryset, chunk_task = StudentAnalytics.objects.all(), rescore_chunk
+        elif job.kind == "RESCORE_PREDICTIONS":
+            # only rows still stale are planned, so resubmitting resumes
+            version = model_version(registry.get_state())
+            queryset, chunk_task = stale_predictions(version), rescore_predictions_chunk
+            Job.objects.filter(pk=job_id).update(result={"model_version": version})
+        elif job.kind == "GENERATE_RECOMMENDATIONS":
+            queryset, chunk_task = Student.objects.all(), recommendations_chunk
+        elif job.kind == "BUILD_REPORT":
+            queryset, chunk_task = StudentAnalytics.objects.all(), report_chunk
+        else:
+            raise ValueError(f"Unknown job kind: {job.kind}")
+
+        ranges, total = pk_ranges(queryset, chunk_size)
+        Job.objects.filter(pk=job_id).update(
+            status="RUNNING", total=total, started_at=timezone.now()
+        )
+
+        if not ranges:
+            finish_job([], job_id)
+            return
+
+        chord(
+            chunk_task.s(job_id, first, last) for first, last in ranges
+        )(finish_job.s(job_id))
+
+
+@shared_task
+def finish_job(results, job_id):
+    """
+    Chord callback: merges chunk results and marks the job completed
+    """
+    job = Job.objects.get(pk=job_id)
+
+    with fail_job_on_error(job_id):
+        result = {**(job.result or {}), **merge_results(results)}
+
+        if job.kind == "RESCORE_COHORT":
+            # bulk_update bypasses StudentAnalytics signals
+            result["snapshot_buckets"] = rebuild_kpi_snapshot()
+            invalidate_cohort_frame()
+            invalidate_risk_ranking()
+        elif job.kind == "BUILD_REPORT":
+            result.update(build_report(result.pop("report_groups", [])))
+
+        Job.objects.filter(pk=job_id).update(
+            status="COMPLETED",
+            result=result,
+            finished_at=timezone.now()
+        )
+
+
+def run_ingest_upload(job):
+    """
+    Ingests params["upload_id"]; row progress is kept on the Upload row.
+    A file that cannot be ingested fails the job.
+    """
+    upload = Upload.objects.get(pk=job.params["upload_id"])
+    Job.objects.filter(pk=job.pk).update(status="RUNNING", started_at=timezone.now())
+
+    upload = ingest_upload(upload)
+    Job.objects.filter(pk=job.pk).update(
+        status="FAILED" if upload.status == "FAILED" else "COMPLETED",
+        total=upload.rows_processed,
+        processed=upload.rows_processed,
+        result={
+            "upload_id": upload.pk,
+            "upload_status": upload.status,
+            "rows_imported": upload.rows_imported,
+            "rows_failed": upload.rows_failed,
+        },
+        error=upload.errors[-1]["error"] if upload.status == "FAILED" else "",
+        finished_at=timezone.now()
+    )
+
+
+# -----------------------------
+# CHUNK TASKS
+# -----------------------------
+
+@shared_task
+def rescore_chunk(job_id, first_pk, last_pk):
+    """
+    Rescores one pk range of StudentAnalytics with a single model call
+    """
+    with fail_job_on_error(job_id):
+        rows = list(
+            StudentAnalytics.objects.filter(
+                pk__range=(first_pk, last_pk)
+            ).values_list(
+                "pk",
+                "student_id",
+                "risk_level",
+                "attendance_percentage",
+                "average_marks",
+                "assignment_completion_rate"
+            )
+        )
+        if not rows:
+            return {"rescored": 0}
+
+        pks, user_ids, previous_levels, *features = zip(*rows)
+        prediction = predict_feature_matrix(np.array(features, dtype=float).T / 100)
+        levels = prediction["predicted_risk_level"].tolist()
+
+        StudentAnalytics.objects.bulk_update(
+            [
+                StudentAnalytics(
+                    pk=pk,
+                    risk_score=score,
+                    risk_level=level,
+                    predicted_grade=grade
+                )
+                for pk, score, level, grade in zip(
+                    pks,
+                    prediction["predicted_risk_score"].tolist(),
+                    levels,
+                    prediction["predicted_grade"].tolist(),
+                )
+            ],
+            ["risk_score", "risk_level", "predicted_grade"],
+            batch_size=500
+        )
+
+        # bulk_update skips signals: raise escalation alerts in one batch
+        raise_risk_alerts(zip(user_ids, previous_levels, levels))
+
+        advance(job_id, len(rows))
+        return {"rescored": len(rows)}
+
+
+@shared_task
+def rescore_predictions_chunk(job_id, first_pk, last_pk):
+    """
+    Rescores the still-stale predictions in one pk range
+    """
+    with fail_job_on_error(job_id):
+        rescored = rescore_predictions(
+            StudentPrediction.objects.filter(pk__range=(first_pk, last_pk))
+        )
+
+        advance(job_id, rescored)
+        return {"rescored": rescored}
+
+
+@shared_task
+def recommendations_chunk(job_id, first_pk, last_pk):
+    """
+    Generates recommendations for one pk range of students
+    """
+    with fail_job_on_error(job_id):
+        summary = generate_recommendations_for_students(
+            Student.objects.filter(pk__range=(first_pk, last_pk))
+        )
+
+        advance(job_id, summary["students"])
+        return summary
+
+
+@shared_task
+def report_chunk(job_id, first_pk, last_pk):
+    """
+    Per department / risk level counts and sums for one pk range of
+    StudentAnalytics (one GROUP BY); finish_job folds them into the report
+    """
+    with fail_job_on_error(job_id):
+        groups = list(
+            StudentAnalytics.objects.filter(
+                pk__range=(first_pk, last_pk)
+            ).values(
+                "risk_level",
+                department=Coalesce(F("student__student_profile__department"), Value("")),
+            ).annotate(
+                students=Count("id"),
+                marks_sum=Sum("average_marks"),
+                attendance_sum=Sum("attendance_percentage"),
+                risk_score_sum=Sum("risk_score"),
+            ).order_by()
+        )
+
+        advance(job_id, sum(group["students"] for group in groups))
+        return {"report_groups": groups}
+
+
+# -----------------------------
+# REPORT
+# -----------------------------
+
+REPORT_SUMS = ("marks_sum", "attendance_sum", "risk_score_sum")
+
+
+def build_report(groups):
+    """
+    Cohort report: per department / risk level counts and averages,
+    merged from the report_chunk groups
+    """
+    totals = {}
+    for group in groups:
+        key = (group["department"], group["risk_level"])
+        total = totals.setdefault(key, dict.fromkeys(("students",) + REPORT_SUMS, 0))
+        for field in total:
+            total[field] += group[field]
+
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "breakdown": [
+            {
+                "department": department,
+                "risk_level": risk_level,
+                "students": total["students"],
+                "average_marks": total["marks_sum"] / total["students"],
+                "average_attendance": total["attendance_sum"] / total["students"],
+                "average_risk_score": total["risk_score_sum"] / total["students"],
+            }
+            for (department, risk_level), total in sorted(totals.items())
+        ],
+    }
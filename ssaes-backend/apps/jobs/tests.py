@@ -0,0 +1,135 @@
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.analytics.models import StudentAnalytics
+from apps.predictions.models import StudentPrediction
+from .models import Job
+from .tasks import pk_ranges
+
+User = get_user_model()
+
+
+class JobAPITestCase(APITestCase):
+    """
+    Jobs run eagerly in tests (CELERY_TASK_ALWAYS_EAGER), so a submitted
+    job is already finished when the POST returns.
+    """
+
+    def setUp(self):
+        self.faculty = User.objects.create_user(
+            username='faculty', password='facultypass', role='FACULTY'
+        )
+        self.client.force_authenticate(user=self.faculty)
+
+        for i in range(5):
+            student = User.objects.create_user(username=f's{i}', password='123')
+            StudentAnalytics.objects.create(
+                student=student,
+                attendance_percentage=20 * i,
+                average_marks=20 * i,
+                assignment_completion_rate=20 * i,
+                risk_score=0,
+                risk_level='LOW',
+            )
+
+    def test_rescore_job_runs_in_chunks(self):
+        response = self.client.post(
+            '/api/jobs/',
+            {'kind': 'RESCORE_COHORT', 'params': {'chunk_size': 2}},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual(job.processed, 5)
+        self.assertEqual(job.result['rescored'], 5)
+        self.assertEqual(
+            StudentAnalytics.objects.filter(risk_level='HIGH').count(), 2
+        )
+
+    def test_rescore_predictions_job_skips_current_rows(self):
+        student = User.objects.get(username='s0')
+        StudentPrediction.objects.bulk_create([
+            StudentPrediction(
+                student=student,
+                attendance_percentage=90,
+                average_marks=90,
+                assignment_completion_rate=90,
+                predicted_risk_score=99,
+                predicted_risk_level='HIGH',
+                predicted_grade='F',
+                model_version=version,
+            )
+            for version in ('', 'lightgbm-old', 'lightgbm-old', 'rules')
+        ])
+
+        response = self.client.post(
+            '/api/jobs/',
+            {'kind': 'RESCORE_PREDICTIONS', 'params': {'chunk_size': 2}},
+            format='json'
+        )
+
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual(job.total, 3)
+        self.assertEqual(job.result, {'model_version': 'rules', 'rescored': 3})
+        self.assertEqual(
+            StudentPrediction.objects.filter(model_version='rules', predicted_risk_level='LOW').count(),
+            3
+        )
+
+    def test_progress_endpoint(self):
+        job = Job.objects.create(kind='BUILD_REPORT', total=4, processed=1)
+        response = self.client.get(f'/api/jobs/{job.pk}/progress/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['progress'], 25.0)
+
+    def test_report_job(self):
+        response = self.client.post('/api/jobs/', {'kind': 'BUILD_REPORT'}, format='json')
+        self.assertEqual(response.data['status'], 'COMPLETED')
+        self.assertIn('breakdown', response.data['result'])
+
+    def test_report_job_runs_in_chunks(self):
+        response = self.client.post(
+            '/api/jobs/',
+            {'kind': 'BUILD_REPORT', 'params': {'chunk_size': 2}},
+            format='json'
+        )
+
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual((job.total, job.processed), (5, 5))
+        self.assertEqual(
+            job.result['breakdown'],
+            [{
+                'department': '',
+                'risk_level': 'LOW',
+                'students': 5,
+                'average_marks': 40.0,
+                'average_attendance': 40.0,
+                'average_risk_score': 0.0,
+            }]
+        )
+
+    def test_pk_ranges_cover_every_row(self):
+        pks = list(StudentAnalytics.objects.order_by('pk').values_list('pk', flat=True))
+        ranges, total = pk_ranges(StudentAnalytics.objects.all(), 2)
+        self.assertEqual(total, 5)
+        self.assertEqual(ranges, [(pks[0], pks[1]), (pks[2], pks[3]), (pks[4], pks[4])])
+
+    def test_params_must_be_an_object(self):
+        for params in (['chunk_size', 2], 'fast', 3):
+            with self.subTest(params=params):
+                response = self.client.post(
+                    '/api/jobs/', {'kind': 'BUILD_REPORT', 'params': params}, format='json'
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('params', response.data)
+
+    def test_students_cannot_submit_jobs(self):
+        student = User.objects.create_user(username='student', password='123', role='STUDENT')
+        self.client.force_authenticate(user=student)
+        response = self.client.post('/api/jobs/', {'kind': 'BUILD_REPORT'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
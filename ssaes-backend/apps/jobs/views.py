@@ -0,0 +1,38 @@
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .models import Job
+from .serializers import JobSerializer, JobProgressSerializer
+from .services import submit_job
+from apps.accounts.permissions import IsAdmin, IsFaculty
+
+
+class JobViewSet(mixins.CreateModelMixin,
+                 mixins.ListModelMixin,
+                 mixins.RetrieveModelMixin,
+                 viewsets.GenericViewSet):
+    """
+    Submit and poll background jobs (faculty/admin only).
+    POST creates a job and returns 202; GET <id>/progress/ is a
+    lightweight polling endpoint.
+    """
+    queryset = Job.objects.select_related('created_by')
+    serializer_class = JobSerializer
+    permission_classes = [IsAdmin | IsFaculty]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = submit_job(
+            serializer.validated_data['kind'],
+            user=request.user,
+            params=serializer.validated_data.get('params')
+        )
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        job = self.get_object()
+        return Response(JobProgressSerializer(job).data)
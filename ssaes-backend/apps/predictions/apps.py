@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PredictionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.predictions"
+
+    def ready(self):
+        from .ml.predictor import prediction_cache, registry
+
+        registry.configure(
+            path=getattr(settings, "PREDICTION_MODEL_PATH", None),
+            check_interval=getattr(settings, "PREDICTION_MODEL_CHECK_INTERVAL", None),
+            mmap_mode=getattr(settings, "PREDICTION_MODEL_MMAP_MODE", None),
+        )
+
+        prediction_cache.configure(
+            maxsize=getattr(settings, "PREDICTION_CACHE_SIZE", None),
+            precision=getattr(settings, "PREDICTION_CACHE_PRECISION", None),
+            shared_alias=getattr(settings, "PREDICTION_CACHE_SHARED_ALIAS", None),
+            shared_timeout=getattr(settings, "PREDICTION_CACHE_TIMEOUT", None),
+        )
+
+        if getattr(settings, "PREDICTION_MODEL_WARMUP", False):
+            registry.warmup()
@@ -0,0 +1,54 @@
+"""
+rescore_predictions
+
+Rescores stored predictions that were produced by another model version
+than the live one. Safe to interrupt: running it again continues with
+the rows that are still stale. For large tables on a worker pool, submit
+a RESCORE_PREDICTIONS job instead (POST /api/jobs/).
+
+    python manage.py rescore_predictions
+    python manage.py rescore_predictions --dry-run
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.predictions.ml.predictor import model_version, registry
+from apps.predictions.rescoring import (
+    CHUNK_SIZE,
+    LEGACY_VERSION,
+    rescore_stale_predictions,
+    version_counts,
+)
+
+
+class Command(BaseCommand):
+    help = "Rescore predictions made by an older model version"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only report how many predictions each version produced"
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        current = model_version(registry.get_state())
+
+        if options["dry_run"]:
+            for version, count in sorted(version_counts().items()):
+                if version == current:
+                    marker = "current"
+                elif version == LEGACY_VERSION:
+                    marker = "legacy (kept)"
+                else:
+                    marker = "stale"
+                self.stdout.write(f"{version or '(unversioned)':40} {count:10} {marker}")
+            return
+
+        result = rescore_stale_predictions(options["chunk_size"], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescored {result['rescored']} predictions with model {result['model_version']}"
+        ))
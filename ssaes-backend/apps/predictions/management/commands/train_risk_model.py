@@ -0,0 +1,91 @@
+"""
+train_risk_model
+
+Trains the risk model from StudentAnalytics (optionally plus recorded
+non-what-if predictions) and exports a versioned artifact.
+
+    python manage.py train_risk_model
+    python manage.py train_risk_model --backend xgboost --rounds 400 --activate
+"""
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.predictions.ml.model import BACKENDS
+from apps.predictions.ml.predictor import registry
+from apps.predictions.ml.training import (
+    CHUNK_SIZE,
+    activate_artifact,
+    build_training_matrix,
+    export_artifact,
+    train_risk_model,
+)
+
+
+class Command(BaseCommand):
+    help = "Train the LightGBM/XGBoost risk model and export a versioned artifact"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", choices=BACKENDS, default="lightgbm")
+        parser.add_argument("--rounds", type=int, default=200)
+        parser.add_argument("--learning-rate", type=float)
+        parser.add_argument("--n-jobs", type=int, default=-1, help="-1 uses every core")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--holdout", type=float, default=0.2)
+        parser.add_argument("--min-rows", type=int, default=50)
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            "--include-predictions", action="store_true",
+            help="Also train on stored non-what-if StudentPrediction rows"
+        )
+        parser.add_argument(
+            "--output-dir",
+            default=getattr(settings, "PREDICTION_MODEL_ARTIFACT_DIR", "model_artifacts")
+        )
+        parser.add_argument(
+            "--activate", action="store_true",
+            help="Install the new model as PREDICTION_MODEL_PATH"
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options["holdout"] < 1:
+            raise CommandError("--holdout must be in [0, 1)")
+
+        X, y = build_training_matrix(
+            include_predictions=options["include_predictions"],
+            chunk_size=options["chunk_size"]
+        )
+        if len(X) < options["min_rows"]:
+            raise CommandError(
+                f"Only {len(X)} training rows (need at least {options['min_rows']})"
+            )
+
+        params = {}
+        if options["learning_rate"] is not None:
+            key = "learning_rate" if options["backend"] == "lightgbm" else "eta"
+            params[key] = options["learning_rate"]
+
+        self.stdout.write(f"Training {options['backend']} on {len(X)} rows")
+        try:
+            model = train_risk_model(
+                X, y,
+                backend=options["backend"],
+                rounds=options["rounds"],
+                params=params,
+                n_jobs=options["n_jobs"],
+                seed=options["seed"],
+                holdout=options["holdout"],
+            )
+        except ImportError as e:
+            raise CommandError(f"{options['backend']} is not installed: {e}")
+
+        artifact_dir = export_artifact(model, options["output_dir"])
+        self.stdout.write(json.dumps(model.metadata["metrics"], indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Exported {model.version} to {artifact_dir}"))
+
+        if options["activate"]:
+            activate_artifact(artifact_dir, registry.path)
+            registry.reload()
+            self.stdout.write(self.style.SUCCESS(f"Activated {model.version}"))
@@ -0,0 +1,163 @@
+# Brings the migration state in line with the current StudentPrediction
+# model (0001 predates the what-if/history fields) and adds the
+# indexes used by the prediction history endpoints.
+#
+# Existing rows keep their outputs: risk_level is renamed (and
+# normalized to the LOW / MEDIUM / HIGH choices), predicted_gpa is
+# converted to a letter grade before the column is dropped, and the
+# risk score is set to the lower bound of the row's level.
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# 0001 stored free-form levels and a 4-point GPA
+LEVEL_ALIASES = {"MODERATE": "MEDIUM"}
+LEVEL_SCORES = {"LOW": 0.0, "MEDIUM": 40.0, "HIGH": 70.0}
+GPA_GRADES = ((3.7, "A"), (3.0, "B"), (2.0, "C"), (1.0, "D"))
+
+CHUNK_SIZE = 2000
+
+
+def gpa_to_grade(gpa):
+    for floor, grade in GPA_GRADES:
+        if gpa is not None and gpa >= floor:
+            return grade
+    return "F"
+
+
+def copy_legacy_outputs(apps, schema_editor):
+    StudentPrediction = apps.get_model("predictions", "StudentPrediction")
+    fields = ["predicted_risk_level", "predicted_risk_score", "predicted_grade"]
+
+    rows = []
+    for prediction in StudentPrediction.objects.only(
+        "pk", "predicted_gpa", "predicted_risk_level"
+    ).iterator(chunk_size=CHUNK_SIZE):
+        level = (prediction.predicted_risk_level or "").strip().upper()
+        level = LEVEL_ALIASES.get(level, level)
+        if level not in LEVEL_SCORES:
+            level = "LOW"
+
+        prediction.predicted_risk_level = level
+        prediction.predicted_risk_score = LEVEL_SCORES[level]
+        prediction.predicted_grade = gpa_to_grade(prediction.predicted_gpa)
+        rows.append(prediction)
+
+        if len(rows) == CHUNK_SIZE:
+            StudentPrediction.objects.bulk_update(rows, fields)
+            rows = []
+
+    StudentPrediction.objects.bulk_update(rows, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("predictions", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="studentprediction",
+            old_name="user",
+            new_name="student",
+        ),
+        migrations.AlterField(
+            model_name="studentprediction",
+            name="student",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="predictions",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RenameField(
+            model_name="studentprediction",
+            old_name="risk_level",
+            new_name="predicted_risk_level",
+        ),
+        migrations.AddField(
+            model_name="studentprediction",
+            name="attendance_percentage",
+            field=models.FloatField(default=0.0),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="studentprediction",
+            name="average_marks",
+            field=models.FloatField(default=0.0),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="studentprediction",
+            name="assignment_completion_rate",
+            field=models.FloatField(default=0.0),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="studentprediction",
+            name="predicted_risk_score",
+            field=models.FloatField(
+                default=0.0, help_text="Predicted risk score (0–100)"
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="studentprediction",
+            name="predicted_grade",
+            field=models.CharField(
+                default="F",
+                help_text="Predicted final grade (A, B, C, etc.)",
+                max_length=2,
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_legacy_outputs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="studentprediction",
+            name="predicted_gpa",
+        ),
+        migrations.AlterField(
+            model_name="studentprediction",
+            name="predicted_risk_level",
+            field=models.CharField(
+                choices=[
+                    ("LOW", "Low Risk"),
+                    ("MEDIUM", "Medium Risk"),
+                    ("HIGH", "High Risk"),
+                ],
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="studentprediction",
+            name="is_what_if",
+            field=models.BooleanField(
+                default=False, help_text="True if generated from what-if simulation"
+            ),
+        ),
+        migrations.AddField(
+            model_name="studentprediction",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="studentprediction",
+            index=models.Index(
+                fields=["student", "-created_at"],
+                name="prediction_student_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentprediction",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="prediction_created_idx"
+            ),
+        ),
+    ]
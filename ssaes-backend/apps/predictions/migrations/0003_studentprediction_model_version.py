@@ -0,0 +1,44 @@
+# Records which model produced each prediction so rows scored by an
+# older version can be found and rescored (see apps/predictions/rescoring.py).
+# Existing rows are tagged "legacy": 0002 could not recover their inputs
+# (every feature column is 0), so they keep their outputs and are never
+# rescored. The column default is blank for rows written afterwards.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("predictions", "0002_studentprediction_fields_and_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentprediction",
+            name="model_version",
+            field=models.CharField(
+                blank=True,
+                default="legacy",
+                help_text="Version of the model that produced this prediction",
+                max_length=64,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="studentprediction",
+            name="model_version",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Version of the model that produced this prediction",
+                max_length=64,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentprediction",
+            index=models.Index(
+                fields=["model_version", "id"], name="prediction_model_version_idx"
+            ),
+        ),
+    ]
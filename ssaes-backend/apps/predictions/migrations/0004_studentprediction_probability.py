@@ -0,0 +1,23 @@
+# Stores the calibrated probability of HIGH risk next to each prediction.
+# Existing rows stay null until they are rescored.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("predictions", "0003_studentprediction_model_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentprediction",
+            name="probability",
+            field=models.FloatField(
+                blank=True,
+                help_text="Predicted probability of HIGH risk (0–1)",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,187 @@
+"""
+cache.py
+
+Two-tier cache for single predictions.
+
+The what-if slider on the frontend sends the same feature triples over
+and over, so results are cached on the feature vector plus the active model
+version:
+
+- local tier: per-process LRU (OrderedDict), no network round trip
+- shared tier: optional Django cache alias (e.g. Redis) shared by all
+  workers
+
+Keys use the exact feature values by default, so a cached result is
+always the one the input would get. Setting a precision rounds the
+features (and the values scored) to that many decimals: more hits, but
+inputs just below a grade or risk threshold may round across it (marks
+39.95 -> 40.0 predicts D instead of F).
+
+Because the model version is part of every key, a retrained model file
+(new mtime → new registry version) makes old entries unreachable; the
+local tier is also cleared as soon as a new version is seen.
+
+Hit/miss counters are per process, like the local tier: stats() and the
+/metrics counters describe the worker that serves the request. Sum the
+per-worker counters in the metrics backend for a fleet-wide hit rate.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+
+# Version used in keys while the rule-based fallback is active
+RULES_VERSION = "rules"
+
+# bumped whenever the cached result dict changes shape, so entries written
+# by older code in the shared tier are never served
+RESULT_FORMAT = 2
+
+
+class PredictionCache:
+    """
+    - maxsize: entries kept in the local LRU (0 disables the local tier)
+    - precision: decimals the 0–100 feature values are rounded to
+      (None keys on the exact values; rounding is opt-in)
+    - shared_alias: Django cache alias for the shared tier (None disables it)
+    - shared_timeout: seconds entries live in the shared tier
+    """
+
+    def __init__(self, maxsize=4096, precision=None, shared_alias=None, shared_timeout=3600):
+        self.maxsize = maxsize
+        self.precision = precision
+        self.shared_alias = shared_alias
+        self.shared_timeout = shared_timeout
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self._stats = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    # -----------------------------
+    # CONFIGURATION
+    # -----------------------------
+
+    def configure(self, maxsize=None, precision=None, shared_alias=None, shared_timeout=None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if precision is not None:
+                self.precision = precision
+            if shared_timeout is not None:
+                self.shared_timeout = shared_timeout
+            self.shared_alias = shared_alias
+            self._entries.clear()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 or self.shared_alias is not None
+
+    # -----------------------------
+    # KEYS
+    # -----------------------------
+
+    def normalize(self, values) -> tuple:
+        """
+        Cache key features for raw 0–100 values: the exact values, or the
+        values rounded to precision when rounding is enabled. Predictions
+        are computed on this vector so every request sharing a key gets
+        the same answer
+        """
+        if self.precision is None:
+            return tuple(float(value) for value in values)
+        return tuple(round(float(value), self.precision) for value in values)
+
+    def shared_key(self, version, features: tuple) -> str:
+        return "prediction:v{}:{}:{}".format(
+            RESULT_FORMAT, version, ":".join(map(str, features))
+        )
+
+    # -----------------------------
+    # LOOKUP
+    # -----------------------------
+
+    def get_or_compute(self, version, features: tuple, compute) -> dict:
+        """
+        Returns the cached result for (version, features), calling
+        compute(features) on a miss and storing its result in both tiers
+        """
+        version = version or RULES_VERSION
+        key = (version, features)
+
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._stats["local_hits"] += 1
+                return dict(result)
+
+        shared = caches[self.shared_alias] if self.shared_alias else None
+
+        result = shared.get(self.shared_key(version, features)) if shared else None
+        if result is not None:
+            self._count("shared_hits")
+        else:
+            self._count("misses")
+            result = compute(features)
+            if shared:
+                shared.set(self.shared_key(version, features), result, self.shared_timeout)
+
+        self._store(key, result)
+        return dict(result)
+
+    def _store(self, key, result):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            # skip results computed against a model that was swapped meanwhile
+            if key[0] != self._version:
+                return
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    # -----------------------------
+    # MAINTENANCE / METRICS
+    # -----------------------------
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters for this process only (not shared between
+        workers, even when the shared tier is enabled)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+            version = self._version
+
+        lookups = sum(stats.values())
+        hits = stats["local_hits"] + stats["shared_hits"]
+
+        return {
+            **stats,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "local_size": size,
+            "local_maxsize": self.maxsize,
+            "shared_alias": self.shared_alias,
+            "model_version": version,
+        }
@@ -0,0 +1,138 @@
+"""
+model.py
+
+Inference wrapper around a trained gradient-boosted booster.
+
+predictor.py expects model.predict(features) to return one
+(risk_score, risk_level, grade) row per input. Standard boosters only
+regress a score, so RiskModel maps the score to a level and the marks
+feature to a grade with the same thresholds as the rule engine, and
+predict_proba turns the score into LOW / MEDIUM / HIGH probabilities
+with a logistic scale calibrated on the training holdout.
+
+Only the booster's native text format is pickled: loading parses that
+text instead of unpickling a full Python estimator, and nothing from the
+training run (datasets, callbacks) is kept in memory.
+"""
+
+import numpy as np
+
+from apps.analytics.services import (
+    RISK_PROBABILITY_SCALE,
+    determine_risk_levels,
+    predict_grades,
+    risk_level_probabilities
+)
+
+from .preprocessing import FEATURE_FIELDS
+
+
+BACKENDS = ("lightgbm", "xgboost")
+
+
+def load_booster(backend: str, booster_text: str):
+    """
+    Rebuilds a native booster from its text export
+    """
+    if backend == "lightgbm":
+        import lightgbm
+
+        return lightgbm.Booster(model_str=booster_text)
+
+    if backend == "xgboost":
+        import xgboost
+
+        booster = xgboost.Booster()
+        booster.load_model(bytearray(booster_text.encode()))
+        return booster
+
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def dump_booster(backend: str, booster) -> str:
+    if backend == "lightgbm":
+        return booster.model_to_string()
+    if backend == "xgboost":
+        return booster.save_raw(raw_format="json").decode()
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+class RiskModel:
+    """
+    - backend: "lightgbm" or "xgboost"
+    - booster: trained native booster (regresses risk score 0–100)
+    - version: artifact version, picked up by ModelRegistry
+    - metadata: training parameters, data fingerprint and metrics
+    - calibration_scale: logistic scale for predict_proba
+      (RISK_PROBABILITY_SCALE when not calibrated)
+    """
+
+    feature_fields = FEATURE_FIELDS
+
+    def __init__(self, backend, booster, version=None, metadata=None, n_jobs=1,
+                 calibration_scale=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        self.backend = backend
+        self.booster = booster
+        self.version = version
+        self.metadata = metadata or {}
+        self.n_jobs = n_jobs
+        self.calibration_scale = calibration_scale
+
+    # -----------------------------
+    # PICKLING
+    # -----------------------------
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["booster"] = dump_booster(self.backend, self.booster)
+        return state
+
+    def __setstate__(self, state):
+        state["booster"] = load_booster(state["backend"], state["booster"])
+        # artifacts pickled before calibration existed
+        state.setdefault("calibration_scale", None)
+        self.__dict__.update(state)
+
+    # -----------------------------
+    # INFERENCE
+    # -----------------------------
+
+    def predict_scores(self, features) -> np.ndarray:
+        """
+        Raw risk scores for a (n_rows, 3) normalized feature matrix
+        """
+        features = np.asarray(features, dtype=np.float32).reshape(-1, len(FEATURE_FIELDS))
+
+        if self.backend == "lightgbm":
+            scores = self.booster.predict(features, num_threads=self.n_jobs)
+        else:
+            scores = self.booster.inplace_predict(features)
+
+        return np.clip(np.asarray(scores, dtype=float), 0, 100)
+
+    def predict(self, features) -> np.ndarray:
+        """
+        Returns an object array of (risk_score, risk_level, grade) rows
+        """
+        features = np.asarray(features, dtype=float).reshape(-1, len(FEATURE_FIELDS))
+        scores = np.round(self.predict_scores(features), 2)
+
+        rows = np.empty((len(features), 3), dtype=object)
+        rows[:, 0] = scores
+        rows[:, 1] = determine_risk_levels(scores)
+        rows[:, 2] = predict_grades(features[:, 1] * 100)
+        return rows
+
+    def predict_proba(self, features, scores=None) -> np.ndarray:
+        """
+        (n_rows, 3) LOW / MEDIUM / HIGH probabilities.
+        Pass already computed scores to skip the booster call.
+        """
+        if scores is None:
+            scores = self.predict_scores(features)
+        return risk_level_probabilities(
+            scores, self.calibration_scale or RISK_PROBABILITY_SCALE
+        )
@@ -7,13 +7,26 @@ to a rule-based predictor for demo and testing.
 """
 
 import os
-import joblib
 import numpy as np
 
+from apps.analytics.services import (
+    RISK_LEVELS,
+    RISK_PROBABILITY_SCALE,
+    evaluate_risk,
+    risk_level_probabilities
+)
+from ssaes_backend.instrumentation import timed
+
+from .cache import RULES_VERSION, PredictionCache
 from .preprocessing import (
+    FEATURE_FIELDS,
     validate_input,
-    build_feature_vector
+    validate_batch_input,
+    normalize_features,
+    build_feature_vector,
+    build_feature_matrix
 )
+from .registry import ModelRegistry
 
 # -----------------------------
 # MODEL LOADING
@@ -22,17 +35,20 @@ from .preprocessing import (
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, "student_risk_model.pkl")
 
+# Loaded lazily on first prediction and hot-reloaded when the file changes.
+# Options are overridden from Django settings in PredictionsConfig.ready().
+registry = ModelRegistry(MODEL_PATH)
 
-def load_model():
-    """
-    Loads trained ML model if available
-    """
-    if os.path.exists(MODEL_PATH):
-        return joblib.load(MODEL_PATH)
-    return None
+# Single-prediction result cache, keyed on model version + features
+prediction_cache = PredictionCache()
 
 
-MODEL = load_model()
+def model_version(state) -> str:
+    """
+    Version recorded on predictions made with a registry state
+    ("rules" for the rule-based fallback)
+    """
+    return state.version or RULES_VERSION
 
 
 # -----------------------------
@@ -44,45 +60,56 @@ def rule_based_prediction(features: np.ndarray) -> dict:
     Simple fallback predictor (used if ML model not found)
     """
 
-    attendance, marks, assignment = features * 100
+    prediction = rule_based_prediction_batch(np.atleast_2d(features))
 
-    risk_score = (
-        (100 - attendance) * 0.3 +
-        (100 - marks) * 0.4 +
-        (100 - assignment) * 0.3
-    )
+    return {
+        key: values[0].item()
+        for key, values in prediction.items()
+    }
 
-    risk_score = round(min(max(risk_score, 0), 100), 2)
 
-    if risk_score >= 70:
-        risk_level = "HIGH"
-    elif risk_score >= 40:
-        risk_level = "MEDIUM"
-    else:
-        risk_level = "LOW"
-
-    if marks >= 85:
-        grade = "A"
-    elif marks >= 70:
-        grade = "B"
-    elif marks >= 55:
-        grade = "C"
-    elif marks >= 40:
-        grade = "D"
-    else:
-        grade = "F"
+def rule_based_prediction_batch(features: np.ndarray) -> dict:
+    """
+    Vectorized fallback predictor over a (n_rows, 3) feature matrix.
+    Returns column arrays instead of one dict per row.
+    """
+
+    scaled = features * 100
+
+    result = evaluate_risk(scaled[:, 0], scaled[:, 1], scaled[:, 2])
 
     return {
-        "predicted_risk_score": risk_score,
-        "predicted_risk_level": risk_level,
-        "predicted_grade": grade
+        "predicted_risk_score": result["risk_score"],
+        "predicted_risk_level": result["risk_level"],
+        "predicted_grade": result["predicted_grade"]
     }
 
 
+# -----------------------------
+# PROBABILITIES
+# -----------------------------
+
+def level_probabilities(model, features: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    (n_rows, 3) LOW / MEDIUM / HIGH probabilities for already computed
+    risk scores: the model's own predict_proba (handed the scores, so
+    the model is not called again), or the default logistic mapping for
+    the rule-based fallback
+    """
+
+    if hasattr(model, "predict_proba"):
+        probabilities = model.predict_proba(features, scores=np.asarray(scores, dtype=float))
+    else:
+        probabilities = risk_level_probabilities(scores, RISK_PROBABILITY_SCALE)
+
+    return np.round(probabilities, 4)
+
+
 # -----------------------------
 # MAIN PREDICTION FUNCTION
 # -----------------------------
 
+@timed("predict")
 def predict_student_outcome(data: dict) -> dict:
     """
     Main entry point for predictions
@@ -90,16 +117,221 @@ def predict_student_outcome(data: dict) -> dict:
 
     validate_input(data)
 
-    features = build_feature_vector(data)
-
-    if MODEL:
-        prediction = MODEL.predict([features])[0]
+    state = registry.get_state()
+    version = model_version(state)
 
+    if not prediction_cache.enabled:
         return {
+            **predict_features(state.model, build_feature_vector(data)),
+            "model_version": version
+        }
+
+    values = tuple(scored_features(data).values())
+
+    return prediction_cache.get_or_compute(
+        version,
+        values,
+        lambda features: {
+            **predict_features(state.model, normalize_features(*features)),
+            "model_version": version
+        }
+    )
+
+
+def scored_features(data: dict) -> dict:
+    """
+    The feature values predict_student_outcome() actually scores: the
+    exact input, or rounded when the cache is enabled with a precision.
+    Saved predictions store these, so a row always matches its result.
+    """
+    values = [data[field] for field in FEATURE_FIELDS]
+    if prediction_cache.enabled:
+        values = prediction_cache.normalize(values)
+    return dict(zip(FEATURE_FIELDS, values))
+
+
+def predict_features(model, features: np.ndarray) -> dict:
+    """
+    Scores one normalized feature vector with the given model
+    (or the rule-based fallback when model is None)
+    """
+
+    if model:
+        prediction = model.predict([features])[0]
+
+        result = {
             "predicted_risk_score": round(float(prediction[0]), 2),
             "predicted_risk_level": prediction[1],
             "predicted_grade": prediction[2]
         }
+    else:
+        # fallback logic
+        result = rule_based_prediction(features)
 
-    # fallback logic
-    return rule_based_prediction(features)
+    # probability of the HIGH level, like predict_feature_matrix's column
+    probabilities = level_probabilities(
+        model, np.atleast_2d(features), [result["predicted_risk_score"]]
+    )
+
+    return {**result, "probability": float(probabilities[0, -1])}
+
+
+# -----------------------------
+# BATCH PREDICTION
+# -----------------------------
+
+@timed("inference")
+def predict_feature_matrix(features: np.ndarray, state=None) -> dict:
+    """
+    Scores a whole feature matrix with a single model
+    (or vectorized rule-based) call.
+    Returns column arrays keyed like predict_student_outcome
+    ("probabilities" is the (n_rows, 3) LOW / MEDIUM / HIGH matrix),
+    plus the scalar model_version that produced them.
+    """
+
+    state = state or registry.get_state()
+
+    if state.model:
+        prediction = np.asarray(state.model.predict(features), dtype=object)
+
+        columns = {
+            "predicted_risk_score": np.round(
+                prediction[:, 0].astype(float), 2
+            ),
+            "predicted_risk_level": prediction[:, 1].astype(str),
+            "predicted_grade": prediction[:, 2].astype(str)
+        }
+    else:
+        columns = rule_based_prediction_batch(features)
+
+    probabilities = level_probabilities(
+        state.model, features, columns["predicted_risk_score"]
+    )
+
+    return {
+        **columns,
+        "probabilities": probabilities,
+        "probability": probabilities[:, -1],
+        "model_version": model_version(state)
+    }
+
+
+def predict_batch(rows: list) -> list:
+    """
+    Batch entry point for predictions.
+    Validates all rows, builds one 2-D feature matrix and
+    returns one result dict per input row (in order).
+    """
+
+    if not rows:
+        return []
+
+    validate_batch_input(rows)
+
+    columns = predict_feature_matrix(build_feature_matrix(rows))
+
+    scores = columns["predicted_risk_score"].tolist()
+    levels = columns["predicted_risk_level"].tolist()
+    grades = columns["predicted_grade"].tolist()
+    probabilities = columns["probability"].tolist()
+    version = columns["model_version"]
+
+    return [
+        {
+            "predicted_risk_score": score,
+            "predicted_risk_level": level,
+            "predicted_grade": grade,
+            "probability": probability,
+            "model_version": version
+        }
+        for score, level, grade, probability in zip(scores, levels, grades, probabilities)
+    ]
+
+
+def predict_proba(rows: list) -> dict:
+    """
+    Batched class probabilities for ranking many students at once.
+    Returns {"levels", "probabilities" ((n_rows, 3) array), "model_version"}
+    from a single model call.
+    """
+
+    if not rows:
+        return {
+            "levels": list(RISK_LEVELS),
+            "probabilities": np.empty((0, len(RISK_LEVELS))),
+            "model_version": model_version(registry.get_state())
+        }
+
+    validate_batch_input(rows)
+
+    columns = predict_feature_matrix(build_feature_matrix(rows))
+
+    return {
+        "levels": list(RISK_LEVELS),
+        "probabilities": columns["probabilities"],
+        "model_version": columns["model_version"]
+    }
+
+
+# -----------------------------
+# WHAT-IF SWEEP
+# -----------------------------
+
+def build_sweep_grid(axes: dict) -> tuple:
+    """
+    Builds the scenario grid for a sweep.
+
+    axes maps each feature field to (start, stop, steps).
+    Returns (axis values per field, (n_points, 3) raw feature matrix)
+    with points in C order (last field varies fastest).
+    """
+
+    values = {
+        field: np.linspace(*axes[field][:2], int(axes[field][2]))
+        for field in FEATURE_FIELDS
+    }
+
+    grid = np.meshgrid(*(values[field] for field in FEATURE_FIELDS), indexing="ij")
+    matrix = np.stack([axis.ravel() for axis in grid], axis=1)
+
+    return values, matrix
+
+
+def encode_labels(labels: np.ndarray) -> dict:
+    """
+    Dictionary-encodes a label column as {"labels": [...], "codes": [...]}
+    """
+
+    unique, codes = np.unique(labels, return_inverse=True)
+
+    return {
+        "labels": unique.tolist(),
+        "codes": codes.astype(np.int8).tolist()
+    }
+
+
+def predict_sweep(axes: dict) -> dict:
+    """
+    Evaluates every scenario in the grid with one vectorized call and
+    returns a columnar risk surface (one flat list per output)
+    """
+
+    values, matrix = build_sweep_grid(axes)
+    columns = predict_feature_matrix(matrix / 100)
+
+    return {
+        "model_version": columns["model_version"],
+        "fields": list(FEATURE_FIELDS),
+        "shape": [len(values[field]) for field in FEATURE_FIELDS],
+        "axes": {
+            field: np.round(axis, 2).tolist()
+            for field, axis in values.items()
+        },
+        "predicted_risk_score": np.round(
+            columns["predicted_risk_score"].astype(float), 2
+        ).tolist(),
+        "predicted_risk_level": encode_labels(columns["predicted_risk_level"]),
+        "predicted_grade": encode_labels(columns["predicted_grade"]),
+        "probability": columns["probability"].tolist()
+    }
@@ -6,9 +6,18 @@ This module is independent of Django ORM to allow reuse
 in training scripts, batch jobs, and APIs.
 """
 
+import numbers
+
 import numpy as np
 
 
+FEATURE_FIELDS = (
+    "attendance_percentage",
+    "average_marks",
+    "assignment_completion_rate",
+)
+
+
 # -----------------------------
 # FEATURE NORMALIZATION
 # -----------------------------
@@ -58,10 +67,36 @@ def build_feature_vector(data: dict):
     )
 
 
+def build_feature_matrix(rows: list) -> np.ndarray:
+    """
+    Converts a list of raw input dictionaries into a 2-D
+    ML-ready feature matrix of shape (n_rows, 3)
+    """
+
+    matrix = np.array(
+        [[row[field] for field in FEATURE_FIELDS] for row in rows],
+        dtype=float
+    ).reshape(-1, len(FEATURE_FIELDS))
+
+    return matrix / 100
+
+
 # -----------------------------
 # INPUT VALIDATION
 # -----------------------------
 
+def check_feature_value(field, value, prefix=""):
+    """
+    A feature must be a real number (not a bool or string) in 0–100
+    """
+
+    if isinstance(value, bool) or not isinstance(value, numbers.Real):
+        raise ValueError(f"{prefix}{field} must be a number")
+
+    if not (0 <= value <= 100):
+        raise ValueError(f"{prefix}{field} must be between 0 and 100")
+
+
 def validate_input(data: dict):
     """
     Validates and cleans incoming prediction data
@@ -77,11 +112,40 @@ def validate_input(data: dict):
         if field not in data:
             raise ValueError(f"Missing required field: {field}")
 
-        value = data[field]
-        if not (0 <= value <= 100):
-            raise ValueError(
-                f"{field} must be between 0 and 100"
-            )
+        check_feature_value(field, data[field])
+
+    return True
+
+
+def validate_batch_input(rows: list):
+    """
+    Validates a batch of prediction rows in one pass.
+    Errors are reported with the offending row index.
+    """
+
+    for index, row in enumerate(rows):
+        for field in FEATURE_FIELDS:
+            if field not in row:
+                raise ValueError(
+                    f"Row {index}: missing required field: {field}"
+                )
+
+            value = row[field]
+            if isinstance(value, bool) or not isinstance(value, numbers.Real):
+                raise ValueError(f"Row {index}: {field} must be a number")
+
+    values = np.array(
+        [[row[field] for field in FEATURE_FIELDS] for row in rows],
+        dtype=float
+    ).reshape(-1, len(FEATURE_FIELDS))
+
+    # NaN compares False both ways, so it needs its own check
+    out_of_range = ~np.isfinite(values) | (values < 0) | (values > 100)
+    if out_of_range.any():
+        index, column = np.argwhere(out_of_range)[0]
+        raise ValueError(
+            f"Row {index}: {FEATURE_FIELDS[column]} must be between 0 and 100"
+        )
 
     return True
 # -----------------------------
@@ -0,0 +1,153 @@
+"""
+registry.py
+
+Lazy, thread-safe holder for the trained ML model.
+
+The model file is only read on first use, so management commands and
+worker boot stay fast. Each lookup (at most once per check interval)
+compares the file's mtime with the loaded copy and atomically swaps in
+a retrained model without restarting the process.
+
+A file that fails to load (e.g. half-written during a deploy) is logged
+and skipped: the previously loaded model keeps serving, and the file is
+tried again once its mtime changes.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+import joblib
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+LoadedModel = namedtuple("LoadedModel", ["model", "mtime", "version"])
+
+NO_MODEL = LoadedModel(model=None, mtime=None, version=None)
+
+
+class ModelRegistry:
+    """
+    Holds the currently active model for this process.
+
+    - path: model file (joblib pickle)
+    - check_interval: seconds between mtime checks on the hot path
+    - mmap_mode: passed to joblib.load (e.g. "r") so forked workers share
+      the model's numpy arrays through the page cache instead of each
+      holding a private copy
+    """
+
+    def __init__(self, path, check_interval=5.0, mmap_mode=None):
+        self.path = path
+        self.check_interval = check_interval
+        self.mmap_mode = mmap_mode
+
+        self._lock = threading.Lock()
+        self._state = None
+        self._last_check = 0.0
+        self._failed_mtime = None
+
+    # -----------------------------
+    # CONFIGURATION
+    # -----------------------------
+
+    def configure(self, path=None, check_interval=None, mmap_mode=None):
+        """
+        Updates loading options; the next lookup reloads the model
+        """
+        with self._lock:
+            if path is not None:
+                self.path = path
+            if check_interval is not None:
+                self.check_interval = check_interval
+            self.mmap_mode = mmap_mode
+            self._state = None
+            self._failed_mtime = None
+
+    # -----------------------------
+    # LOOKUP
+    # -----------------------------
+
+    def get(self):
+        """
+        Returns the active model, or None if no model file exists
+        """
+        return self.get_state().model
+
+    def get_state(self) -> LoadedModel:
+        """
+        Returns the (model, mtime, version) triple, loading or
+        hot-reloading it when needed
+        """
+        state = self._state
+        if state is not None and time.monotonic() - self._last_check < self.check_interval:
+            return state
+
+        with self._lock:
+            if self._state is None or time.monotonic() - self._last_check >= self.check_interval:
+                self._refresh()
+            return self._state
+
+    @property
+    def version(self):
+        return self.get_state().version
+
+    def reload(self) -> LoadedModel:
+        """
+        Forces an mtime check and reload regardless of the interval
+        """
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        """
+        Swaps in a new model if the file changed. Caller holds the lock.
+        """
+        self._last_check = time.monotonic()
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._state = NO_MODEL
+            return
+
+        if self._state is not None and self._state.mtime == mtime:
+            return
+        if mtime == self._failed_mtime:
+            return
+
+        try:
+            model = joblib.load(self.path, mmap_mode=self.mmap_mode)
+        except Exception:
+            logger.exception(
+                "Could not load model %s; keeping the previous model", self.path
+            )
+            self._failed_mtime = mtime
+            if self._state is None:
+                self._state = NO_MODEL
+            return
+
+        self._failed_mtime = None
+        version = getattr(model, "version", None) or f"mtime-{mtime}"
+
+        # single reference assignment -> readers see old or new, never a mix
+        self._state = LoadedModel(model=model, mtime=mtime, version=version)
+
+    # -----------------------------
+    # WARMUP
+    # -----------------------------
+
+    def warmup(self, n_features=3):
+        """
+        Loads the model and runs one dummy prediction so the first
+        real request doesn't pay for lazy initialisation
+        """
+        model = self.get()
+        if model is not None:
+            model.predict(np.full((1, n_features), 0.5))
+        return model
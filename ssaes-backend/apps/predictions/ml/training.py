@@ -0,0 +1,312 @@
+"""
+training.py
+
+Training pipeline for the risk model.
+
+- build_training_matrix(): streams (features, risk score) rows out of
+  StudentAnalytics (and optionally non-what-if StudentPrediction rows)
+  with .iterator() and fills preallocated numpy arrays chunk by chunk
+- train_booster(): trains a LightGBM or XGBoost regressor on all cores
+- export_artifact(): writes a versioned artifact directory
+
+    <output_dir>/<version>/model.pkl       RiskModel for ModelRegistry
+    <output_dir>/<version>/booster.txt     native LightGBM text model
+                          /booster.json    (or native XGBoost JSON)
+    <output_dir>/<version>/metadata.json   params, data hash, metrics
+
+The version is derived from the backend, parameters and a hash of the
+training data, so the same data and seed always yield the same version.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import tempfile
+from itertools import islice
+
+import joblib
+import numpy as np
+from django.utils import timezone
+
+from apps.analytics.models import StudentAnalytics
+from apps.analytics.services import determine_risk_levels
+from apps.predictions.models import StudentPrediction
+
+from .model import BACKENDS, RiskModel, dump_booster
+from .preprocessing import FEATURE_FIELDS
+
+
+CHUNK_SIZE = 5000
+
+# floor for the calibrated logistic scale, so a near-perfect holdout fit
+# doesn't collapse predict_proba into hard 0 / 1 steps
+MIN_CALIBRATION_SCALE = 0.5
+
+DEFAULT_PARAMS = {
+    "lightgbm": {
+        "objective": "regression",
+        "learning_rate": 0.05,
+        "num_leaves": 31,
+        "min_data_in_leaf": 20,
+        "deterministic": True,
+        "force_row_wise": True,
+        "verbosity": -1,
+    },
+    "xgboost": {
+        "objective": "reg:squarederror",
+        "eta": 0.05,
+        "max_depth": 6,
+        "tree_method": "hist",
+    },
+}
+
+
+# -----------------------------
+# TRAINING DATA
+# -----------------------------
+
+def training_querysets(include_predictions=False) -> list:
+    """
+    (queryset, label field) pairs that make up the training set
+    """
+    sources = [(StudentAnalytics.objects.order_by("pk"), "risk_score")]
+
+    if include_predictions:
+        sources.append((
+            StudentPrediction.objects.filter(is_what_if=False).order_by("pk"),
+            "predicted_risk_score"
+        ))
+
+    return sources
+
+
+def build_training_matrix(include_predictions=False, chunk_size=CHUNK_SIZE) -> tuple:
+    """
+    Returns (X, y): X is the (n_rows, 3) normalized feature matrix,
+    y the risk scores. Rows are streamed, never materialized as models.
+    """
+    sources = training_querysets(include_predictions)
+    total = sum(queryset.count() for queryset, _ in sources)
+
+    X = np.empty((total, len(FEATURE_FIELDS)), dtype=np.float32)
+    y = np.empty(total, dtype=np.float32)
+
+    filled = 0
+    for queryset, label in sources:
+        rows = queryset.values_list(*FEATURE_FIELDS, label).iterator(chunk_size=chunk_size)
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            # rows added since count() are dropped; deleted ones shrink the set
+            chunk = np.asarray(chunk[:total - filled], dtype=np.float32)
+            X[filled:filled + len(chunk)] = chunk[:, :-1] / 100
+            y[filled:filled + len(chunk)] = chunk[:, -1]
+            filled += len(chunk)
+
+    return X[:filled], y[:filled]
+
+
+def fingerprint(X: np.ndarray, y: np.ndarray) -> str:
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()
+
+
+def split_holdout(n_rows: int, holdout: float, seed: int) -> tuple:
+    """
+    Deterministic train / holdout index split
+    """
+    order = np.random.default_rng(seed).permutation(n_rows)
+    n_holdout = int(n_rows * holdout)
+    return order[n_holdout:], order[:n_holdout]
+
+
+# -----------------------------
+# TRAINING
+# -----------------------------
+
+def resolve_params(backend, params=None, n_jobs=-1, seed=0) -> dict:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    resolved = {**DEFAULT_PARAMS[backend], **(params or {})}
+    threads = n_jobs if n_jobs > 0 else os.cpu_count() or 1
+
+    if backend == "lightgbm":
+        resolved.update(num_threads=threads, seed=seed)
+    else:
+        resolved.update(nthread=threads, seed=seed)
+
+    return resolved
+
+
+def train_booster(backend, X, y, params, rounds):
+    """
+    Trains a native booster with the library's own training API
+    """
+    if backend == "lightgbm":
+        import lightgbm
+
+        return lightgbm.train(params, lightgbm.Dataset(X, label=y), num_boost_round=rounds)
+
+    import xgboost
+
+    return xgboost.train(params, xgboost.DMatrix(X, label=y), num_boost_round=rounds)
+
+
+def evaluate(model: RiskModel, X, y) -> dict:
+    if not len(X):
+        return {}
+
+    scores = model.predict_scores(X)
+    errors = scores - y
+
+    return {
+        "rows": int(len(X)),
+        "mae": round(float(np.abs(errors).mean()), 4),
+        "rmse": round(float(np.sqrt((errors ** 2).mean())), 4),
+        "risk_level_accuracy": round(
+            float((determine_risk_levels(scores) == determine_risk_levels(y)).mean()), 4
+        ),
+    }
+
+
+def calibration_scale(errors) -> float:
+    """
+    Logistic scale matching the spread of the score errors
+    (a logistic with scale s has standard deviation s * pi / sqrt(3))
+    """
+    spread = float(np.std(errors)) if len(errors) else 0.0
+    return round(max(spread * np.sqrt(3) / np.pi, MIN_CALIBRATION_SCALE), 4)
+
+
+def train_risk_model(
+    X, y, backend="lightgbm", rounds=200, params=None,
+    n_jobs=-1, seed=0, holdout=0.2
+) -> RiskModel:
+    """
+    Trains, evaluates on a holdout split and refits on all rows.
+    Returns a versioned RiskModel with its metadata attached.
+    """
+    resolved = resolve_params(backend, params, n_jobs, seed)
+    train_idx, holdout_idx = split_holdout(len(X), holdout, seed)
+
+    metrics = {}
+    scale = None
+    if len(holdout_idx):
+        candidate = RiskModel(
+            backend, train_booster(backend, X[train_idx], y[train_idx], resolved, rounds),
+            n_jobs=n_jobs
+        )
+        metrics = evaluate(candidate, X[holdout_idx], y[holdout_idx])
+        scale = calibration_scale(
+            candidate.predict_scores(X[holdout_idx]) - y[holdout_idx]
+        )
+
+    booster = train_booster(backend, X, y, resolved, rounds)
+
+    data_hash = fingerprint(X, y)
+    # thread count doesn't change a deterministic model, keep it out of the version
+    versioned = {k: v for k, v in resolved.items() if k not in ("num_threads", "nthread")}
+    version_key = json.dumps(
+        {"backend": backend, "rounds": rounds, "params": versioned, "data": data_hash},
+        sort_keys=True
+    )
+    version = f"{backend}-{hashlib.sha256(version_key.encode()).hexdigest()[:12]}"
+
+    metadata = {
+        "version": version,
+        "backend": backend,
+        "feature_fields": list(FEATURE_FIELDS),
+        "rounds": rounds,
+        "params": resolved,
+        "seed": seed,
+        "holdout": holdout,
+        "rows": int(len(X)),
+        "data_sha256": data_hash,
+        "metrics": metrics,
+        "calibration_scale": scale,
+        "trained_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "library_version": _library_version(backend),
+    }
+
+    return RiskModel(
+        backend, booster, version=version, metadata=metadata, n_jobs=n_jobs,
+        calibration_scale=scale
+    )
+
+
+def _library_version(backend):
+    module = __import__(backend)
+    return getattr(module, "__version__", None)
+
+
+# -----------------------------
+# EXPORT
+# -----------------------------
+
+def _atomic_write(path, write):
+    """
+    Writes through a temp file + os.replace so readers (the registry's
+    mtime check) never see a half-written file
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def export_artifact(model: RiskModel, output_dir: str) -> str:
+    """
+    Writes model.pkl, the native booster export and metadata.json to
+    <output_dir>/<version>/. Returns that directory.
+    """
+    artifact_dir = os.path.join(output_dir, model.version)
+    os.makedirs(artifact_dir, exist_ok=True)
+
+    booster_name = "booster.txt" if model.backend == "lightgbm" else "booster.json"
+    booster_text = dump_booster(model.backend, model.booster)
+
+    def write_text(text):
+        def write(path):
+            with open(path, "w") as f:
+                f.write(text)
+        return write
+
+    _atomic_write(os.path.join(artifact_dir, booster_name), write_text(booster_text))
+    _atomic_write(
+        os.path.join(artifact_dir, "metadata.json"),
+        write_text(json.dumps(model.metadata, indent=2, sort_keys=True))
+    )
+    _atomic_write(
+        os.path.join(artifact_dir, "model.pkl"),
+        lambda path: joblib.dump(model, path)
+    )
+
+    return artifact_dir
+
+
+def activate_artifact(artifact_dir: str, model_path: str):
+    """
+    Atomically installs an artifact's model.pkl as the served model;
+    running processes pick it up on their next mtime check
+    """
+    with open(os.path.join(artifact_dir, "model.pkl"), "rb") as source:
+        payload = source.read()
+
+    def write(path):
+        with open(path, "wb") as f:
+            f.write(payload)
+
+    _atomic_write(model_path, write)
@@ -39,6 +39,23 @@ class StudentPrediction(models.Model):
         help_text="Predicted final grade (A, B, C, etc.)"
     )
 
+    # P(HIGH) from the calibrated level probabilities;
+    # null for rows recorded before probabilities were stored
+    probability = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Predicted probability of HIGH risk (0–1)"
+    )
+
+    # Model (or "rules" fallback) that produced the outputs above;
+    # blank for rows recorded before versions were tracked
+    model_version = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Version of the model that produced this prediction"
+    )
+
     # What-if analysis flag
     is_what_if = models.BooleanField(
         default=False,
@@ -47,6 +64,16 @@ class StudentPrediction(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["student", "-created_at"],
+                name="prediction_student_created_idx"
+            ),
+            models.Index(fields=["-created_at", "-id"], name="prediction_created_idx"),
+            models.Index(fields=["model_version", "id"], name="prediction_model_version_idx"),
+        ]
+
     def __str__(self):
         tag = "What-If" if self.is_what_if else "Actual"
         return f"{tag} Prediction – {self.student}"
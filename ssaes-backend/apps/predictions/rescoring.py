@@ -0,0 +1,127 @@
+"""
+predictions/rescoring.py
+
+Rescoring of stored predictions after a model change.
+
+Every StudentPrediction records the model_version that produced it, so
+rows scored by any other version than the live model are stale. They
+are rescored in pk-ordered chunks: one vectorized model call per chunk,
+written back with bulk_update. Each chunk only selects rows that are
+still stale, so an interrupted run resumes where it stopped when it is
+started again.
+
+Rows carried over from the pre-0003 schema are tagged LEGACY_VERSION:
+their feature columns were never recorded, so they keep their original
+outputs and are never rescored.
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count
+
+from .ml.predictor import model_version, predict_feature_matrix, registry
+from .ml.preprocessing import FEATURE_FIELDS
+from .models import StudentPrediction
+
+# model_version of rows that predate version tracking (migration 0003)
+LEGACY_VERSION = "legacy"
+
+CHUNK_SIZE = 5000
+UPDATE_BATCH_SIZE = 1000
+
+RESCORED_FIELDS = (
+    "predicted_risk_score",
+    "predicted_risk_level",
+    "predicted_grade",
+    "probability",
+    "model_version",
+)
+
+
+def stale_predictions(version: str):
+    return StudentPrediction.objects.exclude(
+        model_version__in=(version, LEGACY_VERSION)
+    )
+
+
+def version_counts() -> dict:
+    """
+    {model_version: number of stored predictions}
+    """
+    rows = StudentPrediction.objects.values("model_version").annotate(
+        count=Count("id")
+    ).order_by()
+    return {row["model_version"]: row["count"] for row in rows}
+
+
+def rescore_predictions(queryset=None, state=None) -> int:
+    """
+    Rescores the stale rows of `queryset` (default: every prediction)
+    with the current model in a single model call.
+    Returns the number of rows updated.
+    """
+    state = state or registry.get_state()
+    queryset = StudentPrediction.objects.all() if queryset is None else queryset
+
+    rows = list(
+        queryset.exclude(model_version__in=(model_version(state), LEGACY_VERSION))
+        .values_list("pk", *FEATURE_FIELDS)
+        .order_by()
+    )
+    if not rows:
+        return 0
+
+    pks, *features = zip(*rows)
+    columns = predict_feature_matrix(np.array(features, dtype=float).T / 100, state)
+
+    with transaction.atomic():
+        StudentPrediction.objects.bulk_update(
+            [
+                StudentPrediction(
+                    pk=pk,
+                    predicted_risk_score=score,
+                    predicted_risk_level=level,
+                    predicted_grade=grade,
+                    probability=probability,
+                    model_version=columns["model_version"],
+                )
+                for pk, score, level, grade, probability in zip(
+                    pks,
+                    columns["predicted_risk_score"].tolist(),
+                    columns["predicted_risk_level"].tolist(),
+                    columns["predicted_grade"].tolist(),
+                    columns["probability"].tolist(),
+                )
+            ],
+            RESCORED_FIELDS,
+            batch_size=UPDATE_BATCH_SIZE
+        )
+
+    return len(rows)
+
+
+def rescore_stale_predictions(chunk_size=CHUNK_SIZE, log=None) -> dict:
+    """
+    Rescores every stale prediction inline, chunk by chunk (keyset over
+    pk), pinned to the model that was live when the run started
+    """
+    log = log or (lambda message: None)
+    state = registry.get_state()
+    version = model_version(state)
+
+    stale = stale_predictions(version).order_by("pk").values_list("pk", flat=True)
+    rescored = 0
+    last_pk = 0
+
+    while True:
+        pks = list(stale.filter(pk__gt=last_pk)[:chunk_size])
+        if not pks:
+            break
+
+        rescored += rescore_predictions(
+            StudentPrediction.objects.filter(pk__range=(pks[0], pks[-1])), state
+        )
+        last_pk = pks[-1]
+        log(f"Rescored {rescored} predictions (up to id {last_pk})")
+
+    return {"model_version": version, "rescored": rescored}
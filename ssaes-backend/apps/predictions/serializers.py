@@ -1,6 +1,12 @@
 from rest_framework import serializers
+
+from .ml.preprocessing import FEATURE_FIELDS
 from .models import StudentPrediction
 
+MAX_SWEEP_STEPS = 101
+MAX_SWEEP_POINTS = 100_000
+MAX_SAVED_SCENARIOS = 100
+
 
 class StudentPredictionSerializer(serializers.ModelSerializer):
     """
@@ -24,6 +30,8 @@ class StudentPredictionSerializer(serializers.ModelSerializer):
             "predicted_risk_score",
             "predicted_risk_level",
             "predicted_grade",
+            "probability",
+            "model_version",
             "is_what_if",
             "created_at",
         ]
@@ -33,13 +41,69 @@ class StudentPredictionSerializer(serializers.ModelSerializer):
             "predicted_risk_score",
             "predicted_risk_level",
             "predicted_grade",
+            "probability",
+            "model_version",
             "created_at",
         ]
+
+
 class WhatIfScenarioSerializer(serializers.Serializer):
     """
     Serializer for What-If Scenario inputs
     """
-    attendance_percentage = serializers.FloatField()
-    average_marks = serializers.FloatField()
-    assignment_completion_rate = serializers.FloatField()
+    attendance_percentage = serializers.FloatField(min_value=0, max_value=100)
+    average_marks = serializers.FloatField(min_value=0, max_value=100)
+    assignment_completion_rate = serializers.FloatField(min_value=0, max_value=100)
+
+
+class SweepRangeSerializer(serializers.Serializer):
+    """
+    One sweep axis: `steps` evenly spaced values from start to stop.
+    steps=1 pins the feature at `start`.
+    """
+    start = serializers.FloatField(min_value=0, max_value=100)
+    stop = serializers.FloatField(min_value=0, max_value=100)
+    steps = serializers.IntegerField(min_value=1, max_value=MAX_SWEEP_STEPS)
+
+    def validate(self, attrs):
+        if attrs["steps"] == 1:
+            attrs["stop"] = attrs["start"]
+        return attrs
+
+
+class WhatIfSweepSerializer(serializers.Serializer):
+    """
+    Sweep request: one range per feature
+    """
+    attendance_percentage = SweepRangeSerializer()
+    average_marks = SweepRangeSerializer()
+    assignment_completion_rate = SweepRangeSerializer()
+
+    def validate(self, attrs):
+        points = 1
+        for field in FEATURE_FIELDS:
+            points *= attrs[field]["steps"]
+
+        if points > MAX_SWEEP_POINTS:
+            raise serializers.ValidationError(
+                f"A sweep may contain at most {MAX_SWEEP_POINTS} points (got {points})"
+            )
+        return attrs
+
+    def get_axes(self) -> dict:
+        return {
+            field: (axis["start"], axis["stop"], axis["steps"])
+            for field, axis in self.validated_data.items()
+        }
+
+
+class WhatIfSaveSerializer(serializers.Serializer):
+    """
+    Scenarios the user chose to keep from a sweep
+    """
+    scenarios = serializers.ListField(
+        child=WhatIfScenarioSerializer(),
+        min_length=1,
+        max_length=MAX_SAVED_SCENARIOS
+    )
     
\ No newline at end of file
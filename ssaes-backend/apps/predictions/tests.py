@@ -1,11 +1,64 @@
-from django.test import TestCase
+import io
+import json
+import logging
+import os
+import tempfile
+
+import joblib
+import numpy as np
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from .ml.predictor import (
+    predict_batch,
+    predict_feature_matrix,
+    predict_proba,
+    predict_student_outcome,
+    prediction_cache,
+    registry
+)
+from apps.analytics.models import StudentAnalytics
+from .ml.cache import PredictionCache
+from .ml.model import RiskModel
+from .ml.training import build_training_matrix, train_risk_model
+from .ml.registry import LoadedModel, ModelRegistry
+from .models import StudentPrediction
+from .rescoring import LEGACY_VERSION, rescore_stale_predictions, version_counts
+from ssaes_backend.instrumentation import metrics
+
 User = get_user_model()
 
 
+class ConstantModel:
+    """
+    Picklable stand-in for a trained model
+    """
+
+    def __init__(self, score):
+        self.score = score
+
+    def predict(self, features):
+        return [(self.score, "HIGH", "F") for _ in features]
+
+
+class ProbaModel(ConstantModel):
+    """
+    Records the scores handed to predict_proba
+    """
+
+    def __init__(self, score):
+        super().__init__(score)
+        self.proba_calls = []
+
+    def predict_proba(self, features, scores=None):
+        self.proba_calls.append(scores)
+        return np.tile([0.1, 0.2, 0.7], (len(features), 1))
+
+
 class PredictionsAPITestCase(TestCase):
     """
     Test ML prediction API endpoints
@@ -52,6 +105,58 @@ class PredictionsAPITestCase(TestCase):
         for key in keys:
             self.assertIn(key, response.data)
 
+        # no model file in tests -> rule-based fallback
+        self.assertEqual(response.data["model_version"], "rules")
+
+        self.assertEqual(
+            StudentPrediction.objects.get().probability, response.data["probability"]
+        )
+
+    def test_cached_predictions_use_exact_features(self):
+        """
+        The cache keys on exact features by default, so inputs just
+        below a threshold keep their grade and rows store the input
+        """
+        for marks in (40.0, 39.95):
+            data = {**self.valid_data, "average_marks": marks}
+            response = self.client.post("/api/predictions/predict/", data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        first, second = StudentPrediction.objects.order_by("id")
+        self.assertEqual((first.average_marks, first.predicted_grade), (40.0, "D"))
+        self.assertEqual((second.average_marks, second.predicted_grade), (39.95, "F"))
+
+    def test_rounding_is_opt_in(self):
+        """
+        With a precision, rows store the rounded features the (cached)
+        result was computed on
+        """
+        previous = prediction_cache.precision
+        prediction_cache.precision = 1
+        self.addCleanup(setattr, prediction_cache, "precision", previous)
+
+        for attendance in (80.04, 79.96):
+            data = {**self.valid_data, "attendance_percentage": attendance}
+            response = self.client.post("/api/predictions/predict/", data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        first, second = StudentPrediction.objects.order_by("id")
+        self.assertEqual(first.attendance_percentage, 80.0)
+        self.assertEqual(second.attendance_percentage, 80.0)
+        self.assertEqual(first.predicted_risk_score, second.predicted_risk_score)
+
+    def test_what_if_prediction_is_not_saved(self):
+        """
+        What-if calls get the prediction back but create no row
+        """
+        data = {**self.valid_data, "is_what_if": True}
+        response = self.client.post("/api/predictions/predict/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_what_if"])
+        self.assertIn("predicted_risk_level", response.data)
+        self.assertFalse(StudentPrediction.objects.exists())
+
     def test_prediction_endpoint_invalid_data(self):
         """
         Should return 400 if required field is missing or out of range
@@ -62,3 +167,580 @@ class PredictionsAPITestCase(TestCase):
         response = self.client.post("/api/predictions/predict/", invalid_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("error", response.data)
+
+
+class BatchPredictionTestCase(TestCase):
+    """
+    Test vectorized batch scoring and the predict-batch endpoint
+    """
+
+    def setUp(self):
+        self.faculty = User.objects.create_user(
+            username="faculty",
+            password="testpass123",
+            role="FACULTY"
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f"student{i}",
+                password="testpass123",
+                role="STUDENT"
+            )
+            for i in range(3)
+        ]
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.faculty)
+
+        self.rows = [
+            {
+                "student": student.id,
+                "attendance_percentage": 30 + i * 30,
+                "average_marks": 35 + i * 25,
+                "assignment_completion_rate": 40 + i * 25,
+            }
+            for i, student in enumerate(self.students)
+        ]
+
+    def test_batch_matches_single_predictions(self):
+        batch = predict_batch(self.rows)
+        single = [predict_student_outcome(row) for row in self.rows]
+        self.assertEqual(batch, single)
+
+    def test_batch_endpoint_bulk_creates_predictions(self):
+        response = self.client.post(
+            "/api/predictions/predict-batch/",
+            {"rows": self.rows},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(StudentPrediction.objects.count(), 3)
+
+    def test_batch_endpoint_rejects_invalid_row(self):
+        rows = [dict(row) for row in self.rows]
+        rows[1]["average_marks"] = 120
+
+        response = self.client.post(
+            "/api/predictions/predict-batch/",
+            {"rows": rows},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Row 1", response.data["error"])
+        self.assertEqual(StudentPrediction.objects.count(), 0)
+
+    def test_batch_rejects_non_finite_and_non_numeric_values(self):
+        for value in (float("nan"), float("inf"), "50", True, None):
+            rows = [dict(row) for row in self.rows]
+            rows[2]["attendance_percentage"] = value
+
+            with self.assertRaisesRegex(ValueError, "Row 2: attendance_percentage"):
+                predict_batch(rows)
+
+            with self.assertRaises(ValueError):
+                predict_student_outcome(rows[2])
+
+    def test_batch_endpoint_requires_faculty_or_admin(self):
+        self.client.force_authenticate(user=self.students[0])
+        response = self.client.post(
+            "/api/predictions/predict-batch/",
+            {"rows": self.rows},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PredictProbaTestCase(TestCase):
+    """
+    Calibrated level probabilities from the batched predict_proba path
+    """
+
+    def setUp(self):
+        self.rows = [
+            {
+                "attendance_percentage": attendance,
+                "average_marks": attendance,
+                "assignment_completion_rate": attendance,
+            }
+            for attendance in range(0, 101, 5)
+        ]
+
+    def test_rows_are_distributions_ordered_by_risk(self):
+        result = predict_proba(self.rows)
+        probabilities = result["probabilities"]
+
+        self.assertEqual(result["levels"], ["LOW", "MEDIUM", "HIGH"])
+        self.assertEqual(probabilities.shape, (len(self.rows), 3))
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1, atol=1e-3)
+
+        # better metrics -> lower risk score -> lower P(HIGH)
+        self.assertTrue((np.diff(probabilities[:, 2]) <= 0).all())
+        self.assertGreater(probabilities[0, 2], 0.99)
+        self.assertGreater(probabilities[-1, 0], 0.99)
+
+    def test_single_and_batch_agree(self):
+        batch = predict_batch(self.rows)
+        proba = predict_proba(self.rows)["probabilities"]
+
+        for i, row in enumerate(self.rows):
+            single = predict_student_outcome(row)
+            self.assertEqual(single["probability"], batch[i]["probability"])
+            self.assertEqual(single["probability"], proba[i, 2])
+
+    def test_empty_batch(self):
+        self.assertEqual(predict_proba([])["probabilities"].shape, (0, 3))
+
+    def test_model_predict_proba_reuses_scores(self):
+        model = ProbaModel(70.0)
+        features = np.full((4, 3), 0.5)
+
+        columns = predict_feature_matrix(
+            features, LoadedModel(model=model, mtime=None, version="v1")
+        )
+
+        self.assertEqual(len(model.proba_calls), 1)
+        np.testing.assert_array_equal(model.proba_calls[0], [70.0] * 4)
+        np.testing.assert_array_equal(columns["probability"], [0.7] * 4)
+
+
+class ModelRegistryTestCase(TestCase):
+    """
+    Test lazy loading and hot reload of the model file
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "model.pkl")
+        self.registry = ModelRegistry(self.path, check_interval=0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_missing_file_returns_none(self):
+        self.assertIsNone(self.registry.get())
+        self.assertIsNone(self.registry.version)
+
+    def test_loads_lazily_and_hot_reloads(self):
+        joblib.dump(ConstantModel(10.0), self.path)
+        self.assertEqual(self.registry.get().score, 10.0)
+
+        joblib.dump(ConstantModel(20.0), self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(self.registry.get().score, 20.0)
+
+    def test_broken_file_keeps_previous_model(self):
+        joblib.dump(ConstantModel(10.0), self.path)
+        self.assertEqual(self.registry.get().score, 10.0)
+
+        with open(self.path, "wb") as f:
+            f.write(b"half-written")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        with self.assertLogs("apps.predictions.ml.registry", "ERROR"):
+            self.assertEqual(self.registry.get().score, 10.0)
+        # not retried until the file changes again
+        with self.assertNoLogs("apps.predictions.ml.registry", "ERROR"):
+            self.assertEqual(self.registry.get().score, 10.0)
+
+        joblib.dump(ConstantModel(20.0), self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+        self.assertEqual(self.registry.get().score, 20.0)
+
+    def test_warmup_runs_prediction(self):
+        joblib.dump(ConstantModel(5.0), self.path)
+        self.assertEqual(self.registry.warmup().score, 5.0)
+
+
+class PredictionCacheTestCase(TestCase):
+    """
+    Test the two-tier prediction cache
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.calls = []
+        self.cache = PredictionCache(maxsize=2, precision=1)
+
+    def compute(self, features):
+        self.calls.append(features)
+        return {"predicted_risk_score": sum(features)}
+
+    def test_rounded_features_share_an_entry(self):
+        first = self.cache.normalize([80.04, 75, 90])
+        second = self.cache.normalize([80.01, 75.0, 90.0])
+
+        self.cache.get_or_compute("v1", first, self.compute)
+        self.cache.get_or_compute("v1", second, self.compute)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.cache.stats()["local_hits"], 1)
+
+    def test_new_model_version_invalidates(self):
+        features = self.cache.normalize([50, 50, 50])
+
+        self.cache.get_or_compute("v1", features, self.compute)
+        self.cache.get_or_compute("v2", features, self.compute)
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.stats()["model_version"], "v2")
+
+    def test_lru_evicts_oldest_entry(self):
+        for value in (10, 20, 30):
+            self.cache.get_or_compute("v1", (value, 0.0, 0.0), self.compute)
+        self.cache.get_or_compute("v1", (10, 0.0, 0.0), self.compute)
+
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual(self.cache.stats()["local_size"], 2)
+
+    def test_shared_tier_serves_other_processes(self):
+        self.cache.configure(maxsize=0, shared_alias="default")
+        features = (60.0, 60.0, 60.0)
+
+        self.cache.get_or_compute("v1", features, self.compute)
+        self.cache.get_or_compute("v1", features, self.compute)
+
+        stats = self.cache.stats()
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(stats["shared_hits"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+
+class WhatIfSweepTestCase(TestCase):
+    """
+    Test the what-if sweep and save endpoints
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="sweeper", password="123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.sweep = {
+            "attendance_percentage": {"start": 0, "stop": 100, "steps": 21},
+            "average_marks": {"start": 0, "stop": 100, "steps": 21},
+            "assignment_completion_rate": {"start": 50, "stop": 50, "steps": 1},
+        }
+
+    def test_sweep_returns_columnar_surface_without_saving(self):
+        response = self.client.post("/api/predictions/what-if/sweep/", self.sweep, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["shape"], [21, 21, 1])
+        self.assertEqual(len(response.data["predicted_risk_score"]), 441)
+        self.assertEqual(len(response.data["predicted_risk_level"]["codes"]), 441)
+        self.assertFalse(StudentPrediction.objects.exists())
+
+    def test_sweep_matches_single_prediction(self):
+        response = self.client.post("/api/predictions/what-if/sweep/", self.sweep, format="json")
+
+        # grid point (attendance=30, marks=85, assignments=50)
+        index = 6 * 21 + 17
+        single = predict_student_outcome({
+            "attendance_percentage": 30,
+            "average_marks": 85,
+            "assignment_completion_rate": 50,
+        })
+        levels = response.data["predicted_risk_level"]
+
+        self.assertAlmostEqual(
+            response.data["predicted_risk_score"][index], single["predicted_risk_score"]
+        )
+        self.assertEqual(
+            levels["labels"][levels["codes"][index]], single["predicted_risk_level"]
+        )
+
+    def test_sweep_rejects_oversized_grid(self):
+        self.sweep["assignment_completion_rate"] = {"start": 0, "stop": 100, "steps": 101}
+        self.sweep["average_marks"]["steps"] = 101
+
+        response = self.client.post("/api/predictions/what-if/sweep/", self.sweep, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_save_persists_only_chosen_scenarios(self):
+        response = self.client.post(
+            "/api/predictions/what-if/save/",
+            {"scenarios": [
+                {"attendance_percentage": 90, "average_marks": 80, "assignment_completion_rate": 70},
+                {"attendance_percentage": 40, "average_marks": 30, "assignment_completion_rate": 20},
+            ]},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            StudentPrediction.objects.filter(student=self.user, is_what_if=True).count(), 2
+        )
+
+
+class TrainRiskModelTestCase(TestCase):
+    """
+    Test the training pipeline and exported artifacts
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = np.random.default_rng(0)
+
+        for i in range(80):
+            attendance, marks, assignments = rng.uniform(0, 100, 3).round(1)
+            StudentAnalytics.objects.create(
+                student=User.objects.create(username=f"t{i}"),
+                attendance_percentage=attendance,
+                average_marks=marks,
+                assignment_completion_rate=assignments,
+                risk_score=round(100 - (attendance + marks + assignments) / 3, 2),
+            )
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_training_matrix_is_normalized(self):
+        X, y = build_training_matrix(chunk_size=7)
+
+        self.assertEqual(X.shape, (80, 3))
+        self.assertEqual(len(y), 80)
+        self.assertTrue((X <= 1).all())
+
+    def test_command_exports_versioned_artifact(self):
+        call_command(
+            "train_risk_model", rounds=20, min_rows=10,
+            output_dir=self.tmpdir.name, n_jobs=2, stdout=io.StringIO()
+        )
+
+        (version,) = os.listdir(self.tmpdir.name)
+        artifact_dir = os.path.join(self.tmpdir.name, version)
+        self.assertEqual(
+            sorted(os.listdir(artifact_dir)), ["booster.txt", "metadata.json", "model.pkl"]
+        )
+
+        model = joblib.load(os.path.join(artifact_dir, "model.pkl"))
+        score, level, grade = model.predict([[0.9, 0.8, 0.95]])[0]
+
+        self.assertEqual(model.version, version)
+        self.assertLess(score, 40)
+        self.assertEqual((level, grade), ("LOW", "B"))
+
+    def test_same_data_and_seed_give_same_version(self):
+        X, y = build_training_matrix()
+
+        first = train_risk_model(X, y, rounds=10, seed=3)
+        second = train_risk_model(X, y, rounds=10, seed=3)
+
+        self.assertEqual(first.version, second.version)
+        np.testing.assert_allclose(first.predict_scores(X), second.predict_scores(X))
+
+    def test_probabilities_use_holdout_calibration(self):
+        X, y = build_training_matrix()
+        model = train_risk_model(X, y, rounds=10)
+
+        self.assertGreater(model.calibration_scale, 0)
+        self.assertEqual(model.metadata["calibration_scale"], model.calibration_scale)
+
+        probabilities = model.predict_proba(X)
+        self.assertEqual(probabilities.shape, (len(X), 3))
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1)
+
+    def test_xgboost_model_survives_pickling(self):
+        X, y = build_training_matrix()
+        model = train_risk_model(X, y, backend="xgboost", rounds=10, holdout=0)
+
+        path = os.path.join(self.tmpdir.name, "model.pkl")
+        joblib.dump(model, path)
+        loaded = joblib.load(path)
+
+        self.assertIsInstance(loaded, RiskModel)
+        np.testing.assert_allclose(loaded.predict_scores(X), model.predict_scores(X), rtol=1e-5)
+
+
+class RescoringTestCase(TestCase):
+    """
+    Rescoring of predictions made by an older model version
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        student = User.objects.create(username="rescored")
+        features = {
+            "attendance_percentage": 40,
+            "average_marks": 30,
+            "assignment_completion_rate": 50,
+        }
+        StudentPrediction.objects.bulk_create([
+            StudentPrediction(
+                student=student,
+                predicted_risk_score=0,
+                predicted_risk_level="LOW",
+                predicted_grade="A",
+                model_version=version,
+                **features
+            )
+            for version in ("", "lightgbm-0123456789ab", "lightgbm-0123456789ab", "rules")
+        ])
+        # carried over by migration 0002/0003 without real inputs
+        StudentPrediction.objects.create(
+            student=student,
+            attendance_percentage=0,
+            average_marks=0,
+            assignment_completion_rate=0,
+            predicted_risk_score=40,
+            predicted_risk_level="MEDIUM",
+            predicted_grade="B",
+            model_version=LEGACY_VERSION,
+        )
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.addCleanup(
+            registry.configure, path=registry.path, check_interval=registry.check_interval
+        )
+
+    def test_only_stale_rows_are_rescored(self):
+        result = rescore_stale_predictions(chunk_size=1)
+
+        self.assertEqual(result, {"model_version": "rules", "rescored": 3})
+        self.assertEqual(version_counts(), {"rules": 4, LEGACY_VERSION: 1})
+        # the row already scored by the rules kept its stored outputs
+        self.assertEqual(
+            StudentPrediction.objects.filter(predicted_risk_score=0).count(), 1
+        )
+
+        # a second run (or a resumed one) has nothing left to do
+        self.assertEqual(rescore_stale_predictions()["rescored"], 0)
+
+    def test_model_change_marks_rows_stale(self):
+        path = os.path.join(self.tmpdir.name, "model.pkl")
+        joblib.dump(ConstantModel(42.0), path)
+        registry.configure(path=path, check_interval=0)
+
+        result = rescore_stale_predictions()
+
+        self.assertEqual(result["rescored"], 4)
+        self.assertTrue(result["model_version"].startswith("mtime-"))
+        self.assertEqual(
+            set(StudentPrediction.objects.values_list("predicted_risk_score", flat=True)),
+            {42.0, 40.0}
+        )
+        # legacy rows keep their preserved outputs
+        self.assertEqual(
+            StudentPrediction.objects.get(model_version=LEGACY_VERSION).predicted_grade, "B"
+        )
+
+    def test_dry_run_reports_versions(self):
+        out = io.StringIO()
+        call_command("rescore_predictions", "--dry-run", stdout=out)
+
+        self.assertIn("lightgbm-0123456789ab", out.getvalue())
+        self.assertEqual(
+            StudentPrediction.objects.exclude(model_version__in=("rules", LEGACY_VERSION)).count(), 3
+        )
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True)
+class InstrumentationTestCase(TestCase):
+    """
+    Request instrumentation middleware, hot-path spans and /metrics
+    """
+
+    def setUp(self):
+        metrics.clear()
+        # keep the per-request log lines out of the test output
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+        self.user = User.objects.create(username="instrumented")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.payload = {
+            "attendance_percentage": 80,
+            "average_marks": 75,
+            "assignment_completion_rate": 90,
+        }
+
+    def test_server_timing_header(self):
+        response = self.client.post("/api/predictions/predict/", self.payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        entries = {entry.split(";")[0] for entry in response["Server-Timing"].split(", ")}
+        self.assertTrue({"db", "predict", "total"} <= entries)
+
+    def test_structured_log_line(self):
+        logging.disable(logging.NOTSET)
+        with self.assertLogs("ssaes.requests", level="INFO") as logs:
+            self.client.post("/api/predictions/predict/", self.payload, format="json")
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["route"], "api/predictions/predict/")
+        self.assertEqual(line["status"], 201)
+        self.assertGreaterEqual(line["db_queries"], 1)
+        self.assertIn("predict", line["spans_ms"])
+
+    def test_metrics_endpoint(self):
+        self.client.post("/api/predictions/predict/", self.payload, format="json")
+
+        admin = User.objects.create(username="metrics-admin", role="ADMIN")
+        self.client.force_authenticate(user=admin)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        body = response.content.decode()
+        self.assertIn(
+            'http_requests_total{method="POST",route="api/predictions/predict/",status="201"} 1',
+            body
+        )
+        self.assertIn('hot_path_duration_seconds_count{span="predict"} 1', body)
+        self.assertIn("prediction_cache_hit_ratio", body)
+
+        # query counts use count buckets, not the latency ones
+        self.assertIn(
+            'http_request_db_queries_bucket{method="POST",route="api/predictions/predict/",le="100"} 1',
+            body
+        )
+        self.assertNotIn('http_request_db_queries_bucket{method="POST",route="api/predictions/predict/",le="0.005"}', body)
+
+        self.assertIn("# TYPE prediction_cache_lookups_total counter", body)
+        self.assertIn('prediction_cache_lookups_total{result="miss"}', body)
+
+    def test_metrics_require_admin_without_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(INSTRUMENTATION_METRICS_TOKEN="scrape-secret")
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secreT")
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_slow_sampled_request_is_profiled(self):
+        with tempfile.TemporaryDirectory() as profile_dir, override_settings(
+            INSTRUMENTATION_PROFILE_DIR=profile_dir,
+            INSTRUMENTATION_PROFILE_SAMPLE_RATE=1.0,
+            INSTRUMENTATION_SLOW_REQUEST_MS=0,
+        ):
+            client = APIClient()
+            client.force_authenticate(user=self.user)
+            client.post("/api/predictions/predict/", self.payload, format="json")
+
+            profiles = os.listdir(profile_dir)
+
+        self.assertEqual(len(profiles), 1)
+        self.assertTrue(profiles[0].endswith("-POST-api-predictions-predict.prof"))
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled_by_default(self):
+        response = self.client.post("/api/predictions/predict/", self.payload, format="json")
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
@@ -1,5 +1,18 @@
 from django.urls import path
-from .views import RegisterView, ProfileView, StudentPredictionAPIView
+from rest_framework.routers import DefaultRouter
+from .views import (
+    RegisterView,
+    ProfileView,
+    StudentPredictionAPIView,
+    PredictionCacheStatsAPIView,
+    WhatIfSweepAPIView,
+    WhatIfSaveAPIView,
+    StudentPredictionBatchAPIView,
+    StudentPredictionHistoryViewSet,
+)
+
+router = DefaultRouter()
+router.register(r"history", StudentPredictionHistoryViewSet, basename="prediction-history")
 
 urlpatterns = [
     # Temporary placeholders
@@ -8,4 +21,16 @@ urlpatterns = [
 
     # Main ML prediction API
     path("predict/", StudentPredictionAPIView.as_view(), name="student-predict"),
-]
+    path(
+        "predict-batch/",
+        StudentPredictionBatchAPIView.as_view(),
+        name="student-predict-batch"
+    ),
+    path("what-if/sweep/", WhatIfSweepAPIView.as_view(), name="what-if-sweep"),
+    path("what-if/save/", WhatIfSaveAPIView.as_view(), name="what-if-save"),
+    path(
+        "cache-stats/",
+        PredictionCacheStatsAPIView.as_view(),
+        name="prediction-cache-stats"
+    ),
+] + router.urls
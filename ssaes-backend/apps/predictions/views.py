@@ -1,11 +1,32 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import status, viewsets
+from rest_framework.fields import BooleanField
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from django.contrib.auth import get_user_model
 
-from .ml.predictor import predict_student_outcome
+from apps.accounts.permissions import IsAdmin, IsFaculty
+from ssaes_backend.pagination import CreatedAtCursorPagination
+from ssaes_backend.streaming import streaming_export
+from .ml.predictor import (
+    predict_student_outcome,
+    predict_batch,
+    predict_sweep,
+    prediction_cache,
+    scored_features
+)
 from .models import StudentPrediction
-from .serializers import StudentPredictionSerializer
+from .serializers import (
+    StudentPredictionSerializer,
+    WhatIfSaveSerializer,
+    WhatIfSweepSerializer
+)
+
+
+User = get_user_model()
+
+MAX_BATCH_ROWS = 50000
 
 
 class RegisterView(APIView):
@@ -33,7 +54,9 @@ class ProfileView(APIView):
 class StudentPredictionAPIView(APIView):
     """
     Accepts student metrics and returns predicted risk & grade.
-    Also saves prediction history.
+    Also saves prediction history, except for what-if calls: those are
+    answered without a row (use what-if/sweep/ to explore scenarios and
+    what-if/save/ to keep the chosen ones).
     """
     permission_classes = [IsAuthenticated]
 
@@ -49,17 +72,208 @@ class StudentPredictionAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Save prediction
+        if data.get("is_what_if") in BooleanField.TRUE_VALUES:
+            return Response(
+                {**scored_features(data), **prediction_result, "is_what_if": True}
+            )
+
+        # Save prediction with the features it was computed on
         prediction_instance = StudentPrediction.objects.create(
             student=request.user,
-            attendance_percentage=data.get("attendance_percentage", 0),
-            average_marks=data.get("average_marks", 0),
-            assignment_completion_rate=data.get("assignment_completion_rate", 0),
+            **scored_features(data),
             predicted_risk_score=prediction_result["predicted_risk_score"],
             predicted_risk_level=prediction_result["predicted_risk_level"],
             predicted_grade=prediction_result["predicted_grade"],
-            is_what_if=data.get("is_what_if", False)
+            probability=prediction_result["probability"],
+            model_version=prediction_result["model_version"]
         )
 
         serializer = StudentPredictionSerializer(prediction_instance)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class PredictionCacheStatsAPIView(APIView):
+    """
+    Hit/miss counters of this worker's prediction cache
+    (per process: each worker answers with its own counters)
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(prediction_cache.stats())
+
+
+class StudentPredictionBatchAPIView(APIView):
+    """
+    Scores a whole cohort in one call.
+    Builds a single feature matrix, runs one model call and
+    bulk-inserts the prediction history.
+    """
+    permission_classes = [IsAdmin | IsFaculty]
+
+    def post(self, request):
+        rows = request.data.get("rows")
+        is_what_if = bool(request.data.get("is_what_if", False))
+
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"error": "rows must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if len(rows) > MAX_BATCH_ROWS:
+            return Response(
+                {"error": f"A batch may contain at most {MAX_BATCH_ROWS} rows"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            student_column = [int(row["student"]) for row in rows]
+        except (TypeError, KeyError, ValueError):
+            return Response(
+                {"error": "Every row must be an object with a student id"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        student_ids = set(student_column)
+        known_ids = set(
+            User.objects.filter(id__in=student_ids).values_list("id", flat=True)
+        )
+        unknown_ids = student_ids - known_ids
+        if unknown_ids:
+            return Response(
+                {"error": f"Unknown student ids: {sorted(unknown_ids)[:20]}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            results = predict_batch(rows)
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        StudentPrediction.objects.bulk_create(
+            [
+                StudentPrediction(
+                    student_id=student_id,
+                    attendance_percentage=row["attendance_percentage"],
+                    average_marks=row["average_marks"],
+                    assignment_completion_rate=row["assignment_completion_rate"],
+                    is_what_if=is_what_if,
+                    **result
+                )
+                for student_id, row, result in zip(student_column, rows, results)
+            ],
+            batch_size=1000
+        )
+
+        return Response(
+            {
+                "count": len(results),
+                "results": [
+                    {"student": student_id, **result}
+                    for student_id, result in zip(student_column, results)
+                ],
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+
+class WhatIfSweepAPIView(APIView):
+    """
+    Evaluates a grid of what-if scenarios in one vectorized call.
+    Returns a columnar risk surface; nothing is saved.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = WhatIfSweepSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(predict_sweep(serializer.get_axes()))
+
+
+class WhatIfSaveAPIView(APIView):
+    """
+    Persists the what-if scenarios the user explicitly keeps.
+    Results are recomputed server-side rather than trusted from the client.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = WhatIfSaveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        scenarios = serializer.validated_data["scenarios"]
+        results = predict_batch(scenarios)
+
+        predictions = StudentPrediction.objects.bulk_create(
+            [
+                StudentPrediction(
+                    student=request.user,
+                    is_what_if=True,
+                    **scenario,
+                    **result
+                )
+                for scenario, result in zip(scenarios, results)
+            ]
+        )
+
+        return Response(
+            StudentPredictionSerializer(predictions, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class StudentPredictionHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Cursor-paginated prediction history.
+    Students see their own predictions; faculty/admin see all.
+    """
+    queryset = StudentPrediction.objects.select_related("student")
+    serializer_class = StudentPredictionSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+
+    export_fields = (
+        "id",
+        "created_at",
+        "student_id",
+        "student__username",
+        "attendance_percentage",
+        "average_marks",
+        "assignment_completion_rate",
+        "predicted_risk_score",
+        "predicted_risk_level",
+        "predicted_grade",
+        "probability",
+        "model_version",
+        "is_what_if",
+    )
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = super().get_queryset()
+        if user.role in ["ADMIN", "FACULTY"]:
+            return queryset
+        return queryset.filter(student=user)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Streams prediction history as CSV (default) or NDJSON (?as=ndjson).
+        """
+        try:
+            return streaming_export(
+                self.get_queryset().order_by("-created_at", "-id"),
+                self.export_fields,
+                request.query_params.get("as", "csv"),
+                "predictions"
+            )
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
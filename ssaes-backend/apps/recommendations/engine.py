@@ -1,19 +1,32 @@
 # recommendations/engine.py
 
+from django.db.models import Prefetch
+
 from .models import Recommendation
 from apps.goals.models import Goal
-from apps.accounts.models import Student
+from apps.students.models import Student
+from ssaes_backend.instrumentation import timed
 
-def generate_recommendations_for_student(student: Student):
+# Goal has no numeric progress field; its status is mapped to an
+# approximate completion percentage instead.
+GOAL_STATUS_PROGRESS = {
+    'PENDING': 0,
+    'IN_PROGRESS': 50,
+    'COMPLETED': 100,
+}
+
+FOCUS_PROGRESS_THRESHOLD = 50
+
+
+def build_recommendations(goals) -> list:
     """
-    Generate recommendations for a given student.
+    Pure rule logic: computes recommendation dicts for one student's goals.
     This is a simple example logic; you can replace it with ML-based predictions or rules.
     """
     recommendations = []
 
     # Example: Check if student has goals, and recommend action
-    goals = Goal.objects.filter(student=student)
-    if not goals.exists():
+    if not goals:
         recommendations.append({
             'title': 'Set Academic Goals',
             'description': 'You currently have no goals set. Setting goals can improve your performance.',
@@ -21,40 +34,88 @@ def generate_recommendations_for_student(student: Student):
         })
 
     for goal in goals:
-        if goal.progress < 50:
+        progress = GOAL_STATUS_PROGRESS.get(goal.status, 0)
+        if progress < FOCUS_PROGRESS_THRESHOLD:
             recommendations.append({
                 'title': f'Focus on "{goal.title}"',
-                'description': f'Your progress on this goal is {goal.progress}%. Consider spending more time on it.',
+                'description': f'Your progress on this goal is {progress}%. Consider spending more time on it.',
                 'source': 'System',
             })
 
-    # Optionally save recommendations in DB
-    recommendation_objs = []
-    for rec in recommendations:
-        obj, created = Recommendation.objects.get_or_create(
-            student=student,
-            title=rec['title'],
-            defaults={
-                'description': rec['description'],
-                'source': rec['source'],
-                'is_active': True,
-            }
+    return recommendations
+
+
+@timed("recommendations")
+def generate_recommendations_for_students(students=None) -> dict:
+    """
+    Set-based generator for many students at once.
+
+    Runs a constant number of queries regardless of cohort size:
+    students + prefetched goals, one lookup of existing (student, title)
+    pairs, and batched bulk inserts.
+
+    Returns {students, attempted}: attempted counts the rows missing at
+    lookup time. ignore_conflicts silently skips rows another process
+    inserted meanwhile and does not report how many were written.
+    """
+    if students is None:
+        students = Student.objects.all()
+
+    student_ids = students.values('pk')
+    students = students.only('id').prefetch_related(
+        Prefetch('goals', queryset=Goal.objects.only('id', 'student_id', 'title', 'status'))
+    )
+
+    candidates = {}
+    student_count = 0
+    for student in students:
+        student_count += 1
+        for rec in build_recommendations(list(student.goals.all())):
+            candidates[(student.pk, rec['title'])] = rec
+
+    existing = set(
+        Recommendation.objects.filter(
+            student__in=student_ids
+        ).values_list('student_id', 'title')
+    )
+
+    new_recommendations = [
+        Recommendation(
+            student_id=student_id,
+            title=title,
+            description=rec['description'],
+            source=rec['source'],
+            is_active=True,
         )
-        recommendation_objs.append(obj)
+        for (student_id, title), rec in candidates.items()
+        if (student_id, title) not in existing
+    ]
+
+    Recommendation.objects.bulk_create(
+        new_recommendations,
+        batch_size=1000,
+        ignore_conflicts=True
+    )
 
-    return recommendation_objs
+    return {
+        'students': student_count,
+        'attempted': len(new_recommendations),
+    }
 
 
-def generate_recommendations_for_all_students():
+def generate_recommendations_for_student(student: Student):
     """
-    Generate recommendations for all students in the system.
+    Generate recommendations for a given student.
+    Returns the student's current system recommendations.
     """
-    from apps.accounts.models import Student
-    all_students = Student.objects.all()
-    all_recommendations = []
+    generate_recommendations_for_students(Student.objects.filter(pk=student.pk))
+
+    titles = [rec['title'] for rec in build_recommendations(list(student.goals.all()))]
+    return list(Recommendation.objects.filter(student_id=student.pk, title__in=titles))
 
-    for student in all_students:
-        student_recs = generate_recommendations_for_student(student)
-        all_recommendations.extend(student_recs)
 
-    return all_recommendations
+def generate_recommendations_for_all_students() -> dict:
+    """
+    Generate recommendations for all students in the system.
+    """
+    return generate_recommendations_for_students()
@@ -0,0 +1,41 @@
+# The bulk generator creates each (student, title) recommendation at
+# most once and relies on this constraint to skip repeats; rows created
+# before it may repeat a title, so only the most recent row of each pair
+# is kept before the constraint is added.
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_recommendations(apps, schema_editor):
+    Recommendation = apps.get_model("recommendations", "Recommendation")
+
+    duplicates = Recommendation.objects.values("student_id", "title").annotate(
+        rows=Count("pk"),
+        keep=Max("pk"),
+    ).filter(rows__gt=1).order_by()
+
+    for group in duplicates.iterator():
+        Recommendation.objects.filter(
+            student_id=group["student_id"], title=group["title"]
+        ).exclude(pk=group["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recommendations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_recommendations, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="recommendation",
+            constraint=models.UniqueConstraint(
+                fields=("student", "title"),
+                name="unique_recommendation_per_student",
+            ),
+        ),
+    ]
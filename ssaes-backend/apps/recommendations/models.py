@@ -1,5 +1,5 @@
 from django.db import models
-from apps.accounts.models import Student
+from apps.students.models import Student
 
 class Recommendation(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='recommendations')
@@ -12,6 +12,12 @@ class Recommendation(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'title'],
+                name='unique_recommendation_per_student'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} for {self.student.user.username}"
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import Recommendation
-from apps.accounts.serializers import StudentSerializer  # Optional, if you want nested student info
+from apps.students.serializers import StudentSerializer  # Optional, if you want nested student info
 
 class RecommendationSerializer(serializers.ModelSerializer):
     # Optional: include nested student info
@@ -1,3 +1,56 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from apps.goals.models import Goal
+from apps.students.models import Student
+from .engine import (
+    generate_recommendations_for_all_students,
+    generate_recommendations_for_student,
+)
+from .models import Recommendation
+
+User = get_user_model()
+
+
+class RecommendationEngineTests(TestCase):
+
+    def make_students(self, count, start=0):
+        students = []
+        for i in range(start, start + count):
+            user = User.objects.create_user(username=f"s{i}", password="123", role="STUDENT")
+            student = Student.objects.create(
+                user=user, enrollment_number=f"E{i:04d}", department="CSE", year=1
+            )
+            Goal.objects.create(student=student, title=f"Goal {i}", status="PENDING")
+            Goal.objects.create(student=student, title=f"Done {i}", status="COMPLETED")
+            students.append(student)
+        return students
+
+    def test_generates_missing_recommendations_once(self):
+        self.make_students(3)
+        no_goals = User.objects.create_user(username="empty", password="123")
+        Student.objects.create(user=no_goals, enrollment_number="E9999", department="CSE", year=1)
+
+        summary = generate_recommendations_for_all_students()
+        self.assertEqual(summary, {"students": 4, "attempted": 4})
+        self.assertTrue(
+            Recommendation.objects.filter(title="Set Academic Goals").exists()
+        )
+
+        # second run finds every (student, title) pair already present
+        self.assertEqual(generate_recommendations_for_all_students()["attempted"], 0)
+        self.assertEqual(Recommendation.objects.count(), 4)
+
+    def test_query_count_is_independent_of_cohort_size(self):
+        self.make_students(2)
+        with self.assertNumQueries(4):
+            generate_recommendations_for_all_students()
+
+        self.make_students(20, start=2)
+        with self.assertNumQueries(4):
+            generate_recommendations_for_all_students()
+
+    def test_single_student_returns_objects(self):
+        student = self.make_students(1)[0]
+        recommendations = generate_recommendations_for_student(student)
+        self.assertEqual([r.title for r in recommendations], ['Focus on "Goal 0"'])
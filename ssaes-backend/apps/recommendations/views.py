@@ -8,6 +8,8 @@ from .models import Recommendation
 from .serializers import RecommendationSerializer
 from .engine import generate_recommendations_for_student, generate_recommendations_for_all_students
 from apps.accounts.permissions import IsAdmin, IsFaculty
+from apps.accounts.tokens import student_profile_id
+from apps.students.models import Student
 
 class RecommendationViewSet(viewsets.ModelViewSet):
     """
@@ -28,28 +30,28 @@ class RecommendationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         # Students only see their own recommendations
-        if hasattr(user, 'student'):
-            return Recommendation.objects.filter(student=user.student)
+        if user.role == 'STUDENT':
+            return Recommendation.objects.filter(student_id=student_profile_id(self.request))
         return super().get_queryset()
 
     @action(detail=False, methods=['post'], url_path='generate-all')
     def generate_all(self, request):
         """
         Generate recommendations for all students (faculty/admin only).
+        Returns a summary ({students, attempted}) rather than every row.
         """
-        recommendations = generate_recommendations_for_all_students()
-        serializer = self.get_serializer(recommendations, many=True)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        summary = generate_recommendations_for_all_students()
+        return Response(summary, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'], url_path='generate-my')
     def generate_my(self, request):
         """
         Generate recommendations for the logged-in student.
         """
-        user = request.user
-        if not hasattr(user, 'student'):
+        student = Student.objects.filter(pk=student_profile_id(request)).first()
+        if student is None:
             return Response({'detail': 'You are not a student.'}, status=status.HTTP_403_FORBIDDEN)
-        
-        recommendations = generate_recommendations_for_student(user.student)
+
+        recommendations = generate_recommendations_for_student(student)
         serializer = self.get_serializer(recommendations, many=True)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("students", "0002_remove_student_roll_no_student_attendance_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["department", "year", "marks"],
+                name="student_dept_year_marks_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["marks"], name="student_marks_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["attendance"], name="student_attendance_idx"),
+        ),
+    ]
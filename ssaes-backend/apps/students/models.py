@@ -14,5 +14,13 @@ class Student(models.Model):
     attendance = models.FloatField(default=0.0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # StudentFilter: department/year equality + marks/attendance ranges
+        indexes = [
+            models.Index(fields=['department', 'year', 'marks'], name='student_dept_year_marks_idx'),
+            models.Index(fields=['marks'], name='student_marks_idx'),
+            models.Index(fields=['attendance'], name='student_attendance_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.enrollment_number}"
@@ -1,3 +1,28 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from ssaes_backend.testing import QueryBudgetMixin
+from .models import Student
+
+User = get_user_model()
+
+
+class StudentListQueryTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.faculty = User.objects.create_user(username="faculty", password="123", role="FACULTY")
+        self.client.force_authenticate(user=self.faculty)
+        self.created = 0
+
+    def seed(self, count):
+        for _ in range(count):
+            self.created += 1
+            user = User.objects.create_user(username=f"s{self.created}", password="123")
+            Student.objects.create(
+                user=user, enrollment_number=f"E{self.created}", department="CSE", year=1
+            )
+
+    def test_student_list_query_count_is_constant(self):
+        self.assertConstantQueries("/api/students/", self.seed, max_queries=1)
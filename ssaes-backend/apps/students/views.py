@@ -4,10 +4,22 @@ from .serializers import StudentSerializer, StudentCreateSerializer
 from apps.accounts.permissions import IsAdmin, IsFaculty
 
 class StudentViewSet(viewsets.ModelViewSet):
-    queryset = Student.objects.all()
+    queryset = Student.objects.select_related('user')
     serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # Only the user columns rendered by the nested UserSerializer
+    list_fields = (
+        'id', 'enrollment_number', 'department', 'year', 'marks', 'attendance', 'created_at',
+        'user', 'user__id', 'user__username', 'user__email', 'user__role',
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.only(*self.list_fields)
+        return queryset
+
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return StudentCreateSerializer
@@ -5,7 +5,7 @@ from .models import Upload
 
 @admin.register(Upload)
 class UploadAdmin(admin.ModelAdmin):
-    list_display = ('id', 'uploaded_by', 'file', 'uploaded_at')
-    list_filter = ('uploaded_at', 'uploaded_by')
+    list_display = ('id', 'uploaded_by', 'file', 'status', 'rows_imported', 'rows_failed', 'uploaded_at')
+    list_filter = ('status', 'uploaded_at', 'uploaded_by')
     search_fields = ('uploaded_by__username', 'file')
-    readonly_fields = ('uploaded_at',)
+    readonly_fields = ('uploaded_at', 'status', 'rows_processed', 'rows_imported', 'rows_failed', 'errors')
@@ -0,0 +1,366 @@
+# uploads/ingestion.py
+
+"""
+Bulk roster ingestion for uploaded CSV/XLSX exam result files.
+
+Rows are streamed from the file (csv reader / openpyxl read-only mode),
+validated with the same rules as the prediction API and upserted into
+Student and StudentAnalytics in fixed-size chunks, so memory use stays
+flat regardless of file size.
+
+Expected columns (header row, case-insensitive):
+    enrollment_number, username, department, year,
+    attendance_percentage, average_marks, assignment_completion_rate
+"""
+
+import csv
+import io
+import os
+import zipfile
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.alerts.services import defer_alerts, raise_risk_alerts
+from apps.analytics.models import StudentAnalytics
+from apps.analytics.services import generate_cohort_analytics
+from apps.analytics.engine import invalidate_cohort_frame
+from apps.analytics.ranking import invalidate_risk_ranking
+from apps.analytics.snapshot import rebuild_kpi_snapshot
+from apps.predictions.ml.preprocessing import FEATURE_FIELDS, validate_input
+from apps.students.models import Student
+from .models import Upload
+
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 500
+
+PROFILE_FIELDS = ("enrollment_number", "username", "department", "year")
+REQUIRED_COLUMNS = PROFILE_FIELDS + FEATURE_FIELDS
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx", ".xlsm")
+
+# raised while streaming a file that is not valid UTF-8 CSV / XLSX
+UNREADABLE_FILE_ERRORS = (UnicodeDecodeError, csv.Error, zipfile.BadZipFile)
+
+
+class IngestionError(Exception):
+    """
+    Raised when a file cannot be ingested at all (bad format / header)
+    """
+
+
+# -----------------------------
+# STREAMING READERS
+# -----------------------------
+
+def is_ingestible(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+def _normalize_header(header) -> list:
+    return [str(column or "").strip().lower() for column in header]
+
+
+def _check_header(header: list):
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise IngestionError(f"Missing columns: {', '.join(missing)}")
+
+
+def iter_csv_rows(binary_file):
+    """
+    Yields one dict per CSV data row without reading the whole file
+    """
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = _normalize_header(next(reader, []))
+        _check_header(header)
+        for values in reader:
+            if any(values):
+                yield dict(zip(header, values))
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(binary_file):
+    """
+    Yields one dict per worksheet row using openpyxl's read-only mode,
+    which streams rows instead of building the whole workbook in memory
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(binary_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _normalize_header(next(rows, []))
+        _check_header(header)
+        for values in rows:
+            if any(value not in (None, "") for value in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(binary_file, filename: str):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        return iter_csv_rows(binary_file)
+    if extension in (".xlsx", ".xlsm"):
+        return iter_xlsx_rows(binary_file)
+    raise IngestionError(f"Unsupported file type: {extension or filename}")
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# -----------------------------
+# ROW VALIDATION
+# -----------------------------
+
+def clean_row(row: dict) -> dict:
+    """
+    Converts a raw row into typed values.
+    Raises ValueError with a readable message on bad input.
+    """
+    cleaned = {}
+
+    for field in ("enrollment_number", "username", "department"):
+        value = str(row.get(field) or "").strip()
+        if not value:
+            raise ValueError(f"Missing required field: {field}")
+        cleaned[field] = value
+
+    try:
+        cleaned["year"] = int(float(row.get("year")))
+    except (TypeError, ValueError):
+        raise ValueError("year must be a number")
+
+    for field in FEATURE_FIELDS:
+        try:
+            cleaned[field] = float(row.get(field))
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a number")
+
+    validate_input(cleaned)
+    return cleaned
+
+
+# -----------------------------
+# CHUNK UPSERT
+# -----------------------------
+
+def upsert_chunk(rows: list) -> list:
+    """
+    Upserts one chunk of cleaned (line_number, row) pairs.
+    Returns a list of (line_number, message) errors for rows
+    that conflict with existing data.
+    """
+    errors = []
+
+    # Last row wins for duplicate enrollment numbers inside the chunk
+    by_enrollment = {row["enrollment_number"]: (line, row) for line, row in rows}
+
+    usernames = {row["username"] for _, row in by_enrollment.values()}
+    user_ids = {}
+    other_roles = set()
+    for username, user_id, role in User.objects.filter(
+        username__in=usernames
+    ).values_list("username", "id", "role"):
+        if role == "STUDENT":
+            user_ids[username] = user_id
+        else:
+            other_roles.add(username)
+
+    existing = Student.objects.filter(
+        enrollment_number__in=by_enrollment.keys()
+    ).values_list("enrollment_number", "user_id")
+    owners = dict(existing)
+    profiles = dict(
+        Student.objects.filter(user_id__in=user_ids.values()).values_list(
+            "user_id", "enrollment_number"
+        )
+    )
+
+    accepted = []
+    claimed_usernames = {}
+    for line, row in by_enrollment.values():
+        user_id = user_ids.get(row["username"])
+        owner = owners.get(row["enrollment_number"])
+        profile = profiles.get(user_id)
+
+        if row["username"] in other_roles:
+            errors.append((line, "username belongs to a non-student account"))
+        elif owner is not None and owner != user_id:
+            errors.append((line, "enrollment_number belongs to another user"))
+        elif profile is not None and profile != row["enrollment_number"]:
+            errors.append((line, f"username already enrolled as {profile}"))
+        elif claimed_usernames.setdefault(row["username"], row["enrollment_number"]) != row["enrollment_number"]:
+            errors.append((line, "username used by another row in this file"))
+        else:
+            accepted.append(row)
+
+    if not accepted:
+        return errors
+
+    with transaction.atomic(), defer_alerts():
+        new_usernames = [row["username"] for row in accepted if row["username"] not in user_ids]
+        if new_usernames:
+            User.objects.bulk_create(
+                [
+                    User(
+                        username=username,
+                        role="STUDENT",
+                        password=make_password(None)
+                    )
+                    for username in new_usernames
+                ],
+                ignore_conflicts=True
+            )
+            user_ids.update(
+                User.objects.filter(
+                    username__in=new_usernames, role="STUDENT"
+                ).values_list("username", "id")
+            )
+
+            # a username taken meanwhile by a non-student account was
+            # skipped by ignore_conflicts
+            taken = [row for row in accepted if row["username"] not in user_ids]
+            for row in taken:
+                line = by_enrollment[row["enrollment_number"]][0]
+                errors.append((line, "username belongs to a non-student account"))
+            if taken:
+                accepted = [row for row in accepted if row["username"] in user_ids]
+                if not accepted:
+                    return errors
+
+        Student.objects.bulk_create(
+            [
+                Student(
+                    user_id=user_ids[row["username"]],
+                    enrollment_number=row["enrollment_number"],
+                    department=row["department"],
+                    year=row["year"],
+                    marks=row["average_marks"],
+                    attendance=row["attendance_percentage"],
+                )
+                for row in accepted
+            ],
+            update_conflicts=True,
+            unique_fields=["enrollment_number"],
+            update_fields=["department", "year", "marks", "attendance"],
+        )
+
+        analytics = generate_cohort_analytics(
+            [row["attendance_percentage"] for row in accepted],
+            [row["average_marks"] for row in accepted],
+            [row["assignment_completion_rate"] for row in accepted],
+        )
+        columns = {key: values.tolist() for key, values in analytics.items()}
+
+        student_ids = [user_ids[row["username"]] for row in accepted]
+        previous_levels = dict(
+            StudentAnalytics.objects.filter(student_id__in=student_ids).values_list(
+                "student_id", "risk_level"
+            )
+        )
+
+        StudentAnalytics.objects.bulk_create(
+            [
+                StudentAnalytics(
+                    student_id=student_id,
+                    **{key: values[i] for key, values in columns.items()}
+                )
+                for i, student_id in enumerate(student_ids)
+            ],
+            update_conflicts=True,
+            unique_fields=["student"],
+            update_fields=list(columns),
+        )
+
+        # bulk upserts skip signals: raise escalation alerts in one batch
+        raise_risk_alerts(
+            (student_id, previous_levels.get(student_id), level)
+            for student_id, level in zip(student_ids, columns["risk_level"])
+        )
+
+    return errors
+
+
+# -----------------------------
+# PIPELINE
+# -----------------------------
+
+def ingest_upload(upload: Upload, chunk_size: int = CHUNK_SIZE) -> Upload:
+    """
+    Streams an uploaded roster file into Student / StudentAnalytics.
+    Progress and per-row errors are written to the Upload row after
+    every chunk so clients can poll it. A file that cannot be read
+    (bad header, encoding or format) marks the upload FAILED.
+    """
+    processed = imported = failed = 0
+    errors = []
+
+    def report(**extra):
+        Upload.objects.filter(pk=upload.pk).update(
+            rows_processed=processed,
+            rows_imported=imported,
+            rows_failed=failed,
+            errors=errors,
+            **extra
+        )
+
+    report(status="PROCESSING")
+
+    try:
+        with upload.file.open("rb") as binary_file:
+            # header is line 1; data rows start at line 2
+            numbered = enumerate(iter_rows(binary_file, upload.file.name), start=2)
+
+            for chunk in chunked(numbered, chunk_size):
+                valid = []
+                for line, row in chunk:
+                    try:
+                        valid.append((line, clean_row(row)))
+                    except ValueError as e:
+                        failed += 1
+                        if len(errors) < MAX_REPORTED_ERRORS:
+                            errors.append({"line": line, "error": str(e)})
+
+                for line, message in upsert_chunk(valid):
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"line": line, "error": message})
+
+                processed += len(chunk)
+                imported = processed - failed
+                report()
+    except IngestionError as e:
+        errors.append({"line": None, "error": str(e)})
+        status = "FAILED"
+    except UNREADABLE_FILE_ERRORS as e:
+        errors.append({"line": None, "error": f"File could not be read: {e}"})
+        status = "FAILED"
+    else:
+        status = "COMPLETED"
+
+    if imported:
+        # bulk upserts bypass StudentAnalytics signals; chunks written
+        # before a read error stay imported
+        rebuild_kpi_snapshot()
+        invalidate_cohort_frame()
+        invalidate_risk_ranking()
+    report(status=status)
+
+    upload.refresh_from_db()
+    return upload
@@ -1,7 +1,6 @@
 # uploads/models.py
 
 from django.db import models
-from apps.accounts.models import Student, Faculty
 
 def user_upload_path(instance, filename):
     """
@@ -12,7 +11,15 @@ def user_upload_path(instance, filename):
 class Upload(models.Model):
     """
     Model to store uploaded files by students or faculty.
+    Roster files (CSV/XLSX) also carry their ingestion progress.
     """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    )
+
     uploaded_by = models.ForeignKey(
         'accounts.User',
         on_delete=models.CASCADE,
@@ -22,6 +29,13 @@ class Upload(models.Model):
     description = models.CharField(max_length=255, blank=True, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    # Ingestion progress (see uploads/ingestion.py)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_imported = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+
     def __str__(self):
         return f"{self.file.name} uploaded by {self.uploaded_by.username}"
 
@@ -8,8 +8,14 @@ class UploadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Upload
-        fields = ['id', 'uploaded_by', 'file', 'description', 'uploaded_at']
-        read_only_fields = ['id', 'uploaded_by', 'uploaded_at']
+        fields = [
+            'id', 'uploaded_by', 'file', 'description', 'uploaded_at',
+            'status', 'rows_processed', 'rows_imported', 'rows_failed', 'errors',
+        ]
+        read_only_fields = [
+            'id', 'uploaded_by', 'uploaded_at',
+            'status', 'rows_processed', 'rows_imported', 'rows_failed', 'errors',
+        ]
 
     def create(self, validated_data):
         # Automatically set the uploading user
@@ -1,3 +1,199 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.alerts.models import Alert
+from apps.analytics.models import StudentAnalytics
+from apps.jobs.models import Job
+from apps.students.models import Student
+from .ingestion import ingest_upload
+from .models import Upload
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+HEADER = (
+    "enrollment_number,username,department,year,"
+    "attendance_percentage,average_marks,assignment_completion_rate\n"
+)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RosterIngestionTestCase(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.faculty = User.objects.create_user(
+            username="faculty", password="facultypass", role="FACULTY"
+        )
+
+    def make_upload(self, content, name="roster.csv"):
+        if isinstance(content, str):
+            content = content.encode()
+        return Upload.objects.create(
+            uploaded_by=self.faculty,
+            file=SimpleUploadedFile(name, content),
+        )
+
+    def test_csv_rows_are_upserted_in_bulk(self):
+        upload = self.make_upload(
+            HEADER +
+            "E001,alice,CSE,2,90,88,95\n"
+            "E002,bob,ECE,1,35,30,20\n"
+        )
+
+        upload = ingest_upload(upload, chunk_size=1)
+
+        self.assertEqual(upload.status, "COMPLETED")
+        self.assertEqual(upload.rows_imported, 2)
+        self.assertEqual(Student.objects.count(), 2)
+        self.assertEqual(
+            StudentAnalytics.objects.get(student__username="bob").risk_level,
+            "HIGH"
+        )
+
+        # re-importing updates instead of duplicating
+        ingest_upload(self.make_upload(HEADER + "E002,bob,ECE,2,95,90,90\n"))
+        self.assertEqual(Student.objects.get(enrollment_number="E002").year, 2)
+        self.assertEqual(
+            StudentAnalytics.objects.get(student__username="bob").risk_level,
+            "LOW"
+        )
+
+    def test_escalations_raise_alerts(self):
+        ingest_upload(self.make_upload(
+            HEADER +
+            "E001,alice,CSE,2,90,88,95\n"
+            "E002,bob,ECE,1,35,30,20\n"
+        ))
+        self.assertEqual(
+            list(Alert.objects.values_list("student__enrollment_number", "level")),
+            [("E002", "HIGH")]
+        )
+
+        # alice escalates on re-import; bob is still HIGH and alerted once
+        ingest_upload(self.make_upload(
+            HEADER +
+            "E001,alice,CSE,2,35,30,20\n"
+            "E002,bob,ECE,1,30,30,20\n"
+        ))
+        self.assertEqual(
+            sorted(Alert.objects.values_list("student__enrollment_number", "level")),
+            [("E001", "HIGH"), ("E002", "HIGH")]
+        )
+
+    def test_invalid_rows_are_reported(self):
+        upload = self.make_upload(
+            HEADER +
+            "E001,alice,CSE,2,90,88,95\n"
+            "E002,bob,ECE,1,135,30,20\n"
+            ",carol,ECE,1,50,50,50\n"
+        )
+
+        upload = ingest_upload(upload)
+
+        self.assertEqual(upload.rows_imported, 1)
+        self.assertEqual(upload.rows_failed, 2)
+        self.assertEqual([e["line"] for e in upload.errors], [3, 4])
+
+    def test_missing_columns_fail_the_upload(self):
+        upload = ingest_upload(self.make_upload("username,marks\nalice,50\n"))
+        self.assertEqual(upload.status, "FAILED")
+        self.assertIn("Missing columns", upload.errors[0]["error"])
+
+    def test_unreadable_files_fail_the_upload(self):
+        for content, name in (
+            (HEADER.encode() + b"E001,\xff\xfe,CSE,2,90,88,95\n", "roster.csv"),
+            (b"not a workbook", "roster.xlsx"),
+        ):
+            with self.subTest(name=name):
+                upload = ingest_upload(self.make_upload(content, name))
+                self.assertEqual(upload.status, "FAILED")
+                self.assertIn("File could not be read", upload.errors[-1]["error"])
+
+        self.assertFalse(Student.objects.exists())
+
+    def test_non_student_usernames_are_rejected(self):
+        upload = ingest_upload(self.make_upload(
+            HEADER +
+            "E001,faculty,CSE,2,90,88,95\n"
+            "E002,bob,ECE,1,35,30,20\n"
+        ))
+
+        self.assertEqual(upload.rows_imported, 1)
+        self.assertEqual(upload.errors[0]["line"], 2)
+        self.assertIn("non-student", upload.errors[0]["error"])
+        self.assertFalse(Student.objects.filter(user=self.faculty).exists())
+
+    def test_username_taken_during_ingestion_is_reported(self):
+        bulk_create = User.objects.bulk_create
+
+        def create_staff_first(users, **kwargs):
+            # another process registers "bob" as staff between the
+            # role lookup and the insert
+            User.objects.create_user(username="bob", password="x", role="FACULTY")
+            return bulk_create(users, **kwargs)
+
+        with mock.patch.object(User.objects, "bulk_create", side_effect=create_staff_first):
+            upload = ingest_upload(self.make_upload(
+                HEADER +
+                "E001,alice,CSE,2,90,88,95\n"
+                "E002,bob,ECE,1,35,30,20\n"
+            ))
+
+        self.assertEqual(upload.status, "COMPLETED")
+        self.assertEqual(upload.rows_imported, 1)
+        self.assertEqual(upload.errors, [
+            {"line": 3, "error": "username belongs to a non-student account"}
+        ])
+        self.assertEqual(
+            list(Student.objects.values_list("enrollment_number", flat=True)), ["E001"]
+        )
+
+    def test_upload_is_ingested_by_a_job(self):
+        client = APIClient()
+        client.force_authenticate(user=self.faculty)
+
+        content = HEADER + "E001,alice,CSE,2,90,88,95\n"
+
+        response = client.post(
+            reverse("uploads-list"),
+            {"file": SimpleUploadedFile("roster.csv", content.encode())},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        upload = Upload.objects.get(pk=response.data["upload_id"])
+        job = Job.objects.get(pk=response.data["job_id"])
+        self.assertEqual(upload.status, "COMPLETED")
+        self.assertEqual(job.kind, "INGEST_UPLOAD")
+        self.assertEqual(job.status, "COMPLETED")
+        self.assertEqual(job.result["rows_imported"], 1)
+        self.assertTrue(Student.objects.filter(enrollment_number="E001").exists())
+
+    def test_failed_ingestion_fails_the_job(self):
+        client = APIClient()
+        client.force_authenticate(user=self.faculty)
+
+        response = client.post(
+            reverse("uploads-list"),
+            {"file": SimpleUploadedFile("roster.csv", b"\xff\xfe\x00garbage")},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(Upload.objects.get(pk=response.data["upload_id"]).status, "FAILED")
+        job = Job.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.status, "FAILED")
+        self.assertIn("could not be read", job.error)
@@ -1,18 +1,21 @@
 # uploads/views.py
 
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from .ingestion import is_ingestible
 from .models import Upload
 from .serializers import UploadSerializer
 from apps.accounts.permissions import IsAdmin, IsFaculty, IsStudent
+from apps.jobs.services import submit_job
 
 class UploadViewSet(viewsets.ModelViewSet):
     """
     ViewSet to handle file uploads.
     Supports multipart/form-data and form submissions.
     """
-    queryset = Upload.objects.all()
+    queryset = Upload.objects.select_related('uploaded_by')
     serializer_class = UploadSerializer
     parser_classes = [MultiPartParser, FormParser]  # Handles file + form fields
 
@@ -22,7 +25,7 @@ class UploadViewSet(viewsets.ModelViewSet):
         Admin and Faculty can create/update/delete.
         Students can only view.
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'ingest']:
             permission_classes = [IsAdmin | IsFaculty]
         else:
             permission_classes = [permissions.IsAuthenticated]
@@ -41,10 +44,41 @@ class UploadViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         """
         Handle file upload.
-        Can be extended to process files after saving.
+        CSV/XLSX roster files are stored and queued for ingestion into
+        Student and StudentAnalytics as an INGEST_UPLOAD job; the 202
+        carries the upload id (poll the upload for row progress).
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+        upload = serializer.instance
+        if not is_ingestible(upload.file.name):
+            data = self.get_serializer(upload).data
+            headers = self.get_success_headers(data)
+            return Response(data, status=status.HTTP_201_CREATED, headers=headers)
+
+        return self.queue_ingestion(upload)
+
+    @action(detail=True, methods=['post'])
+    def ingest(self, request, pk=None):
+        """
+        Re-run ingestion for an already stored roster file.
+        """
+        upload = self.get_object()
+        if not is_ingestible(upload.file.name):
+            return Response(
+                {'detail': 'Only CSV and XLSX files can be ingested.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return self.queue_ingestion(upload)
+
+    def queue_ingestion(self, upload):
+        job = submit_job(
+            'INGEST_UPLOAD', user=self.request.user, params={'upload_id': upload.pk}
+        )
+        return Response(
+            {'upload_id': upload.pk, 'job_id': job.pk},
+            status=status.HTTP_202_ACCEPTED
+        )
@@ -0,0 +1,16 @@
+"""
+Celery application for ssaes_backend.
+
+Workers are started with:
+    celery -A ssaes_backend worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ssaes_backend.settings")
+
+app = Celery("ssaes_backend")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -0,0 +1,420 @@
+"""
+Opt-in request profiling and hot-path instrumentation.
+
+Enabled with INSTRUMENTATION_ENABLED = True. When disabled the middleware
+removes itself (MiddlewareNotUsed) and @timed functions call straight
+through.
+
+- InstrumentationMiddleware: per-request query count, DB time and total
+  latency -> Server-Timing header, one structured log line, metrics
+- timed / span: timing hooks for hot paths (predictions, recommendations,
+  analytics, JWT auth), reported as Server-Timing entries and histograms
+- metrics_view: Prometheus text format for this process's metrics,
+  readable with INSTRUMENTATION_METRICS_TOKEN or, without one, by admins
+- sampled cProfile: a fraction of requests run under cProfile and the
+  profile is written to INSTRUMENTATION_PROFILE_DIR when the request
+  turns out to be slow
+
+Metrics are per process; scrape each worker (or aggregate upstream).
+"""
+
+import contextvars
+import cProfile
+import functools
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+
+logger = logging.getLogger("ssaes.requests")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# for histograms of counts rather than seconds
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100)
+
+
+# -----------------------------
+# SETTINGS
+# -----------------------------
+
+_enabled = None
+
+
+def instrumentation_enabled() -> bool:
+    global _enabled
+    if _enabled is None:
+        _enabled = getattr(settings, "INSTRUMENTATION_ENABLED", False)
+    return _enabled
+
+
+@receiver(setting_changed)
+def _reset_enabled(setting, **kwargs):
+    global _enabled
+    if setting == "INSTRUMENTATION_ENABLED":
+        _enabled = None
+
+
+# -----------------------------
+# METRICS REGISTRY
+# -----------------------------
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe counters and histograms with Prometheus text output.
+    Histograms use `buckets` unless describe() gave the metric its own.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._buckets = {}
+
+    def describe(self, name, help_text, buckets=None):
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+
+    def buckets_for(self, name) -> tuple:
+        return self._buckets.get(name, self.buckets)
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        buckets = self.buckets_for(name)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    "buckets": [0] * len(buckets), "sum": 0.0, "count": 0
+                }
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self, gauges=None, counters=None) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        gauges / counters: (name, labels, value) read at scrape time
+        """
+        with self._lock:
+            totals = dict(self._counters)
+            histograms = {
+                key: {**value, "buckets": list(value["buckets"])}
+                for key, value in self._histograms.items()
+            }
+
+        lines = []
+        described = set()
+
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(totals.items()):
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+
+        for name, labels, value in counters or []:
+            header(name, "counter")
+            lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {value}")
+
+        for (name, labels), histogram in sorted(histograms.items()):
+            header(name, "histogram")
+            for bound, count in zip(self.buckets_for(name), histogram["buckets"]):
+                lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram['sum']}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+
+        for name, labels, value in gauges or []:
+            header(name, "gauge")
+            lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+metrics = MetricsRegistry()
+metrics.describe("http_requests_total", "HTTP requests by view route, method and status")
+metrics.describe("http_request_duration_seconds", "Total request latency")
+metrics.describe("http_request_db_seconds", "Time spent in database queries per request")
+metrics.describe(
+    "http_request_db_queries", "Database queries per request", buckets=QUERY_COUNT_BUCKETS
+)
+metrics.describe("hot_path_duration_seconds", "Latency of instrumented hot-path functions")
+metrics.describe("prediction_cache_lookups_total", "Prediction cache lookups by result")
+
+
+# -----------------------------
+# SPANS / TIMING HOOKS
+# -----------------------------
+
+# {span name: [total seconds, calls]} for the request being served
+_request_spans = contextvars.ContextVar("request_spans", default=None)
+
+
+@contextmanager
+def span(name):
+    """
+    Times a block; recorded in the hot-path histogram and, during a
+    request, in its Server-Timing header
+    """
+    if not instrumentation_enabled():
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("hot_path_duration_seconds", elapsed, {"span": name})
+
+        spans = _request_spans.get()
+        if spans is not None:
+            entry = spans.setdefault(name, [0.0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+
+
+def timed(name):
+    """
+    Decorator form of span()
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not instrumentation_enabled():
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# -----------------------------
+# MIDDLEWARE
+# -----------------------------
+
+class QueryTimer:
+    """
+    connection.execute_wrapper hook counting queries and DB time
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class InstrumentationMiddleware:
+
+    def __init__(self, get_response):
+        if not instrumentation_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "INSTRUMENTATION_PROFILE_SAMPLE_RATE", 0.0)
+        self.slow_ms = getattr(settings, "INSTRUMENTATION_SLOW_REQUEST_MS", 500)
+        self.profile_dir = getattr(settings, "INSTRUMENTATION_PROFILE_DIR", None)
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        spans = {}
+        token = _request_spans.set(spans)
+
+        profiler = None
+        if self.profile_dir and self.sample_rate and random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+
+        start = time.perf_counter()
+        try:
+            with _wrap_connections(timer):
+                if profiler:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler:
+                        profiler.disable()
+        finally:
+            _request_spans.reset(token)
+        total = time.perf_counter() - start
+
+        route = _route(request)
+        self.record(request, response, route, total, timer)
+        response["Server-Timing"] = _server_timing(total, timer, spans)
+
+        profile_path = None
+        if profiler and total * 1000 >= self.slow_ms:
+            profile_path = self.dump_profile(profiler, request)
+
+        logger.info(json.dumps({
+            "event": "request",
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 2),
+            "db_queries": timer.count,
+            "db_ms": round(timer.seconds * 1000, 2),
+            "spans_ms": {
+                name: round(seconds * 1000, 2) for name, (seconds, _) in spans.items()
+            },
+            "profile": profile_path,
+        }))
+
+        return response
+
+    def record(self, request, response, route, total, timer):
+        labels = {"route": route, "method": request.method}
+        metrics.inc("http_requests_total", {**labels, "status": response.status_code})
+        metrics.observe("http_request_duration_seconds", total, labels)
+        metrics.observe("http_request_db_seconds", timer.seconds, labels)
+        metrics.observe("http_request_db_queries", timer.count, labels)
+
+    def dump_profile(self, profiler, request):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-") or "root"
+        path = os.path.join(
+            self.profile_dir,
+            f"{timezone.now():%Y%m%dT%H%M%S%f}-{request.method}-{slug[:80]}.prof"
+        )
+        profiler.dump_stats(path)
+        return path
+
+
+@contextmanager
+def _wrap_connections(timer):
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        yield
+
+
+def _route(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    return match.route if match and match.route else "unmatched"
+
+
+def _server_timing(total, timer, spans) -> str:
+    entries = [
+        f'db;dur={timer.seconds * 1000:.2f};desc="{timer.count} queries"',
+    ]
+    for name, (seconds, calls) in spans.items():
+        entries.append(f'{name};dur={seconds * 1000:.2f};desc="{calls} calls"')
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+# -----------------------------
+# /metrics
+# -----------------------------
+
+def extra_metrics() -> tuple:
+    """
+    (counters, gauges) read at scrape time
+    """
+    from apps.predictions.ml.predictor import prediction_cache
+
+    stats = prediction_cache.stats()
+    counters = [
+        ("prediction_cache_lookups_total", {"result": "local_hit"}, stats["local_hits"]),
+        ("prediction_cache_lookups_total", {"result": "shared_hit"}, stats["shared_hits"]),
+        ("prediction_cache_lookups_total", {"result": "miss"}, stats["misses"]),
+    ]
+    gauges = [
+        ("prediction_cache_hit_ratio", {}, stats["hit_rate"]),
+        ("prediction_cache_local_entries", {}, stats["local_size"]),
+    ]
+    return counters, gauges
+
+
+def _is_admin(request) -> bool:
+    """
+    IsAdmin for a plain Django view, authenticated the way the API is (JWT)
+    """
+    from rest_framework.exceptions import APIException
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+
+    from apps.accounts.permissions import IsAdmin
+
+    api_request = Request(
+        request,
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    try:
+        return IsAdmin().has_permission(api_request, None)
+    except APIException:
+        return False
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Requires `Authorization: Bearer <token>`
+    when INSTRUMENTATION_METRICS_TOKEN is set, and an admin user otherwise.
+    """
+    if not instrumentation_enabled():
+        raise Http404
+
+    token = getattr(settings, "INSTRUMENTATION_METRICS_TOKEN", None)
+    if token:
+        # constant-time comparison: no timing side channel on the token
+        supplied = request.headers.get("Authorization", "").encode()
+        if not hmac.compare_digest(supplied, f"Bearer {token}".encode()):
+            return HttpResponse(status=401)
+    elif not _is_admin(request):
+        return HttpResponse(status=403)
+
+    counters, gauges = extra_metrics()
+    return HttpResponse(
+        metrics.render(gauges=gauges, counters=counters),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
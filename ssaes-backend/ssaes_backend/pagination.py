@@ -0,0 +1,20 @@
+"""
+Keyset (cursor) pagination for append-only, time-ordered tables.
+
+Cursor pagination seeks on the indexed timestamp column instead of
+using OFFSET, so page N costs the same as page 1.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class TimestampCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    # id breaks ties between rows written in the same instant
+    ordering = ('-timestamp', '-id')
+
+
+class CreatedAtCursorPagination(TimestampCursorPagination):
+    ordering = ('-created_at', '-id')
@@ -4,9 +4,11 @@ Generated by 'django-admin startproject' using Django 5.2.9.
 """
 
 import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 import dj_database_url
+from celery.schedules import crontab
 
 # BASE_DIR
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,6 +18,8 @@ SECRET_KEY = os.environ.get('SECRET_KEY', 'django-insecure-ojz#b#9l($ykme4j1c(n)
 DEBUG = os.environ.get('DEBUG', 'True') == 'True'
 ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
 
+TESTING = 'test' in sys.argv or 'pytest' in sys.modules
+
 # Application definition
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -28,6 +32,7 @@ INSTALLED_APPS = [
     # Third-party
     'rest_framework',
     'corsheaders',
+    'django_celery_results',
 
     # Custom apps
     'apps.accounts.apps.AccountsConfig',
@@ -39,12 +44,15 @@ INSTALLED_APPS = [
     'apps.alerts.apps.AlertsConfig',
     'apps.uploads.apps.UploadsConfig',
     'apps.history.apps.HistoryConfig',
+    'apps.jobs.apps.JobsConfig',
+    'apps.benchmarks.apps.BenchmarksConfig',
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',   # Must be at top
+    'ssaes_backend.instrumentation.InstrumentationMiddleware',  # no-op unless INSTRUMENTATION_ENABLED
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -81,10 +89,22 @@ DATABASES = {
     )
 }
 
+# Cache shared by every worker: cross-process invalidation (cohort frame,
+# risk ranking) and the JWT user cache depend on it. Tests run in one
+# process and use the in-memory backend.
+CACHE_URL = os.environ.get('CACHE_URL', 'redis://localhost:6379/1')
+CACHES = {
+    'default': (
+        {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        if TESTING else
+        {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}
+    )
+}
+
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
 }
 
@@ -92,6 +112,66 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    # adds role / student_id / faculty_id claims (apps/accounts/tokens.py)
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.accounts.tokens.ClaimsTokenObtainPairSerializer',
+}
+
+# Seconds an authenticated user stays cached between requests (0 disables;
+# also off while CACHES is a per-process backend such as LocMemCache)
+JWT_USER_CACHE_TIMEOUT = int(os.environ.get('JWT_USER_CACHE_TIMEOUT', '60'))
+
+# ML model loading (see apps/predictions/ml/registry.py)
+PREDICTION_MODEL_PATH = os.environ.get(
+    'PREDICTION_MODEL_PATH',
+    os.path.join(BASE_DIR, 'apps', 'predictions', 'ml', 'student_risk_model.pkl')
+)
+PREDICTION_MODEL_CHECK_INTERVAL = float(os.environ.get('PREDICTION_MODEL_CHECK_INTERVAL', '5'))
+PREDICTION_MODEL_MMAP_MODE = os.environ.get('PREDICTION_MODEL_MMAP_MODE') or None  # e.g. 'r'
+PREDICTION_MODEL_WARMUP = os.environ.get('PREDICTION_MODEL_WARMUP', 'False') == 'True'
+PREDICTION_MODEL_ARTIFACT_DIR = os.environ.get(
+    'PREDICTION_MODEL_ARTIFACT_DIR',
+    os.path.join(BASE_DIR, 'apps', 'predictions', 'ml', 'artifacts')
+)
+
+# Prediction result cache: per-process LRU + optional shared Django cache alias
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', '4096'))  # 0 disables the local tier
+# Opt-in rounding of cached features (and the values scored), e.g. '1'; unset keys on exact values
+_cache_precision = os.environ.get('PREDICTION_CACHE_PRECISION')
+PREDICTION_CACHE_PRECISION = int(_cache_precision) if _cache_precision else None
+PREDICTION_CACHE_SHARED_ALIAS = os.environ.get('PREDICTION_CACHE_SHARED_ALIAS') or None  # e.g. 'default'
+PREDICTION_CACHE_TIMEOUT = int(os.environ.get('PREDICTION_CACHE_TIMEOUT', '3600'))
+
+# Request profiling, Server-Timing and /metrics (see ssaes_backend/instrumentation.py)
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'False') == 'True'
+INSTRUMENTATION_SLOW_REQUEST_MS = float(os.environ.get('INSTRUMENTATION_SLOW_REQUEST_MS', '500'))
+INSTRUMENTATION_PROFILE_SAMPLE_RATE = float(os.environ.get('INSTRUMENTATION_PROFILE_SAMPLE_RATE', '0'))  # e.g. 0.01
+INSTRUMENTATION_PROFILE_DIR = os.environ.get('INSTRUMENTATION_PROFILE_DIR') or None
+INSTRUMENTATION_METRICS_TOKEN = os.environ.get('INSTRUMENTATION_METRICS_TOKEN') or None  # unset: /metrics is admin-only
+
+# One JSON line per request on stdout when instrumentation is enabled
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'ssaes.requests': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Celery (background jobs, see apps/jobs)
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = 'django-db'
+CELERY_TASK_ALWAYS_EAGER = TESTING or os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'False') == 'True'
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_TRACK_STARTED = True
+CELERY_BEAT_SCHEDULE = {
+    # trend rollups (apps/analytics/rollups.py); run with `celery -A ssaes_backend beat`
+    'record-metrics-snapshot': {
+        'task': 'apps.analytics.tasks.record_metrics_snapshot_task',
+        'schedule': crontab(hour=0, minute=30),
+    },
 }
 
 # Password validation
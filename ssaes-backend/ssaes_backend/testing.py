@@ -0,0 +1,39 @@
+"""
+Shared test helpers.
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin that guards list endpoints against N+1 queries.
+
+    assertConstantQueries() grows the data set with ``seed(n)`` between
+    requests and fails if the number of queries changes with row count.
+    """
+
+    query_budget_sizes = (1, 5, 25)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, seed, sizes=None, max_queries=None):
+        """
+        seed(n) must add n more rows visible at ``url``.
+        """
+        counts = []
+        for size in sizes or self.query_budget_sizes:
+            seed(size)
+            counts.append(self.count_queries(url))
+
+        self.assertEqual(
+            len(set(counts)), 1,
+            f"Query count for {url} grows with row count: {counts}"
+        )
+        if max_queries is not None:
+            self.assertLessEqual(counts[0], max_queries)
@@ -18,6 +18,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path,include
 
+from ssaes_backend.instrumentation import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('api/accounts/', include('apps.accounts.urls')),
@@ -29,5 +31,7 @@ urlpatterns = [
     path('api/alerts/', include('apps.alerts.urls')),
     path('api/uploads/', include('apps.uploads.urls')),
     path('api/history/', include('apps.history.urls')),
+    path('api/jobs/', include('apps.jobs.urls')),
+    path('metrics', metrics_view, name='metrics'),
     
 ]